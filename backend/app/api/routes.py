@@ -1,25 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+import hmac
+import os
 import random
 from ..database import get_db
 from ..schemas import (
     AnalysisResponse,
     MetricsResponse,
     DataCollectionRequest,
-    DataCollectionResponse,
-)
-from ..services.data_collector import DataCollector
-from ..utils.analysis import (
-    calculate_metrics,
-    analyze_trends,
-    analyze_hashtags,
-    analyze_title_patterns,
-    get_wordcloud_data,
+    CollectionJobResponse,
+    CategoryCreate,
+    CategoryResponse,
+    CollectionRunResponse,
+    RequestProfileSummary,
+    RequestProfileDetail,
 )
+from ..services.job_queue import job_queue, QueueFullError
+from ..services.category_registry import get_active_categories, upsert_category
 
 router = APIRouter()
 
+# 관리용 엔드포인트(/admin/*) 토큰 (X-Admin-Token 헤더가 일치해야 하며, 설정하지 않으면 관리용 엔드포인트를 닫음)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리용 엔드포인트 접근 확인 (토큰 미설정 시 404, 불일치 시 403)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+
 
 @router.get("/health")
 async def health_check():
@@ -51,27 +64,69 @@ async def get_last_collection_time(db: Session = Depends(get_db)):
         }
 
 
-@router.post("/collect", response_model=DataCollectionResponse)
+@router.get("/categories", response_model=List[CategoryResponse])
+async def list_categories(db: Session = Depends(get_db)):
+    """수집 대상(활성) 카테고리 목록 조회"""
+    return get_active_categories(db)
+
+
+@router.post("/categories", response_model=CategoryResponse)
+async def create_category(request: CategoryCreate, db: Session = Depends(get_db)):
+    """카테고리 등록/수정 (재배포 없이 수집 대상 추가)"""
+    return upsert_category(
+        db,
+        name=request.name,
+        search_query=request.search_query,
+        is_active=request.is_active,
+    )
+
+
+@router.get("/collection-runs", response_model=List[CollectionRunResponse])
+async def list_collection_runs(
+    category: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    """최근 수집 실행 이력 조회 (모니터링용)"""
+    from ..models import CollectionRun, Category
+
+    query = db.query(CollectionRun)
+    if category:
+        query = query.join(Category, Category.id == CollectionRun.category_id).filter(
+            Category.name == category
+        )
+    return query.order_by(CollectionRun.started_at.desc()).limit(min(limit, 500)).all()
+
+
+@router.post("/collect", response_model=CollectionJobResponse, status_code=202)
 async def collect_data(
     request: DataCollectionRequest, db: Session = Depends(get_db)
 ):
-    """YouTube 데이터 수집"""
+    """YouTube 데이터 수집 작업 등록 (작업 ID 반환, GET /collect/{job_id}로 진행 상황 조회)"""
     try:
-        collector = DataCollector(db)
-        videos_collected = collector.collect_videos(
-            category_name=request.category,
+        job, created = job_queue.enqueue(
+            db,
+            category=request.category,
             time_range_days=request.time_range_days,
             max_results=request.max_results,
         )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-        return DataCollectionResponse(
-            success=True,
-            message=f"{request.category} 카테고리 데이터 수집 완료",
-            videos_collected=videos_collected,
-            category=request.category,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = CollectionJobResponse.model_validate(job)
+    response.deduplicated = not created
+    return response
+
+
+@router.get("/collect/{job_id}", response_model=CollectionJobResponse)
+async def get_collection_job(job_id: str, db: Session = Depends(get_db)):
+    """수집 작업 진행 상황 조회"""
+    from ..models import CollectionJob
+
+    job = db.get(CollectionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"수집 작업 '{job_id}'를 찾을 수 없습니다.")
+    return CollectionJobResponse.model_validate(job)
 
 
 @router.get("/metrics/{category}", response_model=MetricsResponse)
@@ -81,6 +136,8 @@ async def get_metrics(
     db: Session = Depends(get_db),
 ):
     """메트릭 카드 데이터 조회"""
+    from ..utils.analysis import calculate_metrics
+
     time_range_days = 7 if time_range == "7days" else 30
     metrics = calculate_metrics(db, category, time_range_days)
     return MetricsResponse(**metrics)
@@ -93,6 +150,13 @@ async def get_analysis(
     db: Session = Depends(get_db),
 ):
     """전체 분석 데이터 조회"""
+    from ..utils.analysis import (
+        calculate_metrics,
+        analyze_trends,
+        analyze_hashtags,
+        analyze_title_patterns,
+    )
+
     time_range_days = 7 if time_range == "7days" else 30
 
     # 각 분석 함수 호출
@@ -127,6 +191,8 @@ async def get_trends(
     db: Session = Depends(get_db),
 ):
     """트렌드 데이터 조회"""
+    from ..utils.analysis import analyze_trends
+
     time_range_days = 7 if time_range == "7days" else 30
     trend_data, trending_topics = analyze_trends(db, category, time_range_days)
     return {"trend_data": trend_data, "trending_topics": trending_topics}
@@ -139,6 +205,8 @@ async def get_hashtags(
     db: Session = Depends(get_db),
 ):
     """해시태그 분석 데이터 조회"""
+    from ..utils.analysis import analyze_hashtags
+
     time_range_days = 7 if time_range == "7days" else 30
     hashtag_stats, recommended_hashtags = analyze_hashtags(
         db, category, time_range_days
@@ -149,6 +217,47 @@ async def get_hashtags(
     }
 
 
+@router.get("/hashtag-combinations/{category}")
+async def get_hashtag_combinations(
+    category: str,
+    tag: str,
+    time_range: str = "7days",
+    max_size: int = 3,
+    min_videos: int = 2,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    """해시태그 X를 포함하는 조합 중 실제로 함께 쓰인 영상의 평균 조회수가 높은 순"""
+    from ..services.hot_store import hot_store
+    from ..utils.cooccurrence import cooccurrence_index
+
+    columns = hot_store.get(db, category)
+    if columns is None:
+        raise HTTPException(status_code=404, detail=f"카테고리 '{category}'를 찾을 수 없습니다.")
+
+    time_range_days = 7 if time_range == "7days" else 30
+    rows = columns.window_rows(datetime.utcnow() - timedelta(days=time_range_days))
+    combinations = cooccurrence_index(columns).best_tag_sets(
+        tag.lstrip("#"),
+        max_size=max(2, min(max_size, 5)),
+        min_videos=max(1, min_videos),
+        limit=min(limit, 50),
+        rows=rows,
+    )
+    return {
+        "tag": f"#{tag.lstrip('#')}",
+        "time_range": time_range,
+        "combinations": [
+            {
+                "tags": [f"#{t}" for t in tags],
+                "video_count": video_count,
+                "avg_views": int(round(avg_views)),
+            }
+            for tags, video_count, avg_views in combinations
+        ],
+    }
+
+
 @router.get("/title-patterns/{category}")
 async def get_title_patterns(
     category: str,
@@ -156,6 +265,8 @@ async def get_title_patterns(
     db: Session = Depends(get_db),
 ):
     """제목 패턴 분석 데이터 조회"""
+    from ..utils.analysis import analyze_title_patterns
+
     time_range_days = 7 if time_range == "7days" else 30
     title_patterns, effective_keywords, recommendation = analyze_title_patterns(
         db, category, time_range_days
@@ -175,6 +286,8 @@ async def get_wordcloud(
     db: Session = Depends(get_db),
 ):
     """워드클라우드용 해시태그 빈도 데이터 조회"""
+    from ..utils.analysis import get_wordcloud_data
+
     time_range_days = 7 if time_range == "7days" else 30
     wordcloud_data = get_wordcloud_data(db, category, time_range_days, max_words)
     return {
@@ -188,34 +301,51 @@ async def get_wordcloud(
 async def get_keyword_videos(
     category: str,
     keyword: str,
+    page: int = 1,
+    page_size: int = 10,
+    order: str = "random",
+    seed: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
-    """키워드가 포함된 영상 목록 조회 (랜덤 순서)"""
-    from ..models import Video, Category
-    from sqlalchemy import and_
-    
-    # 카테고리 확인
-    category_obj = db.query(Category).filter(Category.name == category).first()
-    if not category_obj:
+    """키워드가 제목에 포함된 영상 목록 조회 (인메모리 저장소 구간, 제목 2-gram 역색인)
+
+    일치하는 행 번호 목록에서 현재 페이지 영상만 골라 해당 ID만 DB에서 조회한다.
+    order: random (기본값, 같은 seed면 페이지 간 순서 유지) / views (조회수 순) / recent (최신순)
+    """
+    import numpy as np
+    from ..models import Video
+    from ..services.hot_store import hot_store
+    from ..utils.title_index import title_index
+
+    if order not in ("random", "views", "recent"):
+        raise HTTPException(status_code=400, detail="order는 random, views, recent 중 하나여야 합니다.")
+    columns = hot_store.get(db, category)
+    if columns is None:
         raise HTTPException(status_code=404, detail=f"카테고리 '{category}'를 찾을 수 없습니다.")
-    
-    # 키워드가 제목에 포함된 영상 조회 (랜덤 순서, 최대 10개)
-    videos = (
-        db.query(Video)
-        .filter(
-            and_(
-                Video.category_id == category_obj.id,
-                Video.title.contains(keyword)
-            )
-        )
-        .all()
-    )
-    # 랜덤으로 섞기
-    videos = random.sample(videos, min(10, len(videos))) if len(videos) > 10 else videos
-    
+
+    page = max(1, page)
+    page_size = max(1, min(page_size, 100))
+    matches = title_index(columns).search(keyword)
+
+    # 페이지에 해당하는 행만 선택 (전체 일치 영상은 행 번호로만 다룸)
+    offset = (page - 1) * page_size
+    if order == "random":
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+        selected = matches[np.random.default_rng(seed).permutation(len(matches))[offset:offset + page_size]]
+    else:
+        sort_key = columns.view_count if order == "views" else columns.published_at
+        selected = matches[np.argsort(sort_key[matches], kind="stable")[::-1][offset:offset + page_size]]
+
+    ids = columns.ids[selected].tolist()
+    videos_by_id = {video.id: video for video in db.query(Video).filter(Video.id.in_(ids)).all()} if ids else {}
+
     # 응답 데이터 구성
     video_list = []
-    for video in videos:
+    for video_id in ids:
+        video = videos_by_id.get(video_id)
+        if video is None:
+            continue
         video_list.append({
             "video_id": video.video_id,
             "title": video.title,
@@ -226,11 +356,176 @@ async def get_keyword_videos(
             "published_at": video.published_at.isoformat() if video.published_at else None,
             "thumbnail_medium": video.thumbnail_medium,
         })
-    
+
     return {
         "keyword": keyword,
         "category": category,
         "total_count": len(video_list),
+        "match_count": len(matches),
+        "page": page,
+        "page_size": page_size,
+        "order": order,
+        "seed": seed,
         "videos": video_list
     }
 
+
+@router.get("/similar-videos/{category}/{video_id}")
+async def get_similar_videos(
+    category: str,
+    video_id: str,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    """제목 키워드/해시태그 TF-IDF 코사인 유사도가 높은 영상 목록 (인메모리 저장소 구간)"""
+    from ..models import Video
+    from ..services.hot_store import hot_store
+    from ..utils.similarity import similarity_index
+
+    columns = hot_store.get(db, category)
+    if columns is None:
+        raise HTTPException(status_code=404, detail=f"카테고리 '{category}'를 찾을 수 없습니다.")
+    video_pk = db.query(Video.id).filter(Video.video_id == video_id).scalar()
+    index = similarity_index(columns)
+    row = index.row_of(video_pk) if video_pk is not None else None
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"영상 '{video_id}'가 '{category}' 분석 구간에 없습니다.")
+
+    similar = index.similar(row, k=max(1, min(limit, 50)))
+    ids = [int(columns.ids[r]) for r, _, _ in similar]
+    videos_by_id = {video.id: video for video in db.query(Video).filter(Video.id.in_(ids)).all()} if ids else {}
+
+    video_list = []
+    for video_pk, (_, score, shared_terms) in zip(ids, similar):
+        video = videos_by_id.get(video_pk)
+        if video is None:
+            continue
+        video_list.append({
+            "video_id": video.video_id,
+            "title": video.title,
+            "channel_title": video.channel_title,
+            "view_count": video.view_count,
+            "like_count": video.like_count,
+            "comment_count": video.comment_count,
+            "published_at": video.published_at.isoformat() if video.published_at else None,
+            "thumbnail_medium": video.thumbnail_medium,
+            "similarity": round(score, 4),
+            "shared_terms": shared_terms,
+        })
+
+    return {
+        "video_id": video_id,
+        "category": category,
+        "total_count": len(video_list),
+        "videos": video_list,
+    }
+
+
+@router.get("/export/{dataset}/{category}")
+async def export_data(
+    dataset: str,
+    category: str,
+    days: int = 30,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    columns: Optional[str] = None,
+    format: str = "csv",
+    db: Session = Depends(get_db),
+):
+    """원본 데이터 내보내기 (videos 또는 hashtags, 스트리밍 CSV/Parquet)
+
+    - start/end: 게시 시각 구간 (start가 없으면 최근 days일)
+    - columns: 쉼표로 구분된 컬럼 목록 (없으면 전체)
+    """
+    from fastapi.responses import StreamingResponse
+    from ..models import Category
+    from ..services.data_export import resolve_columns, build_export_query, stream_export
+    from ..services.snapshot import parquet_available
+
+    try:
+        selected_columns = resolve_columns(dataset, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format not in ("csv", "parquet"):
+        raise HTTPException(status_code=400, detail="format은 csv 또는 parquet이어야 합니다.")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet 내보내기는 서버에 pyarrow가 필요합니다.")
+
+    category_obj = db.query(Category).filter(Category.name == category).first()
+    if not category_obj:
+        raise HTTPException(status_code=404, detail=f"카테고리 '{category}'를 찾을 수 없습니다.")
+
+    if start is None:
+        start = datetime.utcnow() - timedelta(days=days)
+    query = build_export_query(dataset, selected_columns, category_obj.id, start, end)
+
+    media_type = "application/vnd.apache.parquet" if format == "parquet" else "text/csv; charset=utf-8"
+    filename = f"{dataset}_{category_obj.id}_{start:%Y%m%d}.{format}"
+    return StreamingResponse(
+        stream_export(query, selected_columns, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/sketches/{category}")
+async def get_sketch_summary(
+    category: str,
+    days: int = 30,
+    top_n: int = 20,
+    db: Session = Depends(get_db),
+):
+    """긴 기간 근사 통계 (고유 해시태그/채널 수, 상위 해시태그/키워드 빈도와 오차 범위)
+
+    게시일별 스케치를 병합하므로 기간이 길어도 조인 스캔 없이 일수만큼의 병합 비용만 든다.
+    """
+    from ..models import Category
+    from ..services.sketch_store import sketch_summary
+
+    category_obj = db.query(Category).filter(Category.name == category).first()
+    if not category_obj:
+        raise HTTPException(status_code=404, detail=f"카테고리 '{category}'를 찾을 수 없습니다.")
+    return sketch_summary(db, category_obj.id, days=max(1, min(days, 3650)), top_n=min(top_n, 100))
+
+
+@router.get("/admin/profiles", response_model=List[RequestProfileSummary], dependencies=[Depends(require_admin)])
+async def list_request_profiles(
+    route: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    """저장된 요청 프로파일 목록 (PROFILE_SAMPLE_RATE 표본 또는 PROFILE_SLOW_MS보다 느린 요청)"""
+    from ..services.request_profiles import list_profiles
+
+    return list_profiles(db, route=route, limit=min(limit, 500))
+
+
+@router.get("/admin/profiles/{profile_id}", response_model=RequestProfileDetail, dependencies=[Depends(require_admin)])
+async def get_request_profile(profile_id: int, db: Session = Depends(get_db)):
+    """요청 프로파일 상세 (분석 구간별 시간/SQL 시간, 메모리 할당 위치, 샘플이 많은 스택)"""
+    from ..models import RequestProfile
+    from ..services.request_profiles import profile_detail
+
+    row = db.get(RequestProfile, profile_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"프로파일 {profile_id}를 찾을 수 없습니다.")
+    return RequestProfileDetail(
+        **RequestProfileSummary.model_validate(row).model_dump(),
+        **profile_detail(row),
+    )
+
+
+@router.get("/admin/profiles/{profile_id}/stacks", dependencies=[Depends(require_admin)])
+async def download_request_profile_stacks(profile_id: int, db: Session = Depends(get_db)):
+    """스택 샘플 다운로드 (collapsed stack 형식, flamegraph.pl/speedscope로 시각화)"""
+    from fastapi.responses import PlainTextResponse
+    from ..models import RequestProfile
+    from ..services.request_profiles import decompress_stacks
+
+    row = db.get(RequestProfile, profile_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"프로파일 {profile_id}를 찾을 수 없습니다.")
+    return PlainTextResponse(
+        decompress_stacks(row),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.collapsed"'},
+    )
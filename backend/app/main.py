@@ -1,35 +1,47 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base, SessionLocal
+from fastapi.responses import PlainTextResponse
+from .database import engine, SessionLocal
 from .api import routes
-from .services.scheduler import start_scheduler
-from .models import Video
+from .utils.log import get_logger
+from .utils.metrics import CONTENT_TYPE, REGISTRY, observe_request
+from .utils.profiling import start_capture
+from .utils.query_stats import QUERY_DEBUG, track_queries, warn_repeated
+import os
 import threading
+import time
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 프로세스 역할
+# - api: API 요청 처리 + 수집 작업 큐 워커
+# - scheduler: 리더 선출 후 스케줄러/초기 수집만 실행
+# - all: 둘 다 (단일 프로세스 개발 환경 기본값)
+APP_ROLE = os.getenv("APP_ROLE", "all")
+# 시작 시 스키마 생성/누락 컬럼 추가 여부 (운영에서는 scripts/migrate.py로 별도 실행 권장)
+# 수평 확장하는 api 역할은 기본으로 끄고 scheduler/all 역할에서만 실행 (여러 워커는 락으로 한 번에 하나씩)
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false" if APP_ROLE == "api" else "true").lower() == "true"
+
+log = get_logger("init")
 
-app = FastAPI(
-    title="ConsulTube API",
-    description="YouTube 데이터 분석을 위한 백엔드 API",
-    version="1.0.0",
-)
 
 def check_and_collect_initial_data():
     """서버 시작 시 데이터가 없으면 초기 수집 실행"""
+    from .models import Video
+
     db = SessionLocal()
     try:
-        video_count = db.query(Video).count()
-        if video_count == 0:
-            print("[초기화] 데이터베이스에 영상 데이터가 없습니다. 초기 데이터 수집을 시작합니다...")
+        # 전체 COUNT(*) 대신 한 행만 확인
+        has_videos = db.query(Video.id).limit(1).first() is not None
+        if not has_videos:
+            log.info("데이터베이스에 영상 데이터가 없습니다. 초기 데이터 수집을 시작합니다")
             from .services.scheduler import collect_all_categories
             # 전체 수집으로 초기 데이터 수집
             collect_all_categories(incremental=False)
-            print("[초기화] 초기 데이터 수집이 완료되었습니다.")
+            log.info("초기 데이터 수집이 완료되었습니다")
         else:
-            print(f"[초기화] 데이터베이스에 {video_count}개의 영상 데이터가 있습니다.")
+            log.info("데이터베이스에 영상 데이터가 있습니다. 초기 수집을 건너뜁니다")
     except Exception as e:
-        print(f"[초기화] 초기 데이터 확인 중 오류 발생: {str(e)}")
+        log.exception("초기 데이터 확인 중 오류 발생", error=str(e))
     finally:
         db.close()
 
@@ -39,11 +51,72 @@ def run_initial_collection():
     thread = threading.Thread(target=check_and_collect_initial_data, daemon=True)
     thread.start()
 
-# 스케줄러 시작 (자동 데이터 수집)
-scheduler = start_scheduler()
+# 스케줄러 (자동 데이터 수집) - 여러 워커 중 리더로 선출된 프로세스 하나에서만 실행
+scheduler = None
+
+
+def on_elected():
+    """리더로 선출되면 스케줄러 시작 및 초기 데이터 수집 실행"""
+    global scheduler
+    from .services.scheduler import start_scheduler
+
+    scheduler = start_scheduler()
+    run_initial_collection()
+
+
+def on_revoked():
+    """리더 자격을 잃으면 스케줄러 중지 (실행 중인 작업은 기다리지 않음)"""
+    global scheduler
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+        scheduler = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 처리 (import 시점에는 DB 접근이나 스레드 생성을 하지 않음)"""
+    if DB_AUTO_MIGRATE:
+        from .migrations import upgrade_schema
+        from .services.category_registry import ensure_default_categories
+        from .services.leader_election import MIGRATION_LOCK_NAME, exclusive_lock
+
+        # 데이터베이스 테이블 생성 및 누락 컬럼 추가 (먼저 락을 잡은 워커가 업그레이드, 나머지는 확인만)
+        with exclusive_lock(engine, MIGRATION_LOCK_NAME):
+            upgrade_schema(engine)
+            # 기본 카테고리 레지스트리 시드 (비활성화는 is_active로 관리)
+            with SessionLocal() as db:
+                ensure_default_categories(db)
+
+    job_queue = None
+    if APP_ROLE in ("api", "all"):
+        from .services.job_queue import job_queue
+
+        # 재시작 전 끝나지 않은 수집 작업 재등록
+        job_queue.recover()
+
+    leader_elector = None
+    if APP_ROLE in ("scheduler", "all"):
+        from .services.leader_election import LeaderElector
 
-# 초기 데이터 수집 실행
-run_initial_collection()
+        leader_elector = LeaderElector(engine, on_elected=on_elected, on_revoked=on_revoked)
+        leader_elector.start()
+
+    log.info("서버 시작", role=APP_ROLE)
+    yield
+
+    # 종료 시 작업 큐 정리 및 리더 락 반환 (다른 워커가 즉시 이어받을 수 있도록)
+    if job_queue is not None:
+        job_queue.shutdown()
+    if leader_elector is not None:
+        leader_elector.stop()
+
+
+app = FastAPI(
+    title="ConsulTube API",
+    description="YouTube 데이터 분석을 위한 백엔드 API",
+    version="1.0.0",
+    lifespan=lifespan,
+)
 
 # CORS 설정 (프론트엔드에서 API 호출 허용)
 app.add_middleware(
@@ -54,14 +127,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """요청별 지연 시간과 SQL 문 수/실행 시간 기록 (라우트는 경로 템플릿 기준), 표본/느린 요청 프로파일 저장"""
+    with track_queries(record_statements=QUERY_DEBUG) as query_stats:
+        capture = start_capture(request.url.path)
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            seconds = time.perf_counter() - started
+            route = request.scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            observe_request(request.method, route_path, status, seconds, query_stats)
+            if QUERY_DEBUG:
+                warn_repeated(query_stats, f"{request.method} {route_path}")
+            if capture is not None:
+                reason = capture.finish(seconds)
+                if reason:
+                    from .services.request_profiles import save_profile_async
+
+                    save_profile_async({
+                        "reason": reason,
+                        "method": request.method,
+                        "route": route_path,
+                        "path": request.url.path,
+                        "query_string": request.url.query,
+                        "status": status,
+                        "duration_ms": seconds * 1000,
+                        "sql_statements": query_stats.statements,
+                        "sql_ms": query_stats.seconds * 1000,
+                        "samples": capture.sampler.samples,
+                        "spans": capture.spans,
+                        "memory": capture.memory,
+                        "stacks": capture.sampler.collapsed(),
+                    })
+
+
 # 라우터 등록
 app.include_router(routes.router, prefix="/api", tags=["api"])
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     return {
         "message": "ConsulTube Backend API",
         "docs": "/docs",
     }
-
@@ -0,0 +1,295 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
+from typing import Dict, List
+from .database import Base
+from .utils.classify import classify_tag, classify_title
+from .utils.log import get_logger
+from .utils.text import hashtag_key
+from . import models  # noqa: F401  (메타데이터에 모델 등록)
+
+# 이전 스키마에서 videos에 있던 컬럼 (설명은 video_details로 이동, 썸네일은 video_id로 생성)
+LEGACY_VIDEO_COLUMNS = ["description", "thumbnail_default", "thumbnail_medium", "thumbnail_high"]
+# 설명 이동 시 한 트랜잭션에서 처리할 videos.id 범위
+BACKFILL_BATCH_SIZE = 10000
+# 해시태그 병합 시 IN 목록 하나에 넣을 id 수
+MERGE_IN_BATCH_SIZE = 500
+
+
+def _server_default_sql(column, engine: Engine) -> str:
+    """컬럼의 server_default를 DDL 문자열로 변환"""
+    if column.server_default is None:
+        return ""
+    arg = column.server_default.arg
+    if isinstance(arg, str):
+        return f" DEFAULT '{arg}'"
+    if isinstance(arg, TextClause):
+        return f" DEFAULT {arg.text}"
+    return f" DEFAULT {arg.compile(dialect=engine.dialect)}"
+
+
+def add_missing_columns(engine: Engine) -> List[str]:
+    """모델에는 있지만 DB 테이블에는 없는 컬럼 추가 (create_all은 기존 테이블을 변경하지 않음)
+
+    새 컬럼은 nullable이거나 server_default가 있어야 기존 행이 있는 테이블에도 추가할 수 있다.
+
+    Returns:
+        추가된 "테이블.컬럼" 목록
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                nullable = "NULL" if column.nullable else "NOT NULL"
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    f"{_server_default_sql(column, engine)} {nullable}"
+                ))
+                for index in table.indexes:
+                    if [c.name for c in index.columns] == [column.name]:
+                        index.create(conn, checkfirst=True)
+                added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
+def add_missing_indexes(engine: Engine) -> List[str]:
+    """모델에는 있지만 DB에는 없는 인덱스 생성 (기존 테이블에 나중에 추가한 복합 인덱스 등)
+
+    Returns:
+        생성한 인덱스 이름 목록
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn, checkfirst=True)
+                    created.append(index.name)
+
+    return created
+
+
+def move_video_details(engine: Engine) -> int:
+    """videos의 이전 컬럼 정리: 설명은 video_details로 옮기고 설명/썸네일 컬럼 삭제 (이미 정리됐으면 아무것도 안 함)
+
+    설명 복사는 id 구간(BACKFILL_BATCH_SIZE)마다 나눠 커밋하고, 이미 옮긴 영상은 건너뛰므로
+    중간에 실패해도 다시 실행하면 이어서 진행된다. 컬럼 삭제는 복사가 끝난 뒤 한 번에 한다.
+
+    Returns:
+        video_details로 옮긴 행 수
+    """
+    inspector = inspect(engine)
+    if "videos" not in inspector.get_table_names():
+        return 0
+    existing_columns = {c["name"] for c in inspector.get_columns("videos")}
+    legacy = [name for name in LEGACY_VIDEO_COLUMNS if name in existing_columns]
+    if not legacy:
+        return 0
+
+    moved = 0
+    if "description" in existing_columns:
+        with engine.connect() as conn:
+            max_id = conn.execute(text("SELECT MAX(id) FROM videos")).scalar() or 0
+        for begin in range(0, max_id, BACKFILL_BATCH_SIZE):
+            with engine.begin() as conn:
+                moved += conn.execute(text(
+                    "INSERT INTO video_details (video_id, description) "
+                    "SELECT v.id, v.description FROM videos v "
+                    "LEFT JOIN video_details d ON d.video_id = v.id "
+                    "WHERE v.id > :begin AND v.id <= :end AND d.video_id IS NULL "
+                    "AND v.description IS NOT NULL AND v.description <> ''"
+                ), {"begin": begin, "end": begin + BACKFILL_BATCH_SIZE}).rowcount
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "mysql":
+            # 테이블 재구성을 한 번만 하도록 한 문장으로 삭제
+            conn.execute(text("ALTER TABLE videos " + ", ".join(f"DROP COLUMN {name}" for name in legacy)))
+        else:
+            for name in legacy:
+                conn.execute(text(f"ALTER TABLE videos DROP COLUMN {name}"))
+    get_logger("schema").info("videos 이전 컬럼 삭제", columns=", ".join(legacy))
+    return moved
+
+
+def merge_hashtag_duplicates(engine: Engine) -> int:
+    """정규화 키가 없는 해시태그에 키를 채우고, 키가 같은 해시태그를 하나로 합침 (키 없는 행이 없으면 아무것도 안 함)
+
+    대표 행은 키가 이미 있는 행, 없으면 id가 가장 작은(먼저 수집된) 행이다.
+    나머지 행의 영상 연결은 대표 행으로 옮기고(같은 영상에 겹치면 하나만 남김),
+    원래 표기는 hashtag_aliases에 남긴 뒤 삭제한다. 한 트랜잭션에서 처리한다.
+
+    Returns:
+        합쳐서(또는 키가 비어) 삭제한 해시태그 수
+    """
+    if "hashtags" not in inspect(engine).get_table_names():
+        return 0
+    with engine.connect() as conn:
+        if not conn.execute(text("SELECT COUNT(*) FROM hashtags WHERE canonical_key IS NULL")).scalar():
+            return 0
+
+    with engine.begin() as conn:
+        groups: Dict[str, list] = {}
+        empty = []
+        for row in conn.execute(text("SELECT id, tag, canonical_key FROM hashtags ORDER BY id")):
+            key = row.canonical_key or hashtag_key(row.tag)
+            if key:
+                groups.setdefault(key, []).append(row)
+            else:
+                empty.append({"id": row.id})
+        # '#'만 있는 태그 등 키가 비는 행은 수집 시에도 저장하지 않으므로 삭제
+        if empty:
+            conn.execute(text("DELETE FROM video_hashtags WHERE hashtag_id = :id"), empty)
+            conn.execute(text("DELETE FROM hashtag_aliases WHERE hashtag_id = :id"), empty)
+            conn.execute(text("DELETE FROM hashtags WHERE id = :id"), empty)
+
+        remap = []
+        aliases = []
+        keys = []
+        for key, rows in groups.items():
+            survivor = next((row for row in rows if row.canonical_key is not None), rows[0])
+            for row in rows:
+                if row.id != survivor.id:
+                    remap.append({"old": row.id, "new": survivor.id})
+                    aliases.append({"alias": row.tag, "hashtag_id": survivor.id})
+            if survivor.canonical_key is None:
+                keys.append({"id": survivor.id, "key": key})
+
+        if remap:
+            conn.execute(text("UPDATE video_hashtags SET hashtag_id = :new WHERE hashtag_id = :old"), remap)
+            conn.execute(text("UPDATE hashtag_aliases SET hashtag_id = :new WHERE hashtag_id = :old"), remap)
+            # 같은 영상에 대표 행과 병합된 행이 함께 달려 있던 경우 먼저 생긴 연결만 남김
+            survivors = sorted({item["new"] for item in remap})
+            duplicate_links = []
+            for begin in range(0, len(survivors), MERGE_IN_BATCH_SIZE):
+                batch = survivors[begin:begin + MERGE_IN_BATCH_SIZE]
+                seen = set()
+                for link in conn.execute(text(
+                    "SELECT id, video_id, hashtag_id FROM video_hashtags "
+                    f"WHERE hashtag_id IN ({', '.join(str(hashtag_id) for hashtag_id in batch)}) ORDER BY id"
+                )):
+                    if (link.video_id, link.hashtag_id) in seen:
+                        duplicate_links.append({"id": link.id})
+                    seen.add((link.video_id, link.hashtag_id))
+            if duplicate_links:
+                conn.execute(text("DELETE FROM video_hashtags WHERE id = :id"), duplicate_links)
+            insert_ignore = "INSERT IGNORE" if engine.dialect.name == "mysql" else "INSERT OR IGNORE"
+            conn.execute(
+                text(f"{insert_ignore} INTO hashtag_aliases (alias, hashtag_id) VALUES (:alias, :hashtag_id)"), aliases
+            )
+            conn.execute(text("DELETE FROM hashtags WHERE id = :old"), remap)
+        # 병합된 행을 지운 뒤에 키를 채움 (유니크 인덱스)
+        if keys:
+            conn.execute(text("UPDATE hashtags SET canonical_key = :key WHERE id = :id"), keys)
+
+    return len(remap) + len(empty)
+
+
+def classify_existing(engine: Engine, reclassify: bool = False) -> int:
+    """분류 플래그가 없는 해시태그/영상 제목 분류 (reclassify=True면 분류 규칙 변경 후 전체 다시 계산)
+
+    영상은 id 구간(BACKFILL_BATCH_SIZE)마다 나눠 커밋하므로 중간에 실패해도 다시 실행하면 이어서 진행된다.
+
+    Returns:
+        분류한 해시태그 + 영상 수
+    """
+    tables = set(inspect(engine).get_table_names())
+    if not {"hashtags", "videos"} <= tables:
+        return 0
+    pending = "" if reclassify else " WHERE flags IS NULL"
+    with engine.begin() as conn:
+        hashtags = [
+            {"id": row.id, "flags": classify_tag(row.tag)}
+            for row in conn.execute(text("SELECT id, tag FROM hashtags" + pending))
+        ]
+        if hashtags:
+            conn.execute(text("UPDATE hashtags SET flags = :flags WHERE id = :id"), hashtags)
+    classified = len(hashtags)
+
+    pending = "" if reclassify else " AND title_flags IS NULL"
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT MAX(id) FROM videos")).scalar() or 0
+        # 시작할 때마다 실행되므로 남은 행 확인은 인덱스로
+        if not reclassify and conn.execute(text("SELECT 1 FROM videos WHERE title_flags IS NULL LIMIT 1")).first() is None:
+            max_id = 0
+    for begin in range(0, max_id, BACKFILL_BATCH_SIZE):
+        with engine.begin() as conn:
+            videos = [
+                {"id": row.id, "flags": classify_title(row.title)}
+                for row in conn.execute(text(
+                    "SELECT id, title FROM videos WHERE id > :begin AND id <= :end" + pending
+                ), {"begin": begin, "end": begin + BACKFILL_BATCH_SIZE})
+            ]
+            if videos:
+                conn.execute(text("UPDATE videos SET title_flags = :flags WHERE id = :id"), videos)
+        classified += len(videos)
+    return classified
+
+
+def backfill_job_active_keys(engine: Engine) -> int:
+    """active_key 컬럼 추가 전에 등록된 대기/실행 중 수집 작업에 active_key 기록
+
+    같은 조건의 활성 작업이 이미 여럿이면 가장 먼저 등록된 작업에만 기록한다 (나머지는 그대로 실행 후 끝남).
+
+    Returns:
+        기록한 작업 수
+    """
+    if "collection_jobs" not in inspect(engine).get_table_names():
+        return 0
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, dedupe_key FROM collection_jobs "
+            "WHERE status IN ('pending', 'running') AND active_key IS NULL ORDER BY created_at"
+        )).all()
+        if not rows:
+            return 0
+        taken = {
+            key for (key,) in conn.execute(text("SELECT active_key FROM collection_jobs WHERE active_key IS NOT NULL"))
+        }
+        updates = []
+        for row in rows:
+            if row.dedupe_key not in taken:
+                taken.add(row.dedupe_key)
+                updates.append({"id": row.id, "key": row.dedupe_key})
+        if updates:
+            conn.execute(text("UPDATE collection_jobs SET active_key = :key WHERE id = :id"), updates)
+    return len(updates)
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """테이블 생성, 누락 컬럼 추가 및 데이터 이동"""
+    log = get_logger("schema")
+    Base.metadata.create_all(bind=engine)
+    added = add_missing_columns(engine)
+    if added:
+        log.info("컬럼 추가", columns=", ".join(added))
+    indexes = add_missing_indexes(engine)
+    if indexes:
+        log.info("인덱스 추가", indexes=", ".join(indexes))
+    moved = move_video_details(engine)
+    if moved:
+        log.info("영상 설명을 video_details로 이동", rows=moved)
+    merged = merge_hashtag_duplicates(engine)
+    if merged:
+        log.info("정규화 키가 같은 해시태그 병합", merged=merged)
+    classified = classify_existing(engine)
+    if classified:
+        log.info("해시태그/제목 분류 플래그 계산", rows=classified)
+    activated = backfill_job_active_keys(engine)
+    if activated:
+        log.info("대기/실행 중 수집 작업에 active_key 기록", jobs=activated)
@@ -1,61 +1,185 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Date, Text, ForeignKey, Float, Index, Boolean, LargeBinary, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.mysql import DATETIME
 from .database import Base
+from .utils.classify import classify_tag, classify_title
+from .utils.thumbnails import thumbnail_url
+
+
+def _title_flags(context) -> int:
+    """videos.title_flags 기본값 (INSERT하는 제목으로 분류)"""
+    return classify_title(context.get_current_parameters().get("title"))
+
+
+def _hashtag_flags(context) -> int:
+    """hashtags.flags 기본값 (INSERT하는 태그로 분류)"""
+    return classify_tag(context.get_current_parameters().get("tag"))
 
 
 class Category(Base):
-    """카테고리 테이블"""
+    """카테고리 테이블 (수집 대상 카테고리 레지스트리)"""
     __tablename__ = "categories"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(50), unique=True, nullable=False, index=True)
+    search_query = Column(String(200))  # YouTube 검색 쿼리 (없으면 카테고리명 사용)
+    is_active = Column(Boolean, nullable=False, server_default=text("1"))
     created_at = Column(DATETIME(fsp=6), server_default=func.now())
 
+    # 적응형 스케줄링 상태
+    arrival_rate = Column(Float)  # 신규 영상 유입률 추정치 (개/시간, EWMA)
+    last_collected_at = Column(DATETIME(fsp=6))
+    next_collection_at = Column(DATETIME(fsp=6), index=True)
+
     videos = relationship("Video", back_populates="category")
 
 
 class Video(Base):
-    """YouTube 영상 데이터 테이블"""
+    """YouTube 영상 데이터 테이블
+
+    분석 조회가 읽는 컬럼만 두고, 설명(긴 텍스트)은 video_details로 분리한다.
+    썸네일 URL은 video_id로 만들 수 있어 저장하지 않는다.
+    보존 기간(RETENTION_DAYS)이 지난 영상은 videos_archive로 옮겨진다 (services/retention.py).
+    """
     __tablename__ = "videos"
+    __table_args__ = (
+        # 분석/증분 적재의 "카테고리 + 최근 기간" 조회가 구간 안의 인덱스 범위만 읽도록
+        Index("ix_videos_category_published", "category_id", "published_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     video_id = Column(String(50), unique=True, nullable=False, index=True)
     title = Column(Text, nullable=False)
-    description = Column(Text)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
     published_at = Column(DATETIME(fsp=6), nullable=False, index=True)
     channel_id = Column(String(100), nullable=False, index=True)
     channel_title = Column(String(200), nullable=False)
+    # 제목 분류 비트 플래그 (utils/classify.py, INSERT 시 계산 / 제목을 바꾸는 UPDATE는 직접 지정)
+    title_flags = Column(Integer, default=_title_flags, index=True)
     
     # 통계 데이터
     view_count = Column(Integer, default=0, nullable=False)
     like_count = Column(Integer, default=0, nullable=False)
     comment_count = Column(Integer, default=0, nullable=False)
     
-    # 썸네일 URL
-    thumbnail_default = Column(String(500))
-    thumbnail_medium = Column(String(500))
-    thumbnail_high = Column(String(500))
-    
     # 수집 정보
     collected_at = Column(DATETIME(fsp=6), server_default=func.now(), index=True)
     updated_at = Column(DATETIME(fsp=6), onupdate=func.now())
 
     category = relationship("Category", back_populates="videos")
     hashtags = relationship("VideoHashtag", back_populates="video", cascade="all, delete-orphan")
+    stat_snapshots = relationship("VideoStatSnapshot", back_populates="video", passive_deletes=True)
+    detail = relationship("VideoDetail", back_populates="video", uselist=False, passive_deletes=True)
+
+    @property
+    def description(self):
+        """영상 설명 (접근할 때 video_details에서 조회)"""
+        return self.detail.description if self.detail is not None else None
+
+    @description.setter
+    def description(self, value) -> None:
+        if self.detail is None:
+            self.detail = VideoDetail(description=value)
+        else:
+            self.detail.description = value
+
+    # 썸네일 URL (응답 생성 시 video_id로 계산)
+    @property
+    def thumbnail_default(self) -> str:
+        return thumbnail_url(self.video_id, "default")
+
+    @property
+    def thumbnail_medium(self) -> str:
+        return thumbnail_url(self.video_id, "medium")
+
+    @property
+    def thumbnail_high(self) -> str:
+        return thumbnail_url(self.video_id, "high")
+
+
+class VideoDetail(Base):
+    """영상 부가 정보 테이블 (분석에 쓰지 않는 긴 텍스트, 설명이 있는 영상만 행 존재)"""
+    __tablename__ = "video_details"
+
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    description = Column(Text)
+
+    video = relationship("Video", back_populates="detail")
+
+
+class VideoArchive(Base):
+    """보존 기간이 지난 영상 보관 테이블 (분석 조회 대상 아님, 외래 키 없음)
+
+    영상 행에 설명과 해시태그 목록(JSON)을 합쳐 한 행으로 저장한다.
+    """
+    __tablename__ = "videos_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_id = Column(Integer, nullable=False)  # 보관 전 videos.id
+    video_id = Column(String(50), nullable=False, index=True)
+    title = Column(Text, nullable=False)
+    description = Column(Text)
+    tags = Column(Text)  # 해시태그 목록 (JSON 배열)
+    category_id = Column(Integer, index=True)
+    published_at = Column(DATETIME(fsp=6), nullable=False, index=True)
+    channel_id = Column(String(100), nullable=False)
+    channel_title = Column(String(200), nullable=False)
+    view_count = Column(Integer, default=0, nullable=False)
+    like_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)
+    collected_at = Column(DATETIME(fsp=6))
+    updated_at = Column(DATETIME(fsp=6))
+    archived_at = Column(DATETIME(fsp=6), nullable=False)
+
+
+class VideoStatSnapshot(Base):
+    """영상 통계 스냅샷 테이블 (append-only, 실측 성장률 계산용)
+
+    수집/갱신 시점마다 조회수·좋아요·댓글 수를 한 행씩 기록한다.
+    오래된 스냅샷은 일 단위로 다운샘플링 후 보존 기간이 지나면 삭제된다.
+    """
+    __tablename__ = "video_stat_snapshots"
+    __table_args__ = (
+        Index("ix_video_stat_snapshots_video_captured", "video_id", "captured_at"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DATETIME(fsp=6), nullable=False, index=True)
+    view_count = Column(Integer, default=0, nullable=False)
+    like_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)
+
+    video = relationship("Video", back_populates="stat_snapshots")
 
 
 class Hashtag(Base):
-    """해시태그 테이블"""
+    """해시태그 테이블 (정규화 키 하나당 한 행, 처음 수집된 표기를 대표 표기로 사용)"""
     __tablename__ = "hashtags"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    tag = Column(String(100), unique=True, nullable=False, index=True)
+    tag = Column(String(100), unique=True, nullable=False, index=True)  # 대표 표기
+    # 정규화 키 (utils.text.hashtag_key, MySQL에서도 대소문자를 구분하는 바이너리 비교)
+    canonical_key = Column(
+        String(100).with_variant(String(100, collation="utf8mb4_bin"), "mysql"), unique=True, index=True,
+    )
+    # 분류 비트 플래그 (utils/classify.py: 문자 체계/주 언어, 스팸, 브랜드/인물명, 카테고리 동의어)
+    flags = Column(Integer, default=_hashtag_flags, index=True)
     created_at = Column(DATETIME(fsp=6), server_default=func.now())
 
     videos = relationship("VideoHashtag", back_populates="hashtag")
+    aliases = relationship("HashtagAlias", back_populates="hashtag", passive_deletes=True)
+
+
+class HashtagAlias(Base):
+    """해시태그 표기 변형 테이블 (대표 표기와 다른 원래 표기 -> 해시태그)"""
+    __tablename__ = "hashtag_aliases"
+
+    alias = Column(String(100).with_variant(String(100, collation="utf8mb4_bin"), "mysql"), primary_key=True)
+    hashtag_id = Column(Integer, ForeignKey("hashtags.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    hashtag = relationship("Hashtag", back_populates="aliases")
 
 
 class VideoHashtag(Base):
@@ -90,3 +214,117 @@ class TrendSnapshot(Base):
 
     category = relationship("Category")
 
+
+class CollectionRun(Base):
+    """데이터 수집 실행 이력 테이블 (모니터링 및 할당량 집계용)"""
+    __tablename__ = "collection_runs"
+    __table_args__ = (
+        Index("ix_collection_runs_category_started", "category_id", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    mode = Column(String(20), nullable=False)  # incremental / full / refresh
+    status = Column(String(20), nullable=False, default="running")  # running / succeeded / failed
+    started_at = Column(DATETIME(fsp=6), nullable=False, index=True)
+    finished_at = Column(DATETIME(fsp=6))
+
+    # 수집 범위
+    published_after = Column(DATETIME(fsp=6))  # 검색 시작 시각 (overlap 적용 후)
+    overlap_seconds = Column(Integer, default=0, nullable=False)
+    cursor = Column(String(100))  # 이번 실행에서 확인한 가장 최근 published_at (ISO)
+
+    # 결과
+    rows_written = Column(Integer, default=0, nullable=False)
+    videos_new = Column(Integer, default=0, nullable=False)
+    api_units = Column(Integer, default=0, nullable=False)
+    error = Column(Text)
+
+    category = relationship("Category")
+
+
+class CollectionWatermark(Base):
+    """카테고리별 증분 수집 워터마크 테이블 (증분 시작 지점을 기본 키 조회 한 번으로 결정)"""
+    __tablename__ = "collection_watermarks"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    high_watermark = Column(DATETIME(fsp=6), nullable=False)  # 수집된 영상의 최대 published_at
+    last_run_id = Column(Integer, ForeignKey("collection_runs.id", ondelete="SET NULL"))
+    updated_at = Column(DATETIME(fsp=6), server_default=func.now(), onupdate=func.now())
+
+    category = relationship("Category")
+    last_run = relationship("CollectionRun")
+
+
+class CollectionJob(Base):
+    """수집 요청 작업 큐 테이블 (POST /collect 비동기 처리, 재시작 후 복구용)"""
+    __tablename__ = "collection_jobs"
+    __table_args__ = (
+        Index("ix_collection_jobs_dedupe_status", "dedupe_key", "status"),
+    )
+
+    id = Column(String(36), primary_key=True)  # UUID
+    category = Column(String(50), nullable=False)
+    time_range_days = Column(Integer, default=7, nullable=False)
+    max_results = Column(Integer, default=50, nullable=False)
+    dedupe_key = Column(String(200), nullable=False)
+    # 대기/실행 중인 동안만 dedupe_key, 끝나면 NULL (고유 인덱스로 같은 조건의 활성 작업을 하나로 제한)
+    active_key = Column(String(200), unique=True, index=True)
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending / running / succeeded / failed
+
+    # 진행 상황
+    pages_fetched = Column(Integer, default=0, nullable=False)
+    rows_written = Column(Integer, default=0, nullable=False)
+    videos_collected = Column(Integer, default=0, nullable=False)
+    error = Column(Text)
+
+    created_at = Column(DATETIME(fsp=6), server_default=func.now())
+    started_at = Column(DATETIME(fsp=6))
+    finished_at = Column(DATETIME(fsp=6))
+    updated_at = Column(DATETIME(fsp=6), server_default=func.now(), onupdate=func.now())
+
+
+class CategoryDaySketch(Base):
+    """카테고리/게시일별 근사 통계 스케치 테이블 (수집 시 신규 영상으로 갱신, 조회 시 기간만큼 병합)
+
+    - *_hll: HyperLogLog 레지스터 (고유 해시태그/채널 수)
+    - *_cms: Count-Min 카운터, *_topk: 상위 후보 JSON (해시태그/제목 키워드 빈도)
+    """
+    __tablename__ = "category_day_sketches"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # 게시일 (UTC)
+    video_count = Column(Integer, default=0, nullable=False)
+    tag_hll = Column(LargeBinary(length=1 << 20))
+    channel_hll = Column(LargeBinary(length=1 << 20))
+    tag_cms = Column(LargeBinary(length=1 << 20))
+    tag_topk = Column(Text)
+    token_cms = Column(LargeBinary(length=1 << 20))
+    token_topk = Column(Text)
+    updated_at = Column(DATETIME(fsp=6), server_default=func.now(), onupdate=func.now())
+
+
+class RequestProfile(Base):
+    """요청 프로파일 테이블 (표본/느린 요청의 스택 샘플, 분석 구간 시간, 메모리 할당 위치)
+
+    - spans: 분석 함수 구간별 실행 시간/SQL 시간 JSON
+    - memory: tracemalloc 상위 할당 위치 JSON (PROFILE_TRACEMALLOC 사용 시)
+    - stacks: gzip 압축 collapsed stack ("스택;스택 횟수" 줄)
+    """
+    __tablename__ = "request_profiles"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    created_at = Column(DATETIME(fsp=6), nullable=False, index=True)
+    reason = Column(String(20), nullable=False)  # sampled / slow
+    method = Column(String(10), nullable=False)
+    route = Column(String(200), nullable=False)  # 경로 템플릿
+    path = Column(String(500), nullable=False)
+    query_string = Column(Text)
+    status = Column(Integer, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    sql_statements = Column(Integer, default=0, nullable=False)
+    sql_ms = Column(Float, default=0.0, nullable=False)
+    samples = Column(Integer, default=0, nullable=False)
+    spans = Column(Text)
+    memory = Column(Text)
+    stacks = Column(LargeBinary(length=1 << 24))
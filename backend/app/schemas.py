@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class VideoBase(BaseModel):
@@ -33,15 +33,45 @@ class VideoResponse(VideoBase):
         from_attributes = True
 
 
+class CategoryCreate(BaseModel):
+    name: str
+    search_query: Optional[str] = None
+    is_active: bool = True
+
+
 class CategoryResponse(BaseModel):
     id: int
     name: str
+    search_query: Optional[str] = None
+    is_active: bool = True
+    arrival_rate: Optional[float] = None
+    last_collected_at: Optional[datetime] = None
+    next_collection_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class CollectionRunResponse(BaseModel):
+    id: int
+    category_id: Optional[int] = None
+    mode: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    published_after: Optional[datetime] = None
+    overlap_seconds: int = 0
+    cursor: Optional[str] = None
+    rows_written: int = 0
+    videos_new: int = 0
+    api_units: int = 0
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 class HashtagStats(BaseModel):
     tag: str
     avg_views: float
@@ -110,9 +140,48 @@ class DataCollectionRequest(BaseModel):
     max_results: int = 50
 
 
-class DataCollectionResponse(BaseModel):
-    success: bool
-    message: str
-    videos_collected: int
+class CollectionJobResponse(BaseModel):
+    """수집 작업 상태"""
+    job_id: str = Field(validation_alias="id")
     category: str
+    time_range_days: int
+    max_results: int
+    status: str
+    pages_fetched: int = 0
+    rows_written: int = 0
+    videos_collected: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    deduplicated: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+
+class RequestProfileSummary(BaseModel):
+    """요청 프로파일 목록 항목"""
+    id: int
+    created_at: datetime
+    reason: str
+    method: str
+    route: str
+    path: str
+    query_string: Optional[str] = None
+    status: int
+    duration_ms: float
+    sql_statements: int = 0
+    sql_ms: float = 0.0
+    samples: int = 0
+
+    class Config:
+        from_attributes = True
+
 
+class RequestProfileDetail(RequestProfileSummary):
+    """요청 프로파일 상세 (분석 구간 시간, 메모리 할당 위치, 상위 스택)"""
+    spans: List[Dict[str, Any]] = []
+    memory: Optional[List[Dict[str, Any]]] = None
+    top_stacks: List[Dict[str, Any]] = []
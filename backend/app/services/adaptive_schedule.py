@@ -0,0 +1,81 @@
+import os
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Optional
+from ..models import Category
+from .collection_runs import quota_units_used_today
+
+# 카테고리별 증분 수집 간격 범위 (분)
+MIN_INTERVAL_MINUTES = int(os.getenv("ADAPTIVE_MIN_INTERVAL_MINUTES", "60"))
+MAX_INTERVAL_MINUTES = int(os.getenv("ADAPTIVE_MAX_INTERVAL_MINUTES", str(24 * 60)))
+# 한 번의 증분 수집에서 기대하는 신규 영상 수 (검색 결과 1페이지 = 50개의 절반)
+TARGET_NEW_VIDEOS_PER_RUN = int(os.getenv("ADAPTIVE_TARGET_NEW_VIDEOS", "25"))
+# 하루 할당량 상한 (YouTube 기본 할당량 10,000 단위 중 여유분 제외)
+DAILY_QUOTA_CAP = int(os.getenv("YOUTUBE_DAILY_QUOTA_CAP", "8000"))
+# 증분 수집 1회 예상 비용 (search.list 1페이지 + videos.list)
+ESTIMATED_RUN_UNITS = 100 + 50
+# 유입률 EWMA 가중치 (최근 관측값 비중)
+EWMA_ALPHA = 0.3
+
+
+def estimate_arrival_rate(
+    previous_rate: Optional[float],
+    new_videos: int,
+    elapsed_hours: float,
+    max_results: int,
+) -> float:
+    """신규 영상 유입률(개/시간) EWMA 갱신
+
+    수집 결과가 max_results에 도달(포화)하면 실제 유입량은 더 많았다는 뜻이므로
+    관측값을 두 배로 잡아 다음 간격을 빠르게 줄인다.
+    """
+    elapsed_hours = max(elapsed_hours, 1 / 60)
+    observed = new_videos / elapsed_hours
+    if new_videos >= max_results:
+        observed *= 2
+    if previous_rate is None:
+        return observed
+    return EWMA_ALPHA * observed + (1 - EWMA_ALPHA) * previous_rate
+
+
+def plan_next_interval(arrival_rate: Optional[float]) -> timedelta:
+    """유입률에 맞춰 다음 증분 수집까지의 간격 계산 (최소/최대 간격으로 제한)"""
+    if not arrival_rate or arrival_rate <= 0:
+        minutes = MAX_INTERVAL_MINUTES
+    else:
+        minutes = TARGET_NEW_VIDEOS_PER_RUN / arrival_rate * 60
+    minutes = min(max(minutes, MIN_INTERVAL_MINUTES), MAX_INTERVAL_MINUTES)
+    return timedelta(minutes=minutes)
+
+
+def update_category_schedule(
+    category: Category, new_videos: int, max_results: int, now: Optional[datetime] = None
+) -> None:
+    """증분 수집 결과로 카테고리 유입률/다음 수집 시각 갱신 (커밋은 호출자가 수행)"""
+    now = now or datetime.utcnow()
+    if category.last_collected_at:
+        elapsed_hours = (now - category.last_collected_at).total_seconds() / 3600
+    else:
+        elapsed_hours = MAX_INTERVAL_MINUTES / 60
+    category.arrival_rate = estimate_arrival_rate(
+        category.arrival_rate, new_videos, elapsed_hours, max_results
+    )
+    category.last_collected_at = now
+    category.next_collection_at = now + plan_next_interval(category.arrival_rate)
+
+
+def defer_after_failure(category: Category, now: Optional[datetime] = None) -> None:
+    """수집 실패 시 MIN_INTERVAL 뒤 재시도 (유입률과 마지막 수집 시각은 그대로 두어 일시적 오류가 간격을 늘리지 않음)"""
+    now = now or datetime.utcnow()
+    category.next_collection_at = now + timedelta(minutes=MIN_INTERVAL_MINUTES)
+
+
+def has_quota_for(db: Session, units: int, daily_cap: int = DAILY_QUOTA_CAP) -> bool:
+    """오늘 사용한 할당량(collection_runs 합계)에 units를 더해도 상한 이내인지 확인"""
+    return quota_units_used_today(db) + units <= daily_cap
+
+
+def next_quota_reset() -> datetime:
+    """다음 할당량 초기화 시각 (YouTube 할당량은 태평양 자정 기준이지만 UTC 자정으로 근사)"""
+    tomorrow = datetime.utcnow().date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day)
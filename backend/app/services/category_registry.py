@@ -0,0 +1,68 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..models import Category
+
+# 기본 카테고리 및 검색 쿼리 (레지스트리가 비어 있을 때 시드 데이터로 사용)
+DEFAULT_CATEGORIES = {
+    "뷰티": "뷰티 메이크업",
+    "패션": "패션 스타일",
+    "음식": "요리 레시피",
+    "여행": "여행 브이로그",
+    "게임": "게임 플레이",
+    "음악": "음악 뮤직비디오",
+    "스포츠": "스포츠 하이라이트",
+    "교육": "교육 강의",
+}
+
+
+def ensure_default_categories(db: Session) -> None:
+    """기본 카테고리 시드 (기존 행의 비어 있는 검색 쿼리도 채움)"""
+    existing = {c.name: c for c in db.query(Category).all()}
+    for name, query in DEFAULT_CATEGORIES.items():
+        category = existing.get(name)
+        if category is None:
+            db.add(Category(name=name, search_query=query, is_active=True))
+        elif not category.search_query:
+            category.search_query = query
+    db.commit()
+
+
+def get_active_categories(db: Session) -> List[Category]:
+    """수집 대상(활성) 카테고리 목록"""
+    categories = (
+        db.query(Category)
+        .filter(Category.is_active.is_(True))
+        .order_by(Category.id)
+        .all()
+    )
+    if not categories and db.query(Category).count() == 0:
+        ensure_default_categories(db)
+        return get_active_categories(db)
+    return categories
+
+
+def get_active_category_names(db: Session) -> List[str]:
+    """수집 대상(활성) 카테고리 이름 목록"""
+    return [c.name for c in get_active_categories(db)]
+
+
+def get_search_query(category: Optional[Category], category_name: str) -> str:
+    """카테고리 검색 쿼리 (레지스트리 값 -> 기본값 -> 카테고리명 순)"""
+    if category is not None and category.search_query:
+        return category.search_query
+    return DEFAULT_CATEGORIES.get(category_name, category_name)
+
+
+def upsert_category(
+    db: Session, name: str, search_query: Optional[str] = None, is_active: bool = True
+) -> Category:
+    """카테고리 등록 또는 수정"""
+    category = db.query(Category).filter(Category.name == name).first()
+    if category is None:
+        category = Category(name=name)
+        db.add(category)
+    category.search_query = search_query or DEFAULT_CATEGORIES.get(name, name)
+    category.is_active = is_active
+    db.commit()
+    db.refresh(category)
+    return category
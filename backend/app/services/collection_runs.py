@@ -0,0 +1,106 @@
+import os
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime, timedelta
+from typing import Optional
+from ..models import Video, CollectionRun, CollectionWatermark
+
+# 증분 수집 시 워터마크 이전으로 겹쳐 조회하는 구간 (초)
+# 검색 색인이 늦게 반영된 영상을 놓치지 않기 위함
+INCREMENTAL_OVERLAP_SECONDS = int(os.getenv("INCREMENTAL_OVERLAP_SECONDS", str(6 * 3600)))
+
+
+def get_incremental_start(
+    db: Session, category_id: int, overlap_seconds: int = INCREMENTAL_OVERLAP_SECONDS
+) -> Optional[datetime]:
+    """증분 수집 시작 시각 (워터마크 - overlap)
+
+    워터마크가 없으면 기존 영상의 최대 published_at으로 한 번 초기화한다.
+    """
+    watermark = db.get(CollectionWatermark, category_id)
+    if watermark is not None:
+        high_watermark = watermark.high_watermark
+    else:
+        high_watermark = (
+            db.query(func.max(Video.published_at))
+            .filter(Video.category_id == category_id)
+            .scalar()
+        )
+    if high_watermark is None:
+        return None
+    return high_watermark - timedelta(seconds=overlap_seconds)
+
+
+def start_run(
+    db: Session,
+    category_id: Optional[int],
+    mode: str,
+    published_after: Optional[datetime] = None,
+    overlap_seconds: int = 0,
+) -> CollectionRun:
+    """수집 실행 기록 시작 (별도 커밋하여 실패한 실행도 이력에 남김)"""
+    run = CollectionRun(
+        category_id=category_id,
+        mode=mode,
+        status="running",
+        started_at=datetime.utcnow(),
+        published_after=published_after,
+        overlap_seconds=overlap_seconds,
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def finish_run(
+    db: Session,
+    run: CollectionRun,
+    rows_written: int,
+    videos_new: int,
+    api_units: int,
+    high_watermark: Optional[datetime] = None,
+) -> None:
+    """수집 실행 성공 기록 및 워터마크 전진 (커밋은 호출자의 데이터 커밋과 함께 수행)"""
+    run.status = "succeeded"
+    run.finished_at = datetime.utcnow()
+    run.rows_written = rows_written
+    run.videos_new = videos_new
+    run.api_units = api_units
+    if high_watermark is not None:
+        run.cursor = high_watermark.isoformat()
+
+    if run.category_id is None or high_watermark is None:
+        return
+    watermark = db.get(CollectionWatermark, run.category_id)
+    if watermark is None:
+        db.add(CollectionWatermark(
+            category_id=run.category_id,
+            high_watermark=high_watermark,
+            last_run_id=run.id,
+        ))
+    else:
+        if high_watermark > watermark.high_watermark:
+            watermark.high_watermark = high_watermark
+        watermark.last_run_id = run.id
+
+
+def fail_run(db: Session, run: CollectionRun, error: str, api_units: int = 0) -> None:
+    """수집 실행 실패 기록 (호출 전에 데이터 트랜잭션은 롤백되어 있어야 함)"""
+    run.status = "failed"
+    run.finished_at = datetime.utcnow()
+    run.api_units = api_units
+    run.error = error[:2000]
+    db.commit()
+
+
+def quota_units_used_today(db: Session) -> int:
+    """오늘(UTC) 수집 실행에서 사용한 API 할당량 합계"""
+    today = datetime.utcnow().date()
+    start_of_day = datetime(today.year, today.month, today.day)
+    used = (
+        db.query(func.coalesce(func.sum(CollectionRun.api_units), 0))
+        .filter(CollectionRun.started_at >= start_of_day)
+        .scalar()
+    )
+    return int(used or 0)
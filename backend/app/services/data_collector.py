@@ -1,38 +1,68 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime, timedelta
-from typing import List
-from ..models import Video, Category, Hashtag, VideoHashtag
+from sqlalchemy import and_, delete, insert, update
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import time
+from ..models import Video, VideoDetail, Category, Hashtag, HashtagAlias, VideoHashtag
 from .youtube_service import YouTubeService
+from .stats_history import build_snapshot_rows, record_snapshots
+from .sketch_store import record_new_videos
+from ..utils.classify import classify_title
+from ..utils.log import get_logger, log_context
+from ..utils.metrics import record_collection
+from ..utils.text import hashtag_key
+from .category_registry import ensure_default_categories, get_search_query
+from .collection_runs import (
+    INCREMENTAL_OVERLAP_SECONDS,
+    get_incremental_start,
+    start_run,
+    finish_run,
+    fail_run,
+)
+
+# IN 목록 한 번에 넣을 값 수 (DB 파라미터 수 제한 대비)
+IN_BATCH_SIZE = 500
+
+log = get_logger("collector")
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """tz-aware datetime을 UTC 기준 naive datetime으로 변환 (DB 저장 형식과 통일)"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 class DataCollector:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, youtube_service: Optional[YouTubeService] = None):
         self.db = db
-        self.youtube_service = YouTubeService()
+        self.youtube_service = youtube_service or YouTubeService()
 
     def get_or_create_category(self, category_name: str) -> Category:
-        """카테고리 가져오기 또는 생성"""
+        """카테고리 가져오기 또는 생성
+
+        레지스트리에 없는 이름(POST /collect의 임의 카테고리, 오타 등)은 비활성으로 만들어
+        스케줄 수집 대상이 되지 않게 한다 (활성화는 레지스트리 API로만).
+        """
         category = self.db.query(Category).filter(Category.name == category_name).first()
+        if not category and self.db.query(Category.id).first() is None:
+            # 레지스트리가 비어 있으면 기본 카테고리부터 시드 (기본 카테고리는 활성)
+            ensure_default_categories(self.db)
+            category = self.db.query(Category).filter(Category.name == category_name).first()
         if not category:
-            category = Category(name=category_name)
+            category = Category(name=category_name, is_active=False)
             self.db.add(category)
             self.db.commit()
             self.db.refresh(category)
         return category
 
-    def get_or_create_hashtag(self, tag: str) -> Hashtag:
-        """해시태그 가져오기 또는 생성"""
-        hashtag = self.db.query(Hashtag).filter(Hashtag.tag == tag).first()
-        if not hashtag:
-            hashtag = Hashtag(tag=tag)
-            self.db.add(hashtag)
-            self.db.commit()
-            self.db.refresh(hashtag)
-        return hashtag
-
     def collect_videos(
-        self, category_name: str, time_range_days: int = 7, max_results: int = 50, incremental: bool = True
+        self,
+        category_name: str,
+        time_range_days: int = 7,
+        max_results: int = 50,
+        incremental: bool = True,
+        progress_callback: Optional[Callable[..., None]] = None,
     ) -> int:
         """YouTube에서 영상 데이터 수집 및 저장
         
@@ -41,109 +71,244 @@ class DataCollector:
             time_range_days: 수집할 기간 (일)
             max_results: 최대 수집 영상 수
             incremental: 증분 수집 여부 (True: 마지막 수집 이후 새 영상만, False: 전체 수집)
+            progress_callback: 진행 상황 콜백 (pages_fetched=, rows_written= 키워드 인자로 호출)
         """
-        # 증분 수집인 경우, 마지막 수집 시간 확인
+        # 카테고리 가져오기 또는 생성
+        category = self.get_or_create_category(category_name)
+
+        # 증분 수집인 경우, 워터마크에서 시작 시각 조회 (기본 키 조회 1회)
         published_after = None
+        overlap_seconds = 0
         if incremental:
-            category = self.db.query(Category).filter(Category.name == category_name).first()
-            if category:
-                # 해당 카테고리의 가장 최근 수집 시간 확인
-                last_collected = (
-                    self.db.query(Video.collected_at)
-                    .filter(Video.category_id == category.id)
-                    .order_by(Video.collected_at.desc())
-                    .first()
-                )
-                if last_collected and last_collected[0]:
-                    # 마지막 수집 시간 이후의 영상만 수집
-                    published_after = last_collected[0]
-                    print(f"[증분 수집] {category_name}: 마지막 수집 시간 이후 영상만 수집 ({published_after})")
-        
-        # YouTube API에서 데이터 가져오기
-        video_data_list = self.youtube_service.fetch_video_data(
-            category=category_name,
-            max_results=max_results,
-            time_range_days=time_range_days,
+            overlap_seconds = INCREMENTAL_OVERLAP_SECONDS
+            published_after = get_incremental_start(self.db, category.id, overlap_seconds)
+
+        mode = "incremental" if incremental else "full"
+        run = start_run(
+            self.db,
+            category_id=category.id,
+            mode=mode,
             published_after=published_after,
+            overlap_seconds=overlap_seconds,
         )
+        units_before = self.youtube_service.quota_units_used
+        calls_before = getattr(self.youtube_service, "api_calls", 0)
+        started = time.perf_counter()
+
+        # 이 실행에서 남는 로그(API 오류 포함)에 수집 실행 id를 붙여 한 실행의 로그를 묶음
+        with log_context(run_id=run.id, category=category_name, mode=mode):
+            if published_after:
+                log.info("워터마크 이후 영상만 수집", published_after=published_after, overlap_seconds=overlap_seconds)
+            try:
+                # YouTube API에서 데이터 가져오기
+                video_data_list = self.youtube_service.fetch_video_data(
+                    category=category_name,
+                    max_results=max_results,
+                    time_range_days=time_range_days,
+                    published_after=published_after,
+                    query=get_search_query(category, category_name),
+                    on_page=(
+                        (lambda pages, _: progress_callback(pages_fetched=pages))
+                        if progress_callback else None
+                    ),
+                )
+                collected_count = self._store_videos(category, video_data_list)
+                high_watermark = max(
+                    (_to_naive_utc(v["published_at"]) for v in video_data_list), default=None
+                )
+                finish_run(
+                    self.db,
+                    run,
+                    rows_written=len(video_data_list),
+                    videos_new=collected_count,
+                    api_units=self.youtube_service.quota_units_used - units_before,
+                    high_watermark=high_watermark,
+                )
+                self.db.commit()
+                if progress_callback:
+                    progress_callback(rows_written=len(video_data_list))
+            except Exception as e:
+                self.db.rollback()
+                fail_run(self.db, run, str(e), self.youtube_service.quota_units_used - units_before)
+                log.exception("데이터 저장 실패", error=str(e))
+                record_collection(
+                    category_name, mode, "failed", time.perf_counter() - started,
+                    api_calls=getattr(self.youtube_service, "api_calls", 0) - calls_before,
+                    quota_units=self.youtube_service.quota_units_used - units_before,
+                )
+                raise
+
+            seconds = time.perf_counter() - started
+            record_collection(
+                category_name, mode, "succeeded", seconds,
+                api_calls=getattr(self.youtube_service, "api_calls", 0) - calls_before,
+                quota_units=self.youtube_service.quota_units_used - units_before,
+                rows_upserted=len(video_data_list),
+                videos_new=collected_count,
+            )
+            log.debug(
+                "수집 실행 완료", rows=len(video_data_list), videos_new=collected_count,
+                api_units=self.youtube_service.quota_units_used - units_before, seconds=round(seconds, 3),
+            )
+
+        return collected_count
+
+    def _store_videos(self, category: Category, video_data_list: List[dict]) -> int:
+        """수집한 영상 데이터 저장 (커밋은 호출자가 수행)
+
+        영상/해시태그 수와 관계없이 SQL 문 수가 일정하도록 IN 조회와 executemany로 일괄 처리한다.
 
-        if not video_data_list:
+        Returns:
+            새로 추가된 영상 수
+        """
+        # 같은 영상이 목록에 여러 번 있으면 마지막 데이터 사용
+        by_video_id = {video_data["video_id"]: video_data for video_data in video_data_list}
+        if not by_video_id:
             return 0
+        pks = self._video_pks(list(by_video_id))
 
-        # 카테고리 가져오기 또는 생성
-        category = self.get_or_create_category(category_name)
+        now = datetime.utcnow()
+        update_rows = [
+            {
+                "id": pks[video_id],
+                "title": video_data["title"],
+                # 제목이 바뀌었을 수 있으므로 분류도 다시 (INSERT는 모델 기본값으로 계산)
+                "title_flags": classify_title(video_data["title"]),
+                "view_count": video_data["view_count"],
+                "like_count": video_data["like_count"],
+                "comment_count": video_data["comment_count"],
+                "updated_at": now,
+            }
+            for video_id, video_data in by_video_id.items()
+            if video_id in pks
+        ]
+        new_videos = [video_data for video_id, video_data in by_video_id.items() if video_id not in pks]
 
-        collected_count = 0
+        # 기존 영상 통계 갱신 (기본 키 기준 일괄 UPDATE)
+        if update_rows:
+            self.db.execute(update(Video), update_rows)
+        # 새 영상 일괄 추가 후 id 조회
+        if new_videos:
+            self.db.execute(insert(Video), [
+                {
+                    "video_id": video_data["video_id"],
+                    "title": video_data["title"],
+                    "category_id": category.id,
+                    "published_at": video_data["published_at"],
+                    "channel_id": video_data["channel_id"],
+                    "channel_title": video_data["channel_title"],
+                    "view_count": video_data["view_count"],
+                    "like_count": video_data["like_count"],
+                    "comment_count": video_data["comment_count"],
+                }
+                for video_data in new_videos
+            ])
+            pks.update(self._video_pks([video_data["video_id"] for video_data in new_videos]))
 
-        for video_data in video_data_list:
-            # 기존 영상 확인 (video_id로)
-            existing_video = (
-                self.db.query(Video)
-                .filter(Video.video_id == video_data["video_id"])
-                .first()
+        # 영상 설명 교체 (video_details, 설명이 있는 영상만 행 저장)
+        existing_pks = [row["id"] for row in update_rows]
+        for begin in range(0, len(existing_pks), IN_BATCH_SIZE):
+            self.db.execute(
+                delete(VideoDetail).where(VideoDetail.video_id.in_(existing_pks[begin:begin + IN_BATCH_SIZE]))
             )
+        details = [
+            {"video_id": pks[video_id], "description": video_data["description"]}
+            for video_id, video_data in by_video_id.items()
+            if video_data.get("description")
+        ]
+        if details:
+            self.db.execute(insert(VideoDetail), details)
 
-            if existing_video:
-                # 기존 영상 업데이트 (통계 데이터 갱신)
-                existing_video.title = video_data["title"]
-                existing_video.description = video_data["description"]
-                existing_video.view_count = video_data["view_count"]
-                existing_video.like_count = video_data["like_count"]
-                existing_video.comment_count = video_data["comment_count"]
-                existing_video.thumbnail_default = video_data["thumbnail_default"]
-                existing_video.thumbnail_medium = video_data["thumbnail_medium"]
-                existing_video.thumbnail_high = video_data["thumbnail_high"]
-                existing_video.updated_at = datetime.utcnow()
-                video = existing_video
-            else:
-                # 새 영상 생성
-                video = Video(
-                    video_id=video_data["video_id"],
-                    title=video_data["title"],
-                    description=video_data["description"],
-                    category_id=category.id,
-                    published_at=video_data["published_at"],
-                    channel_id=video_data["channel_id"],
-                    channel_title=video_data["channel_title"],
-                    view_count=video_data["view_count"],
-                    like_count=video_data["like_count"],
-                    comment_count=video_data["comment_count"],
-                    thumbnail_default=video_data["thumbnail_default"],
-                    thumbnail_medium=video_data["thumbnail_medium"],
-                    thumbnail_high=video_data["thumbnail_high"],
+        # 해시태그 연결 교체 (태그가 있는 영상만, 기존 영상 업데이트 시에도)
+        tagged = {video_id: video_data["tags"] for video_id, video_data in by_video_id.items() if video_data.get("tags")}
+        hashtags: Dict[str, Tuple[int, str]] = {}
+        if tagged:
+            hashtags = self._resolve_hashtags({tag for tags in tagged.values() for tag in tags})
+            new_ids = {video_data["video_id"] for video_data in new_videos}
+            existing_tagged = [pks[video_id] for video_id in tagged if video_id not in new_ids]
+            for begin in range(0, len(existing_tagged), IN_BATCH_SIZE):
+                self.db.execute(
+                    delete(VideoHashtag).where(VideoHashtag.video_id.in_(existing_tagged[begin:begin + IN_BATCH_SIZE]))
                 )
-                self.db.add(video)
-                self.db.flush()
-                collected_count += 1
-
-            # 해시태그 처리
-            if video_data.get("tags"):
-                # 기존 해시태그 연결 삭제 (기존 영상 업데이트 시에도)
-                self.db.query(VideoHashtag).filter(
-                    VideoHashtag.video_id == video.id
-                ).delete()
-                self.db.flush()  # 삭제 후 flush
-
-                # 태그 중복 제거 및 해시태그 추가
-                unique_tags = list(set(video_data["tags"]))  # 중복 제거
-                added_hashtag_ids = set()  # 이미 추가한 해시태그 ID 추적
-                
-                for tag in unique_tags:
-                    hashtag = self.get_or_create_hashtag(tag)
-                    # 중복 체크
-                    if hashtag.id not in added_hashtag_ids:
-                        video_hashtag = VideoHashtag(
-                            video_id=video.id, hashtag_id=hashtag.id
-                        )
-                        self.db.add(video_hashtag)
-                        added_hashtag_ids.add(hashtag.id)
-
-        try:
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            print(f"[오류] 데이터 저장 실패: {str(e)}")
-            raise
-        
-        return collected_count
+            links = []
+            for video_id, tags in tagged.items():
+                # 태그 중복 제거 (표기만 다른 태그가 같은 해시태그로 합쳐지는 경우 포함)
+                for hashtag_id in dict.fromkeys(hashtags[tag][0] for tag in tags if tag in hashtags):
+                    links.append({"video_id": pks[video_id], "hashtag_id": hashtag_id})
+            if links:
+                self.db.execute(insert(VideoHashtag), links)
+
+        # 통계 스냅샷 기록 (같은 트랜잭션에서 한 번에 일괄 삽입)
+        record_snapshots(self.db, build_snapshot_rows(
+            {**video_data, "id": pks[video_id]} for video_id, video_data in by_video_id.items()
+        ))
+        # 근사 통계 스케치는 신규 영상만 반영 (같은 영상을 두 번 세지 않도록, 태그는 대표 표기로)
+        record_new_videos(self.db, category.id, [
+            {**video_data, "tags": [hashtags[tag][1] for tag in video_data.get("tags") or [] if tag in hashtags]}
+            for video_data in new_videos
+        ])
+
+        return len(new_videos)
+
+    def _video_pks(self, video_ids: List[str]) -> Dict[str, int]:
+        """YouTube video_id → videos.id (IN 조회, IN_BATCH_SIZE개씩)"""
+        pks: Dict[str, int] = {}
+        for begin in range(0, len(video_ids), IN_BATCH_SIZE):
+            pks.update(
+                self.db.query(Video.video_id, Video.id)
+                .filter(Video.video_id.in_(video_ids[begin:begin + IN_BATCH_SIZE]))
+                .all()
+            )
+        return pks
+
+    def _resolve_hashtags(self, tags: Set[str]) -> Dict[str, Tuple[int, str]]:
+        """태그(원래 표기) → (hashtags.id, 대표 표기) (정규화 키 기준, 없는 키는 일괄 추가, 저장할 수 없는 태그는 결과에서 빠짐)
 
+        대표 표기와 다른 표기는 hashtag_aliases에 남긴다.
+        """
+        keys = {tag: hashtag_key(tag) for tag in sorted(tags)}
+        keys = {tag: key for tag, key in keys.items() if key}
+        # 새 해시태그의 대표 표기: 키별로 정렬 순서상 첫 표기
+        first_forms: Dict[str, str] = {}
+        for tag, key in keys.items():
+            first_forms.setdefault(key, tag)
+        unique_keys = list(first_forms)
+        found = self._lookup_hashtags(unique_keys)
+        missing = [key for key in unique_keys if key not in found]
+        if missing:
+            # 동시에 수집 중인 다른 작업이 먼저 추가한 키는 건너뜀
+            self.db.execute(
+                insert(Hashtag).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                [{"tag": first_forms[key], "canonical_key": key} for key in missing],
+            )
+            found.update(self._lookup_hashtags(missing))
+            # 대표 표기가 키가 다른 기존 행과 충돌한 경우 (MySQL 콜레이션의 후행 공백/악센트 무시 등)
+            # DB 비교 규칙으로 하나씩 조회해 그 행에 합침 (드묾)
+            for key in missing:
+                if key not in found:
+                    row = self.db.query(Hashtag.id, Hashtag.tag).filter(Hashtag.tag == first_forms[key]).first()
+                    if row is not None:
+                        found[key] = (row.id, row.tag)
+        aliases = [
+            {"alias": tag, "hashtag_id": found[key][0]}
+            for tag, key in keys.items() if key in found and tag != found[key][1]
+        ]
+        if aliases:
+            self.db.execute(
+                insert(HashtagAlias).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                aliases,
+            )
+        return {tag: found[key] for tag, key in keys.items() if key in found}
+
+    def _lookup_hashtags(self, keys: List[str]) -> Dict[str, Tuple[int, str]]:
+        """정규화 키 → (hashtags.id, 대표 표기) (IN 조회, IN_BATCH_SIZE개씩)"""
+        found: Dict[str, Tuple[int, str]] = {}
+        for begin in range(0, len(keys), IN_BATCH_SIZE):
+            rows = (
+                self.db.query(Hashtag.canonical_key, Hashtag.id, Hashtag.tag)
+                .filter(Hashtag.canonical_key.in_(keys[begin:begin + IN_BATCH_SIZE]))
+                .all()
+            )
+            for key, hashtag_id, tag in rows:
+                found[key] = (hashtag_id, tag)
+        return found
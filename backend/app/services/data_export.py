@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import and_, select
+from sqlalchemy.sql import Select
+from ..database import engine
+from ..models import Hashtag, Video, VideoDetail, VideoHashtag
+from .snapshot import EXPORT_BATCH_SIZE, iter_csv_chunks, iter_parquet_chunks
+
+# 데이터셋별 내보낼 수 있는 컬럼 (이름 -> SQL 식, 순서 = 기본 컬럼 순서)
+EXPORT_DATASETS: Dict[str, Dict] = {
+    "videos": {
+        "video_id": Video.video_id,
+        "title": Video.title,
+        "description": VideoDetail.description,
+        "channel_id": Video.channel_id,
+        "channel_title": Video.channel_title,
+        "published_at": Video.published_at,
+        "view_count": Video.view_count,
+        "like_count": Video.like_count,
+        "comment_count": Video.comment_count,
+        "collected_at": Video.collected_at,
+        "updated_at": Video.updated_at,
+    },
+    "hashtags": {
+        "video_id": Video.video_id,
+        "tag": Hashtag.tag,
+        "channel_id": Video.channel_id,
+        "published_at": Video.published_at,
+        "view_count": Video.view_count,
+        "like_count": Video.like_count,
+        "comment_count": Video.comment_count,
+    },
+}
+# 한 번에 HTTP 응답으로 내보내는 CSV 행 수
+CSV_ROWS_PER_CHUNK = 1000
+
+
+def resolve_columns(dataset: str, columns: Optional[str]) -> List[str]:
+    """쉼표로 구분된 컬럼 목록 검증 (없으면 데이터셋 전체 컬럼)
+
+    Raises:
+        ValueError: 알 수 없는 데이터셋이나 컬럼
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"알 수 없는 데이터셋입니다: {dataset} (가능: {', '.join(EXPORT_DATASETS)})")
+    available = EXPORT_DATASETS[dataset]
+    if not columns:
+        return list(available)
+    selected = [c.strip() for c in columns.split(",") if c.strip()]
+    unknown = [c for c in selected if c not in available]
+    if unknown or not selected:
+        raise ValueError(
+            f"알 수 없는 컬럼입니다: {', '.join(unknown) or columns} (가능: {', '.join(available)})"
+        )
+    return selected
+
+
+def build_export_query(
+    dataset: str,
+    columns: Sequence[str],
+    category_id: int,
+    start: datetime,
+    end: Optional[datetime] = None,
+) -> Select:
+    """카테고리 + 게시 시각 구간 조건의 내보내기 쿼리 (게시 시각 순)"""
+    expressions = EXPORT_DATASETS[dataset]
+    conditions = [Video.category_id == category_id, Video.published_at >= start]
+    if end is not None:
+        conditions.append(Video.published_at < end)
+
+    query = select(*[expressions[c].label(c) for c in columns]).select_from(Video)
+    if "description" in columns:
+        # 설명은 별도 테이블 (설명이 없는 영상도 내보내도록 외부 조인)
+        query = query.outerjoin(VideoDetail, VideoDetail.video_id == Video.id)
+    if dataset == "hashtags":
+        query = query.join(VideoHashtag, VideoHashtag.video_id == Video.id).join(
+            Hashtag, Hashtag.id == VideoHashtag.hashtag_id
+        )
+    return query.where(and_(*conditions)).order_by(Video.published_at, Video.id)
+
+
+def stream_export(query: Select, columns: Sequence[str], file_format: str = "csv") -> Iterator:
+    """내보내기 결과를 조각 단위로 생성 (서버 측 커서로 EXPORT_BATCH_SIZE 행씩 읽으므로 메모리 사용량 일정)
+
+    요청 세션은 응답 스트리밍 전에 닫히므로 제너레이터 안에서 별도 연결을 연다.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(query)
+        rows = (row for partition in result.partitions() for row in partition)
+        if file_format == "parquet":
+            sql_types = [query.selected_columns[c].type for c in columns]
+            yield from iter_parquet_chunks(columns, sql_types, rows)
+        else:
+            for chunk in iter_csv_chunks(columns, rows, rows_per_chunk=CSV_ROWS_PER_CHUNK):
+                yield chunk.encode("utf-8")
@@ -0,0 +1,561 @@
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from ..models import Category, CollectionRun, Hashtag, Video, VideoHashtag
+from ..utils.classify import classify_tag, classify_term, classify_title
+from ..utils.log import get_logger
+from ..utils.similarity import SimilarityIndex
+from ..utils.text import title_bigrams
+
+# 분석용 인메모리 저장소 사용 여부 (false이면 매 요청마다 DB에서 새로 적재하고 캐시하지 않음)
+HOT_STORE_ENABLED = os.getenv("HOT_STORE_ENABLED", "true").lower() == "true"
+# 메모리에 유지할 게시 시각 구간 (일) - 분석 기간(7/30일)과 데이터 부족 시 대체 구간을 포함
+HOT_STORE_WINDOW_DAYS = int(os.getenv("HOT_STORE_WINDOW_DAYS", "90"))
+# 카테고리당 메모리 상한 (MB, 초과하면 오래된 영상부터 제외)
+HOT_STORE_BUDGET_MB = float(os.getenv("HOT_STORE_CATEGORY_BUDGET_MB", "64"))
+# 수집 세대(collection_runs) 변경 확인 주기 (초)
+HOT_STORE_CHECK_SECONDS = float(os.getenv("HOT_STORE_CHECK_SECONDS", "30"))
+# 증분 갱신과 별개로 전체를 다시 적재하는 주기 (분, 스냅샷 적재 등 수집 외 변경 반영)
+HOT_STORE_FULL_REFRESH_MINUTES = int(os.getenv("HOT_STORE_FULL_REFRESH_MINUTES", "60"))
+# 증분 갱신 시 변경 시각 비교 여유 (DB now()와 애플리케이션 utcnow() 차이 흡수)
+REFRESH_OVERLAP = timedelta(minutes=10)
+# 분석 기간 내 영상이 이보다 적으면 저장소 전체 구간 사용
+MIN_WINDOW_ROWS = 10
+
+log = get_logger("hot_store")
+
+
+class _Vocabulary:
+    """문자열 -> 정수 코드 사전 (추가만 가능하므로 한 번 발급한 코드는 바뀌지 않음)
+
+    카테고리 항목마다 따로 두고 전체 재적재 때 새로 만들므로, 증분 갱신 사이에만 커진다.
+
+    flags: 코드 -> 분류 비트 플래그 (utils/classify.py). classify가 있으면 새 문자열을 추가할 때
+    한 번만 계산하고, 없으면 set_flags로 기록한다 (해시태그는 DB에 저장된 값).
+    """
+
+    def __init__(self, classify: Optional[Callable[[str], int]] = None):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.flags = np.zeros(0, dtype=np.int32)
+        self._classify = classify
+        self._decoded = np.empty(0, dtype=object)
+        self._value_bytes = 0
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        codes = self.codes
+        encoded = []
+        added = len(self.values)
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = len(self.values)
+                codes[value] = code
+                self.values.append(value)
+                self._value_bytes += sys.getsizeof(value)
+            encoded.append(code)
+        if self._classify is not None and len(self.values) > added:
+            self.flags = np.concatenate([
+                self.flags, np.array([self._classify(value) for value in self.values[added:]], dtype=np.int32)
+            ])
+        return np.array(encoded, dtype=np.int32)
+
+    def set_flags(self, codes: np.ndarray, flags: np.ndarray) -> None:
+        """코드별 분류 플래그 기록 (읽는 쪽과 겹치지 않도록 새 배열로 교체)"""
+        updated = np.zeros(len(self.values), dtype=np.int32)
+        updated[:len(self.flags)] = self.flags
+        updated[codes] = flags
+        self.flags = updated
+
+    def subset(self, codes: np.ndarray) -> "_Vocabulary":
+        """지정한 코드만 남긴 새 사전 (새 코드는 codes 순서의 위치)"""
+        vocabulary = _Vocabulary(self._classify)
+        vocabulary.values = [self.values[code] for code in codes.tolist()]
+        vocabulary.codes = {value: code for code, value in enumerate(vocabulary.values)}
+        if len(self.flags):
+            flags = np.zeros(len(self.values), dtype=np.int32)
+            flags[:len(self.flags)] = self.flags
+            vocabulary.flags = flags[codes]
+        vocabulary._value_bytes = sum(sys.getsizeof(value) for value in vocabulary.values)
+        return vocabulary
+
+    @property
+    def nbytes(self) -> int:
+        """대략적인 메모리 사용량 (문자열, dict/list 자체, 플래그/디코딩 배열)"""
+        return (
+            self._value_bytes + sys.getsizeof(self.codes) + sys.getsizeof(self.values)
+            + self.flags.nbytes + self._decoded.nbytes
+        )
+
+    def decoded(self) -> np.ndarray:
+        """코드 -> 문자열 배열 (사전이 커졌을 때만 다시 만듦)"""
+        if len(self._decoded) != len(self.values):
+            self._decoded = np.array(self.values, dtype=object)
+        return self._decoded
+
+
+def _csr_gather(indptr: np.ndarray, codes: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR에서 지정한 행들의 (행 번호, 코드) 쌍 추출"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    owners = np.repeat(rows, lengths)
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owners, codes[np.repeat(starts, lengths) + offsets]
+
+
+def _csr_from_pairs(n_rows: int, owners: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(행 번호, 코드) 쌍으로 CSR(indptr, codes) 구성"""
+    order = np.argsort(owners, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(owners, minlength=n_rows))
+    return indptr, codes[order].astype(np.int32)
+
+
+class CategoryColumns:
+    """카테고리 하나의 영상 데이터 (열 지향, 행 순서는 의미 없음)
+
+    - 영상 컬럼: ids, published_at, view_count, like_count, comment_count, changed_at, titles,
+      title_flags (제목 분류 비트 플래그)
+    - channel_codes: 채널 ID 사전 코드
+    - vocabularies: 이 카테고리의 사전 (tags/tokens/grams/channels, 전체 적재 때 새로 만들고 증분 갱신 때 추가)
+    - tag_indptr/tag_codes: 영상별 해시태그 (CSR, 행 i = tag_codes[tag_indptr[i]:tag_indptr[i + 1]])
+    - token_indptr/token_codes: 제목을 공백으로 나눈 토큰 (CSR)
+    - gram_indptr/gram_codes: 소문자 제목의 글자 2-gram (CSR, 영상별 중복 제거, 키워드 검색용)
+    - cooccurrence: 해시태그 동시 출현 인덱스 (처음 사용할 때 구성, 이후 증분 갱신 시 함께 갱신)
+    - title_index: 2-gram -> 행 번호 역색인 (처음 검색할 때 구성)
+    - similarity: 해시태그/제목 키워드 TF-IDF 행렬 (저장소가 적재할 때 구성, 이후 증분 갱신 시 함께 갱신)
+    """
+
+    ROW_COLUMNS = (
+        "ids", "published_at", "view_count", "like_count", "comment_count",
+        "changed_at", "channel_codes", "titles", "title_bytes", "title_flags",
+    )
+    CSR_PREFIXES = ("tag", "token", "gram")
+    # 사전 이름 -> 그 사전의 코드를 담은 컬럼
+    VOCABULARY_COLUMNS = {
+        "tags": "tag_codes", "tokens": "token_codes", "grams": "gram_codes", "channels": "channel_codes",
+    }
+
+    def __init__(self, category_id: int, vocabularies: Dict[str, _Vocabulary], **arrays):
+        self.category_id = category_id
+        self.vocabularies = vocabularies
+        for name in self.ROW_COLUMNS:
+            setattr(self, name, arrays[name])
+        for prefix in self.CSR_PREFIXES:
+            setattr(self, f"{prefix}_indptr", arrays[f"{prefix}_indptr"])
+            setattr(self, f"{prefix}_codes", arrays[f"{prefix}_codes"])
+        self.generation: Optional[int] = None
+        self.loaded_at = time.monotonic()
+        self.cooccurrence = None
+        self.title_index = None
+        self.similarity = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """대략적인 메모리 사용량 (제목 문자열과 사전 포함)"""
+        arrays = [getattr(self, name) for name in self.ROW_COLUMNS if name != "titles"]
+        for prefix in self.CSR_PREFIXES:
+            arrays += [getattr(self, f"{prefix}_indptr"), getattr(self, f"{prefix}_codes")]
+        return (
+            sum(a.nbytes for a in arrays) + int(self.title_bytes.sum()) + self.titles.nbytes
+            + sum(vocabulary.nbytes for vocabulary in self.vocabularies.values())
+        )
+
+    @property
+    def high_water(self) -> Optional[datetime]:
+        """적재된 영상 중 가장 최근 변경 시각 (증분 갱신 기준)"""
+        if len(self) == 0:
+            return None
+        return self.changed_at.max().astype("datetime64[us]").item()
+
+    def all_rows(self) -> np.ndarray:
+        return np.arange(len(self))
+
+    def rows_since(self, cutoff: datetime) -> np.ndarray:
+        """게시 시각이 cutoff 이후인 행 번호"""
+        return np.flatnonzero(self.published_at >= np.datetime64(cutoff, "us"))
+
+    def window_rows(self, cutoff: datetime, min_rows: int = MIN_WINDOW_ROWS) -> np.ndarray:
+        """분석 대상 행 (기간 내 영상이 min_rows 미만이면 전체)"""
+        rows = self.rows_since(cutoff)
+        return rows if len(rows) >= min_rows else self.all_rows()
+
+    def tag_pairs(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(행 번호, 해시태그 코드) 쌍"""
+        return _csr_gather(self.tag_indptr, self.tag_codes, rows)
+
+    def token_pairs(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(행 번호, 제목 토큰 코드) 쌍"""
+        return _csr_gather(self.token_indptr, self.token_codes, rows)
+
+    def tag_values(self) -> np.ndarray:
+        return self.vocabularies["tags"].decoded()
+
+    def tag_flags(self) -> np.ndarray:
+        """해시태그 코드 -> 분류 플래그"""
+        return self.vocabularies["tags"].flags
+
+    def token_flags(self) -> np.ndarray:
+        """제목 토큰 코드 -> 분류 플래그"""
+        return self.vocabularies["tokens"].flags
+
+    def token_values(self) -> np.ndarray:
+        return self.vocabularies["tokens"].decoded()
+
+    def channel_values(self) -> np.ndarray:
+        return self.vocabularies["channels"].decoded()
+
+    def subset(self, rows: np.ndarray) -> "CategoryColumns":
+        """지정한 행만 남긴 새 객체"""
+        rows = np.asarray(rows, dtype=np.int64)
+        arrays = {name: getattr(self, name)[rows] for name in self.ROW_COLUMNS}
+        for prefix in self.CSR_PREFIXES:
+            indptr = getattr(self, f"{prefix}_indptr")
+            lengths = indptr[rows + 1] - indptr[rows]
+            _, codes = _csr_gather(indptr, getattr(self, f"{prefix}_codes"), rows)
+            arrays[f"{prefix}_indptr"] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            arrays[f"{prefix}_codes"] = codes
+        return CategoryColumns(self.category_id, self.vocabularies, **arrays)
+
+    def concat(self, other: "CategoryColumns") -> "CategoryColumns":
+        """두 객체의 행을 이어 붙인 새 객체"""
+        arrays = {
+            name: np.concatenate([getattr(self, name), getattr(other, name)])
+            for name in self.ROW_COLUMNS
+        }
+        for prefix in self.CSR_PREFIXES:
+            indptr = getattr(self, f"{prefix}_indptr")
+            arrays[f"{prefix}_indptr"] = np.concatenate(
+                [indptr, getattr(other, f"{prefix}_indptr")[1:] + indptr[-1]]
+            )
+            arrays[f"{prefix}_codes"] = np.concatenate(
+                [getattr(self, f"{prefix}_codes"), getattr(other, f"{prefix}_codes")]
+            )
+        return CategoryColumns(self.category_id, self.vocabularies, **arrays)
+
+    def compacted(self) -> "CategoryColumns":
+        """사용 중인 코드만 남긴 새 사전으로 다시 부호화한 객체 (메모리 상한으로 행을 줄인 뒤 사용)"""
+        arrays = {name: getattr(self, name) for name in self.ROW_COLUMNS}
+        for prefix in self.CSR_PREFIXES:
+            arrays[f"{prefix}_indptr"] = getattr(self, f"{prefix}_indptr")
+        vocabularies = {}
+        for name, column in self.VOCABULARY_COLUMNS.items():
+            used, codes = np.unique(getattr(self, column), return_inverse=True)
+            vocabularies[name] = self.vocabularies[name].subset(used)
+            arrays[column] = codes.astype(np.int32)
+        return CategoryColumns(self.category_id, vocabularies, **arrays)
+
+
+def _new_vocabularies() -> Dict[str, _Vocabulary]:
+    """카테고리 항목 하나의 빈 사전들 (제목 토큰은 추가할 때 분류)"""
+    vocabularies = {name: _Vocabulary() for name in ("tags", "grams", "channels")}
+    vocabularies["tokens"] = _Vocabulary(classify_term)
+    return vocabularies
+
+
+class HotStore:
+    """분석 API용 카테고리별 인메모리 열 지향 저장소
+
+    카테고리를 처음 조회할 때 최근 HOT_STORE_WINDOW_DAYS일 영상을 적재하고,
+    이후에는 수집 세대(성공한 collection_runs의 최대 ID)가 바뀌었을 때
+    마지막 적재 이후 변경된 영상(collected_at/updated_at 기준)만 다시 읽어 병합한다.
+    적재/갱신은 카테고리별 잠금 안에서 하고 결과 항목만 전역 잠금 안에서 바꿔 넣으므로,
+    한 카테고리를 적재하는 동안에도 다른 카테고리 조회와 이미 적재된 항목 조회는 기다리지 않는다.
+    """
+
+    def __init__(
+        self,
+        window_days: int = HOT_STORE_WINDOW_DAYS,
+        budget_bytes: int = int(HOT_STORE_BUDGET_MB * 1024 * 1024),
+        enabled: bool = HOT_STORE_ENABLED,
+    ):
+        self.window_days = window_days
+        self.budget_bytes = budget_bytes
+        self.enabled = enabled
+        self._entries: Dict[int, CategoryColumns] = {}
+        self._category_ids: Dict[str, int] = {}
+        # _lock: 항목/카운터 사전 접근만 (짧게), 카테고리 잠금: 같은 카테고리의 적재/갱신을 한 번만 수행
+        self._lock = threading.RLock()
+        self._category_locks: Dict[int, threading.Lock] = {}
+        # invalidate 횟수 (적재 중 무효화되면 결과를 저장하지 않음)
+        self._invalidations = 0
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        # 모니터링용 카운터
+        self.hits = 0
+        self.loads = 0
+        self.refreshes = 0
+
+    def get(self, db: Session, category_name: str) -> Optional[CategoryColumns]:
+        """카테고리 데이터 조회 (카테고리가 없으면 None)"""
+        category_id = self._category_id(db, category_name)
+        if category_id is None:
+            return None
+
+        if not self.enabled:
+            with self._lock:
+                self.loads += 1
+            return self._load(db, category_id)
+
+        generation = self._current_generation(db)
+        with self._lock:
+            entry = self._entries.get(category_id)
+            if self._is_current(entry, generation):
+                self.hits += 1
+                return entry
+            category_lock = self._category_locks.setdefault(category_id, threading.Lock())
+
+        # 적재/갱신(DB 조회, 인덱스 구성)은 카테고리 잠금만 잡고 수행 (다른 카테고리 조회와 적중은 기다리지 않음)
+        with category_lock:
+            with self._lock:
+                # 기다리는 동안 다른 요청이 이미 적재/갱신했으면 그 결과 사용
+                entry = self._entries.get(category_id)
+                if self._is_current(entry, generation):
+                    self.hits += 1
+                    return entry
+                invalidations = self._invalidations
+
+            full_load = entry is None or self._full_refresh_due(entry)
+            entry = self._load(db, category_id) if full_load else self._refresh(db, entry)
+            entry.generation = generation
+
+            with self._lock:
+                if full_load:
+                    self.loads += 1
+                else:
+                    self.refreshes += 1
+                if invalidations == self._invalidations:
+                    self._entries[category_id] = entry
+            return entry
+
+    @staticmethod
+    def _full_refresh_due(entry: CategoryColumns) -> bool:
+        return time.monotonic() - entry.loaded_at > HOT_STORE_FULL_REFRESH_MINUTES * 60
+
+    def _is_current(self, entry: Optional[CategoryColumns], generation: Optional[int]) -> bool:
+        """그대로 돌려줄 수 있는 항목인지 (수집 세대가 같고 전체 재적재 주기 전)"""
+        return entry is not None and entry.generation == generation and not self._full_refresh_due(entry)
+
+    def invalidate(self, category_id: Optional[int] = None) -> None:
+        """캐시 비우기 (category_id가 없으면 전체)"""
+        with self._lock:
+            if category_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category_id, None)
+            self._invalidations += 1
+            self._generation_checked_at = 0.0
+
+    def stats(self) -> Dict:
+        """카테고리별 행 수/메모리 사용량과 캐시 카운터"""
+        with self._lock:
+            return {
+                "categories": {
+                    category_id: {
+                        "rows": len(entry),
+                        "bytes": entry.nbytes,
+                        "generation": entry.generation,
+                        "cooccurrence_pairs": entry.cooccurrence.nnz if entry.cooccurrence is not None else None,
+                    }
+                    for category_id, entry in self._entries.items()
+                },
+                "hits": self.hits,
+                "loads": self.loads,
+                "refreshes": self.refreshes,
+            }
+
+    def _category_id(self, db: Session, category_name: str) -> Optional[int]:
+        category_id = self._category_ids.get(category_name)
+        if category_id is None:
+            category_id = db.query(Category.id).filter(Category.name == category_name).scalar()
+            if category_id is not None:
+                self._category_ids[category_name] = category_id
+        return category_id
+
+    def _current_generation(self, db: Session) -> Optional[int]:
+        """성공한 수집 실행의 최대 ID (HOT_STORE_CHECK_SECONDS마다 한 번만 조회, 동시에 조회해도 결과만 덮어씀)"""
+        now = time.monotonic()
+        if now - self._generation_checked_at >= HOT_STORE_CHECK_SECONDS:
+            self._generation = (
+                db.query(func.max(CollectionRun.id))
+                .filter(CollectionRun.status == "succeeded")
+                .scalar()
+            )
+            self._generation_checked_at = now
+        return self._generation
+
+    def _cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(days=self.window_days)
+
+    def _load(self, db: Session, category_id: int) -> CategoryColumns:
+        """카테고리 구간 전체 적재 (사전도 새로 만들어 구간을 벗어난 문자열을 버림)"""
+        cutoff = self._cutoff()
+        fetched = self._fetch(
+            db,
+            category_id,
+            and_(Video.category_id == category_id, Video.published_at >= cutoff),
+            _new_vocabularies(),
+        )
+        entry = self._enforce_budget(fetched)
+        if entry is not fetched:
+            # 메모리 상한으로 제외한 영상에만 쓰인 문자열도 사전에서 제외
+            entry = entry.compacted()
+        # 유사 영상 인덱스는 요청 때가 아니라 적재/갱신 때 구성 (저장소 비활성 시에는 조회 때 구성)
+        if self.enabled:
+            entry.similarity = SimilarityIndex.build(entry)
+        return entry
+
+    def _refresh(self, db: Session, entry: CategoryColumns) -> CategoryColumns:
+        """마지막 적재 이후 변경된 영상만 다시 읽어 병합 (구간을 벗어난 영상은 제거)"""
+        cutoff = self._cutoff()
+        high_water = entry.high_water
+        if high_water is None:
+            return self._load(db, entry.category_id)
+
+        since = high_water - REFRESH_OVERLAP
+        changed = self._fetch(
+            db,
+            entry.category_id,
+            and_(
+                Video.category_id == entry.category_id,
+                Video.published_at >= cutoff,
+                or_(Video.collected_at > since, Video.updated_at > since),
+            ),
+            entry.vocabularies,
+        )
+        keep = (entry.published_at >= np.datetime64(cutoff, "us")) & ~np.isin(entry.ids, changed.ids)
+        merged = self._enforce_budget(entry.subset(np.flatnonzero(keep)).concat(changed))
+        # 전체 재적재 주기는 마지막 전체 적재 시각 기준
+        merged.loaded_at = entry.loaded_at
+        if entry.cooccurrence is not None:
+            merged.cooccurrence = entry.cooccurrence.updated(merged, changed.ids)
+        if entry.similarity is not None:
+            merged.similarity = entry.similarity.updated(merged, changed.ids)
+        return merged
+
+    def _enforce_budget(self, entry: CategoryColumns) -> CategoryColumns:
+        """메모리 상한을 넘으면 최근 게시 영상부터 상한 안에 들어가는 만큼만 유지
+
+        사전은 행을 줄여도 그대로 남으므로 (전체 적재 때만 정리) 상한에서 먼저 빼고 행 몫을 계산한다.
+        """
+        nbytes = entry.nbytes
+        if nbytes <= self.budget_bytes or len(entry) == 0:
+            return entry
+        vocabulary_bytes = sum(vocabulary.nbytes for vocabulary in entry.vocabularies.values())
+        keep_count = int(
+            len(entry) * max(self.budget_bytes - vocabulary_bytes, 0) / max(nbytes - vocabulary_bytes, 1)
+        )
+        newest = np.argsort(entry.published_at, kind="stable")[::-1][:keep_count]
+        # 증분 적재마다 반복되므로 카테고리별로 표본만 기록
+        log.sampled(
+            f"hot_store.budget.{entry.category_id}", 20, "메모리 상한 초과, 최근 영상만 유지",
+            level=logging.WARNING, category_id=entry.category_id,
+            mb=round(nbytes / 1024 / 1024, 1), kept=keep_count, rows=len(entry),
+        )
+        return entry.subset(np.sort(newest))
+
+    def _fetch(
+        self, db: Session, category_id: int, condition, vocabularies: Dict[str, _Vocabulary]
+    ) -> CategoryColumns:
+        """조건에 맞는 영상과 해시태그를 읽어 CategoryColumns 구성 (문자열은 vocabularies에 추가해 부호화)"""
+        rows = (
+            db.query(
+                Video.id,
+                Video.published_at,
+                Video.view_count,
+                Video.like_count,
+                Video.comment_count,
+                Video.collected_at,
+                Video.updated_at,
+                Video.channel_id,
+                Video.title,
+                Video.title_flags,
+            )
+            .filter(condition)
+            .all()
+        )
+        n_rows = len(rows)
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        titles = np.array([r[8] or "" for r in rows], dtype=object)
+        changed_at = [
+            max(r[5], r[6]) if r[5] and r[6] else (r[6] or r[5] or r[1])
+            for r in rows
+        ]
+
+        # 해시태그 (같은 조건으로 한 번에 조회, 두 쿼리 사이에 추가된 영상의 태그는 건너뜀)
+        position = {video_id: i for i, video_id in enumerate(ids.tolist())}
+        tag_owners: List[int] = []
+        tag_names: List[str] = []
+        tag_flags: Dict[str, int] = {}
+        for video_id, tag, flags in (
+            db.query(VideoHashtag.video_id, Hashtag.tag, Hashtag.flags)
+            .join(Hashtag, Hashtag.id == VideoHashtag.hashtag_id)
+            .join(Video, Video.id == VideoHashtag.video_id)
+            .filter(condition)
+            .all()
+        ):
+            owner = position.get(video_id)
+            if owner is not None:
+                tag_owners.append(owner)
+                tag_names.append(tag)
+                tag_flags[tag] = flags
+        tag_indptr, tag_codes = _csr_from_pairs(
+            n_rows,
+            np.array(tag_owners, dtype=np.int64),
+            vocabularies["tags"].encode(tag_names),
+        )
+        # 분류 플래그는 수집 시 저장한 값 (아직 분류되지 않은 행은 여기서 계산)
+        vocabularies["tags"].set_flags(
+            vocabularies["tags"].encode(tag_flags),
+            np.array([classify_tag(tag) if flags is None else flags for tag, flags in tag_flags.items()], dtype=np.int32),
+        )
+
+        # 제목 토큰 (공백 기준 분리, 정제는 분석 함수가 사전 단위로 수행)
+        token_lists = [title.split() for title in titles]
+        token_lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+        token_indptr = np.concatenate([[0], np.cumsum(token_lengths)]).astype(np.int64)
+        token_codes = vocabularies["tokens"].encode(
+            token for tokens in token_lists for token in tokens
+        )
+
+        # 제목 2-gram (키워드 부분 일치 검색용 역색인 재료)
+        gram_lists = [title_bigrams(title) for title in titles]
+        gram_indptr = np.concatenate([[0], np.cumsum([len(grams) for grams in gram_lists])]).astype(np.int64)
+        gram_codes = vocabularies["grams"].encode(gram for grams in gram_lists for gram in grams)
+
+        return CategoryColumns(
+            category_id,
+            vocabularies,
+            ids=ids,
+            published_at=np.array([r[1] for r in rows], dtype="datetime64[us]"),
+            view_count=np.array([r[2] or 0 for r in rows], dtype=np.int64),
+            like_count=np.array([r[3] or 0 for r in rows], dtype=np.int64),
+            comment_count=np.array([r[4] or 0 for r in rows], dtype=np.int64),
+            changed_at=np.array(changed_at, dtype="datetime64[us]"),
+            channel_codes=vocabularies["channels"].encode(r[7] for r in rows),
+            titles=titles,
+            title_bytes=np.array([sys.getsizeof(t) for t in titles], dtype=np.int32),
+            title_flags=np.array(
+                [classify_title(r[8]) if r[9] is None else r[9] for r in rows], dtype=np.int32
+            ),
+            tag_indptr=tag_indptr,
+            tag_codes=tag_codes,
+            token_indptr=token_indptr,
+            token_codes=token_codes,
+            gram_indptr=gram_indptr,
+            gram_codes=gram_codes,
+        )
+
+
+hot_store = HotStore()
@@ -0,0 +1,210 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update, or_, and_
+from ..database import SessionLocal
+from ..models import CollectionJob
+from ..utils.log import get_logger, log_context
+
+# 수집 작업을 동시에 실행할 워커 수
+JOB_WORKERS = int(os.getenv("COLLECTION_JOB_WORKERS", "2"))
+# 대기 중 작업 최대 개수 (초과 시 새 요청 거절)
+MAX_PENDING_JOBS = int(os.getenv("COLLECTION_JOB_MAX_PENDING", "100"))
+# 이 시간 동안 진행 상황 갱신이 없는 running 작업은 중단된 것으로 보고 재실행
+JOB_STALE_MINUTES = int(os.getenv("COLLECTION_JOB_STALE_MINUTES", "10"))
+# 등록 충돌 후 기존 작업이 그 사이 끝났을 때 다시 등록을 시도하는 횟수
+ENQUEUE_ATTEMPTS = 3
+
+log = get_logger("job_queue")
+
+
+class QueueFullError(Exception):
+    """대기 중 작업이 최대 개수에 도달함"""
+
+
+def _dedupe_key(category: str, time_range_days: int, max_results: int) -> str:
+    return f"{category}:{time_range_days}:{max_results}"
+
+
+class CollectionJobQueue:
+    """POST /collect 요청을 처리하는 비동기 작업 큐
+
+    작업 상태는 collection_jobs 테이블에 저장되어 재시작 후에도 유지된다.
+    같은 조건의 대기/실행 중 작업이 있으면 새로 만들지 않고 기존 작업을 돌려준다
+    (active_key 고유 인덱스로 DB에서 보장하므로 여러 API 프로세스가 동시에 등록해도 하나만 생김).
+    여러 워커가 같은 작업을 집어도 조건부 UPDATE로 한 워커만 실행한다.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_pending: int = MAX_PENDING_JOBS):
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect-job")
+
+    def enqueue(
+        self, db: Session, category: str, time_range_days: int, max_results: int
+    ) -> Tuple[CollectionJob, bool]:
+        """작업 등록
+
+        Returns:
+            (작업, 새로 생성 여부) - 중복 작업이면 기존 작업과 False
+        """
+        dedupe_key = _dedupe_key(category, time_range_days, max_results)
+        for _ in range(ENQUEUE_ATTEMPTS):
+            existing = db.query(CollectionJob).filter(CollectionJob.active_key == dedupe_key).first()
+            if existing and not self._abandon_if_stale(db, existing):
+                return existing, False
+
+            pending_count = (
+                db.query(CollectionJob).filter(CollectionJob.status == "pending").count()
+            )
+            if pending_count >= self.max_pending:
+                raise QueueFullError(f"대기 중인 수집 작업이 {pending_count}개로 최대치에 도달했습니다.")
+
+            # 다른 프로세스가 같은 조건의 작업을 먼저 등록했으면 건너뛰고 그 작업을 다시 조회
+            job_id = str(uuid.uuid4())
+            inserted = db.execute(
+                insert(CollectionJob.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                {
+                    "id": job_id,
+                    "category": category,
+                    "time_range_days": time_range_days,
+                    "max_results": max_results,
+                    "dedupe_key": dedupe_key,
+                    "active_key": dedupe_key,
+                    "status": "pending",
+                },
+            ).rowcount
+            db.commit()
+            if inserted:
+                job = db.get(CollectionJob, job_id)
+                self.executor.submit(self._execute, job.id)
+                return job, True
+        raise RuntimeError(f"수집 작업을 등록하지 못했습니다: {dedupe_key}")
+
+    def recover(self) -> int:
+        """재시작 시 미완료 작업 재등록 (대기 작업 + 갱신이 멈춘 실행 중 작업)"""
+        db: Session = SessionLocal()
+        try:
+            stale_before = datetime.utcnow() - timedelta(minutes=JOB_STALE_MINUTES)
+            db.execute(
+                update(CollectionJob)
+                .where(
+                    and_(
+                        CollectionJob.status == "running",
+                        or_(CollectionJob.updated_at.is_(None), CollectionJob.updated_at < stale_before),
+                    )
+                )
+                .values(status="pending")
+            )
+            db.commit()
+            job_ids = [
+                job_id
+                for (job_id,) in db.query(CollectionJob.id)
+                .filter(CollectionJob.status == "pending")
+                .order_by(CollectionJob.created_at)
+                .all()
+            ]
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            self.executor.submit(self._execute, job_id)
+        if job_ids:
+            log.info("미완료 수집 작업을 다시 등록했습니다", jobs=len(job_ids))
+        return len(job_ids)
+
+    @staticmethod
+    def _abandon_if_stale(db: Session, job: CollectionJob) -> bool:
+        """진행 상황 갱신이 JOB_STALE_MINUTES 넘게 멈춘 실행 중 작업을 실패로 정리 (실행하던 워커가 죽은 경우)
+
+        recover()는 시작할 때 한 번만 돌기 때문에, 재시작이 갱신 후 JOB_STALE_MINUTES 안에 일어나면
+        작업이 running으로 남아 같은 조건의 등록을 계속 막는다. 등록 시점에 확인해 active_key를 풀어 준다.
+
+        Returns:
+            정리했으면 True (새 작업을 등록해도 됨)
+        """
+        stale_before = datetime.utcnow() - timedelta(minutes=JOB_STALE_MINUTES)
+        if job.status != "running" or (job.updated_at is not None and job.updated_at >= stale_before):
+            return False
+        abandoned = db.execute(
+            update(CollectionJob)
+            .where(
+                and_(
+                    CollectionJob.id == job.id,
+                    CollectionJob.status == "running",
+                    or_(CollectionJob.updated_at.is_(None), CollectionJob.updated_at < stale_before),
+                )
+            )
+            .values(
+                status="failed", active_key=None, finished_at=datetime.utcnow(),
+                error=f"{JOB_STALE_MINUTES}분 넘게 진행 상황 갱신이 없어 중단된 것으로 처리",
+            )
+        ).rowcount
+        db.commit()
+        if abandoned:
+            log.warning("갱신이 멈춘 수집 작업을 실패로 처리했습니다", job_id=job.id, category=job.category)
+        return True
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        """pending -> running 조건부 전환 (다른 워커가 먼저 집었으면 False)"""
+        claimed = db.execute(
+            update(CollectionJob)
+            .where(and_(CollectionJob.id == job_id, CollectionJob.status == "pending"))
+            .values(status="running", started_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+        return claimed == 1
+
+    @staticmethod
+    def _update_job(job_id: str, **values) -> None:
+        """작업 상태/진행 상황 갱신 (수집 트랜잭션과 분리된 세션 사용)"""
+        db: Session = SessionLocal()
+        try:
+            db.execute(update(CollectionJob).where(CollectionJob.id == job_id).values(**values))
+            db.commit()
+        finally:
+            db.close()
+
+    def _execute(self, job_id: str) -> None:
+        from .data_collector import DataCollector
+
+        db: Session = SessionLocal()
+        # 작업 하나의 로그(수집 실행 id 포함)를 작업 id로 묶음
+        with log_context(job_id=job_id):
+            try:
+                if not self._claim(db, job_id):
+                    return
+                job = db.get(CollectionJob, job_id)
+                log.info("수집 작업 시작", category=job.category)
+
+                collector = DataCollector(db)
+                videos_collected = collector.collect_videos(
+                    category_name=job.category,
+                    time_range_days=job.time_range_days,
+                    max_results=job.max_results,
+                    progress_callback=lambda **progress: self._update_job(job_id, **progress),
+                )
+                self._update_job(
+                    job_id,
+                    status="succeeded",
+                    active_key=None,
+                    videos_collected=videos_collected,
+                    finished_at=datetime.utcnow(),
+                )
+                log.info("수집 작업 완료", category=job.category, videos=videos_collected)
+            except Exception as e:
+                db.rollback()
+                log.error("수집 작업 실패", error=str(e))
+                self._update_job(
+                    job_id, status="failed", active_key=None, error=str(e)[:2000], finished_at=datetime.utcnow()
+                )
+            finally:
+                db.close()
+
+
+job_queue = CollectionJobQueue()
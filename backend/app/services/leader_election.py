@@ -0,0 +1,177 @@
+import os
+import threading
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine, Connection
+from ..utils.log import get_logger
+
+# 리더 락 이름 (같은 DB를 쓰는 모든 프로세스가 공유)
+LEADER_LOCK_NAME = os.getenv("SCHEDULER_LOCK_NAME", "consultube_scheduler_leader")
+# 리더 확인(heartbeat) 및 비리더의 락 재시도 주기 (초)
+HEARTBEAT_SECONDS = int(os.getenv("SCHEDULER_HEARTBEAT_SECONDS", "15"))
+# 시작 시 스키마 업그레이드 락 이름 (여러 워커가 동시에 DDL을 실행하지 않도록)
+MIGRATION_LOCK_NAME = os.getenv("DB_MIGRATION_LOCK_NAME", "consultube_schema_migration")
+
+log = get_logger("leader")
+
+
+class _MySQLLockBackend:
+    """MySQL GET_LOCK 기반 리스 (세션 락이므로 연결이 끊기면 서버가 자동 해제)"""
+
+    def __init__(self, engine: Engine, lock_name: str):
+        self.engine = engine
+        self.lock_name = lock_name
+        self.conn: Optional[Connection] = None
+
+    def try_acquire(self) -> bool:
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, 0)"), {"name": self.lock_name}
+            ).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if acquired == 1:
+            self.conn = conn
+            return True
+        conn.close()
+        return False
+
+    def heartbeat(self) -> bool:
+        """락을 잡은 연결이 살아 있고 여전히 락 소유자인지 확인"""
+        if self.conn is None:
+            return False
+        owner, connection_id = self.conn.execute(
+            text("SELECT IS_USED_LOCK(:name), CONNECTION_ID()"), {"name": self.lock_name}
+        ).one()
+        return owner is not None and owner == connection_id
+
+    def release(self) -> None:
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.lock_name})
+        except Exception:
+            pass
+        finally:
+            self.conn.close()
+            self.conn = None
+
+
+class _FileLockBackend:
+    """파일 락 기반 리스 (MySQL 이외 DB 사용 시 같은 호스트의 워커 간 리더 선출)"""
+
+    def __init__(self, lock_name: str):
+        self.path = os.path.join(tempfile.gettempdir(), f"{lock_name}.lock")
+        self.handle = None
+
+    def try_acquire(self) -> bool:
+        import fcntl
+
+        handle = open(self.path, "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self.handle = handle
+        return True
+
+    def heartbeat(self) -> bool:
+        return self.handle is not None and not self.handle.closed
+
+    def release(self) -> None:
+        if self.handle is None:
+            return
+        import fcntl
+
+        try:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.handle.close()
+            self.handle = None
+
+
+def _lock_backend(engine: Engine, lock_name: str):
+    """MySQL이면 GET_LOCK, 그 외 DB면 같은 호스트 파일 락"""
+    if engine.dialect.name == "mysql":
+        return _MySQLLockBackend(engine, lock_name)
+    return _FileLockBackend(lock_name)
+
+
+@contextmanager
+def exclusive_lock(engine: Engine, lock_name: str, poll_seconds: float = 1.0) -> Iterator[None]:
+    """같은 DB를 쓰는 프로세스 중 하나만 실행하는 구간 (락을 잡을 때까지 poll_seconds마다 재시도)"""
+    backend = _lock_backend(engine, lock_name)
+    while not backend.try_acquire():
+        time.sleep(poll_seconds)
+    try:
+        yield
+    finally:
+        backend.release()
+
+
+class LeaderElector:
+    """스케줄러 리더 선출
+
+    여러 워커/파드 중 락을 잡은 프로세스 하나만 on_elected를 실행한다.
+    리더는 HEARTBEAT_SECONDS마다 락 소유를 확인하고, 잃으면 on_revoked를 호출한다.
+    비리더는 같은 주기로 락 획득을 재시도하므로 리더가 죽으면 다른 프로세스가 이어받는다.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        on_elected: Callable[[], None],
+        on_revoked: Callable[[], None],
+        lock_name: str = LEADER_LOCK_NAME,
+        heartbeat_seconds: int = HEARTBEAT_SECONDS,
+    ):
+        self.backend = _lock_backend(engine, lock_name)
+        self.on_elected = on_elected
+        self.on_revoked = on_revoked
+        self.heartbeat_seconds = heartbeat_seconds
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 선출 루프 시작"""
+        self._thread = threading.Thread(target=self._run, name="leader-elector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """선출 루프 종료 및 락 반환"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.heartbeat_seconds)
+        self._step_down()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.is_leader:
+                    if not self.backend.heartbeat():
+                        log.warning("리더 락을 잃었습니다. 스케줄러를 중지합니다")
+                        self._step_down()
+                elif self.backend.try_acquire():
+                    self.is_leader = True
+                    log.info("리더로 선출되었습니다", pid=os.getpid())
+                    self.on_elected()
+            except Exception as e:
+                log.exception("리더 선출 오류", error=str(e))
+                self._step_down()
+            self._stop.wait(self.heartbeat_seconds)
+
+    def _step_down(self) -> None:
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                self.on_revoked()
+            except Exception as e:
+                log.exception("스케줄러 중지 중 오류 발생", error=str(e))
+        self.backend.release()
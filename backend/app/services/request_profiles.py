@@ -0,0 +1,83 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from ..models import RequestProfile
+from ..utils.log import get_logger
+
+# 보관할 최대 프로파일 수 (초과분은 오래된 것부터 삭제)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+
+log = get_logger("profiles")
+
+# 프로파일 저장은 응답 경로 밖에서 한 스레드로 처리
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-writer")
+
+
+def save_profile(db: Session, profile: Dict, keep: int = PROFILE_KEEP) -> RequestProfile:
+    """프로파일 저장 및 오래된 프로파일 정리 (커밋 포함)"""
+    row = RequestProfile(
+        created_at=datetime.utcnow(),
+        reason=profile["reason"],
+        method=profile["method"],
+        route=profile["route"][:200],
+        path=profile["path"][:500],
+        query_string=profile.get("query_string") or None,
+        status=profile["status"],
+        duration_ms=profile["duration_ms"],
+        sql_statements=profile.get("sql_statements", 0),
+        sql_ms=profile.get("sql_ms", 0.0),
+        samples=profile.get("samples", 0),
+        spans=json.dumps(profile.get("spans") or [], ensure_ascii=False),
+        memory=json.dumps(profile["memory"], ensure_ascii=False) if profile.get("memory") is not None else None,
+        stacks=gzip.compress(profile.get("stacks", "").encode("utf-8")),
+    )
+    db.add(row)
+    db.flush()
+    db.query(RequestProfile).filter(RequestProfile.id <= row.id - keep).delete(synchronize_session=False)
+    db.commit()
+    return row
+
+
+def save_profile_async(profile: Dict) -> None:
+    """백그라운드 스레드에서 프로파일 저장 (실패해도 요청 처리에 영향 없음)"""
+    def _save():
+        from ..database import SessionLocal
+
+        try:
+            with SessionLocal() as db:
+                save_profile(db, profile)
+        except Exception as e:
+            log.warning("프로파일 저장 실패", route=profile.get("route"), error=str(e))
+
+    _writer.submit(_save)
+
+
+def list_profiles(db: Session, route: Optional[str] = None, limit: int = 50) -> List[RequestProfile]:
+    """최근 프로파일 목록 (최신순)"""
+    query = db.query(RequestProfile)
+    if route:
+        query = query.filter(RequestProfile.route == route)
+    return query.order_by(RequestProfile.id.desc()).limit(limit).all()
+
+
+def profile_detail(row: RequestProfile) -> Dict:
+    """프로파일 상세 (구간 시간, 메모리 할당 위치, 샘플이 많은 스택 상위 20개)"""
+    stacks = decompress_stacks(row)
+    top_stacks = []
+    for line in stacks.splitlines()[:20]:
+        stack, _, count = line.rpartition(" ")
+        top_stacks.append({"stack": stack.split(";"), "samples": int(count)})
+    return {
+        "spans": json.loads(row.spans) if row.spans else [],
+        "memory": json.loads(row.memory) if row.memory else None,
+        "top_stacks": top_stacks,
+    }
+
+
+def decompress_stacks(row: RequestProfile) -> str:
+    """collapsed stack 텍스트 (flamegraph.pl, speedscope 입력 형식)"""
+    return gzip.decompress(row.stacks).decode("utf-8") if row.stacks else ""
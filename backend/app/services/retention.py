@@ -0,0 +1,228 @@
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, insert
+from sqlalchemy.orm import Session
+from ..models import Hashtag, Video, VideoArchive, VideoDetail, VideoHashtag, VideoStatSnapshot
+from ..utils.log import get_logger
+from .hot_store import HOT_STORE_WINDOW_DAYS
+from .snapshot import iter_csv_chunks, iter_parquet_chunks, parquet_available
+
+# 영상 보존 기간 (일, 0이면 끔) - 이 기간보다 오래된 게시 월의 영상은 보관 후 삭제
+# (분석 저장소 구간 HOT_STORE_WINDOW_DAYS보다 짧게 설정해도 구간 길이만큼은 유지)
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "365"))
+# 보관 방식 (table: videos_archive 테이블, file: ARCHIVE_DIR에 월별 파일, delete: 보관 없이 삭제)
+ARCHIVE_MODE = os.getenv("ARCHIVE_MODE", "table")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+# 한 번에 옮기고 지울 영상 수 (table 모드는 배치마다 커밋)
+RETENTION_BATCH_SIZE = 1000
+
+ARCHIVE_MODES = ("table", "file", "delete")
+# 보관 파일/테이블 컬럼 (자동 증가 id 제외)
+ARCHIVE_COLUMNS = [c.name for c in VideoArchive.__table__.columns if c.name != "id"]
+
+log = get_logger("retention")
+
+
+def retention_cutoff(retention_days: int = RETENTION_DAYS, now: Optional[datetime] = None) -> datetime:
+    """보관 대상 경계 (보존 기간이 시작되는 달의 1일, 이전 달까지는 월 단위로 통째로 보관)"""
+    now = now or datetime.utcnow()
+    horizon = now - timedelta(days=max(retention_days, HOT_STORE_WINDOW_DAYS))
+    return datetime(horizon.year, horizon.month, 1)
+
+
+def _next_month(month_start: datetime) -> datetime:
+    if month_start.month == 12:
+        return datetime(month_start.year + 1, 1, 1)
+    return datetime(month_start.year, month_start.month + 1, 1)
+
+
+def _month_condition(month_start: datetime, month_end: datetime):
+    return and_(Video.published_at >= month_start, Video.published_at < month_end)
+
+
+def _archive_rows(db: Session, ids: List[int], archived_at: datetime) -> List[Dict]:
+    """영상 id 목록 -> 보관 행 (설명과 해시태그 목록을 합침)"""
+    descriptions = dict(
+        db.query(VideoDetail.video_id, VideoDetail.description).filter(VideoDetail.video_id.in_(ids)).all()
+    )
+    tags: Dict[int, List[str]] = defaultdict(list)
+    for video_id, tag in (
+        db.query(VideoHashtag.video_id, Hashtag.tag)
+        .join(Hashtag, Hashtag.id == VideoHashtag.hashtag_id)
+        .filter(VideoHashtag.video_id.in_(ids))
+        .order_by(VideoHashtag.id)
+        .all()
+    ):
+        tags[video_id].append(tag)
+
+    return [
+        {
+            "source_id": video.id,
+            "video_id": video.video_id,
+            "title": video.title,
+            "description": descriptions.get(video.id),
+            "tags": json.dumps(tags.get(video.id, []), ensure_ascii=False),
+            "category_id": video.category_id,
+            "published_at": video.published_at,
+            "channel_id": video.channel_id,
+            "channel_title": video.channel_title,
+            "view_count": video.view_count,
+            "like_count": video.like_count,
+            "comment_count": video.comment_count,
+            "collected_at": video.collected_at,
+            "updated_at": video.updated_at,
+            "archived_at": archived_at,
+        }
+        for video in (
+            db.query(
+                Video.id, Video.video_id, Video.title, Video.category_id, Video.published_at,
+                Video.channel_id, Video.channel_title, Video.view_count, Video.like_count,
+                Video.comment_count, Video.collected_at, Video.updated_at,
+            )
+            .filter(Video.id.in_(ids))
+            .order_by(Video.id)
+            .all()
+        )
+    ]
+
+
+def _month_batches(db: Session, month_start: datetime, month_end: datetime) -> Iterator[List[int]]:
+    """게시 월에 속한 영상 id를 id 순으로 RETENTION_BATCH_SIZE개씩 (키셋 페이지네이션)"""
+    last_id = 0
+    while True:
+        ids = [
+            row[0]
+            for row in db.query(Video.id)
+            .filter(_month_condition(month_start, month_end), Video.id > last_id)
+            .order_by(Video.id)
+            .limit(RETENTION_BATCH_SIZE)
+            .all()
+        ]
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids
+
+
+def _delete_videos(db: Session, ids: List[int]) -> None:
+    """영상과 딸린 행 삭제 (SQLite는 외래 키 CASCADE가 기본으로 꺼져 있어 직접 삭제)"""
+    for model in (VideoHashtag, VideoStatSnapshot, VideoDetail):
+        db.execute(delete(model).where(model.video_id.in_(ids)))
+    db.execute(delete(Video).where(Video.id.in_(ids)))
+
+
+def _write_month_file(
+    db: Session, archive_dir: str, month_start: datetime, archived_at: datetime
+) -> Tuple[str, List[int]]:
+    """게시 월 하나를 보관 파일로 쓰기 (pyarrow가 있으면 Parquet, 없으면 gzip CSV)
+
+    다 쓴 뒤에 파일 이름을 바꾸므로 중간에 실패하면 완성된 파일이 남지 않는다.
+    파일 이름에 실행 시각을 붙여, 삭제 전에 중단되어 다시 실행해도 이전 파일을 덮어쓰지 않는다.
+
+    Returns:
+        (파일 경로, 파일에 쓴 영상 id 목록)
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    parquet = parquet_available()
+    name = f"videos-{month_start:%Y-%m}-{archived_at:%Y%m%dT%H%M%S}"
+    path = os.path.join(archive_dir, name + (".parquet" if parquet else ".csv.gz"))
+    written: List[int] = []
+
+    def rows():
+        for ids in _month_batches(db, month_start, _next_month(month_start)):
+            written.extend(ids)
+            for row in _archive_rows(db, ids, archived_at):
+                yield [row[c] for c in ARCHIVE_COLUMNS]
+
+    part_path = path + ".part"
+    if parquet:
+        sql_types = [VideoArchive.__table__.columns[c].type for c in ARCHIVE_COLUMNS]
+        with open(part_path, "wb") as f:
+            for chunk in iter_parquet_chunks(ARCHIVE_COLUMNS, sql_types, rows()):
+                f.write(chunk)
+    else:
+        with gzip.open(part_path, "wt", encoding="utf-8", newline="") as f:
+            for chunk in iter_csv_chunks(ARCHIVE_COLUMNS, rows()):
+                f.write(chunk)
+    os.replace(part_path, path)
+    return path, written
+
+
+def _archive_month(db: Session, month_start: datetime, mode: str, archive_dir: str) -> Tuple[int, Optional[str]]:
+    """게시 월 하나 보관 후 삭제 (파티션 DROP에 해당)
+
+    Returns:
+        (옮긴 영상 수, 보관 파일 경로)
+    """
+    archived_at = datetime.utcnow()
+    if mode == "file":
+        path, ids = _write_month_file(db, archive_dir, month_start, archived_at)
+        for begin in range(0, len(ids), RETENTION_BATCH_SIZE):
+            _delete_videos(db, ids[begin:begin + RETENTION_BATCH_SIZE])
+            db.commit()
+        return len(ids), path
+
+    moved = 0
+    # 삭제하면서 진행하므로 매번 처음부터 다시 조회 (배치마다 커밋, 중단돼도 다시 실행하면 이어서 진행)
+    while True:
+        ids = next(_month_batches(db, month_start, _next_month(month_start)), None)
+        if not ids:
+            return moved, None
+        if mode == "table":
+            db.execute(insert(VideoArchive), _archive_rows(db, ids, archived_at))
+        _delete_videos(db, ids)
+        db.commit()
+        moved += len(ids)
+
+
+def archive_old_videos(
+    db: Session,
+    retention_days: int = RETENTION_DAYS,
+    mode: str = ARCHIVE_MODE,
+    archive_dir: str = ARCHIVE_DIR,
+    dry_run: bool = False,
+) -> Dict:
+    """보존 기간이 지난 게시 월의 영상을 보관하고 videos/video_hashtags 등에서 삭제
+
+    videos는 여러 테이블이 외래 키로 참조하고 video_id가 유니크라 MySQL 파티셔닝을 쓸 수 없으므로,
+    게시 월 단위로 통째로 옮겨 파티션을 DROP하는 것과 같은 효과를 낸다.
+
+    Args:
+        dry_run: 삭제하지 않고 월별 대상 영상 수만 계산
+
+    Returns:
+        {"cutoff", "mode", "months": {"YYYY-MM": 영상 수}, "archived", "files"}
+    """
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"알 수 없는 보관 방식입니다: {mode} (가능: {', '.join(ARCHIVE_MODES)})")
+    result: Dict = {"cutoff": None, "mode": mode, "months": {}, "archived": 0, "files": []}
+    if retention_days <= 0:
+        return result
+
+    cutoff = retention_cutoff(retention_days)
+    result["cutoff"] = cutoff.isoformat()
+    oldest = db.query(func.min(Video.published_at)).scalar()
+    if oldest is None or oldest >= cutoff:
+        return result
+
+    month_start = datetime(oldest.year, oldest.month, 1)
+    while month_start < cutoff:
+        month_end = _next_month(month_start)
+        count = db.query(func.count(Video.id)).filter(_month_condition(month_start, month_end)).scalar() or 0
+        if count:
+            key = f"{month_start:%Y-%m}"
+            if dry_run:
+                result["months"][key] = count
+            else:
+                moved, path = _archive_month(db, month_start, mode, archive_dir)
+                result["months"][key] = moved
+                result["archived"] += moved
+                if path:
+                    result["files"].append(path)
+                log.info("게시 월 보관 완료", month=key, videos=moved, mode=mode, path=path)
+        month_start = month_end
+    return result
@@ -1,54 +1,206 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from datetime import datetime
+import os
 from ..database import SessionLocal
+from ..models import Category
+from ..utils.log import get_logger, log_context
 from .data_collector import DataCollector
+from .stats_history import downsample_snapshots
+from .stats_refresher import refresh_video_statistics
+from .retention import RETENTION_DAYS, archive_old_videos
+from .category_registry import get_active_category_names
+from .adaptive_schedule import (
+    update_category_schedule,
+    defer_after_failure,
+    has_quota_for,
+    next_quota_reset,
+    ESTIMATED_RUN_UNITS,
+)
 
-# 카테고리 목록
-CATEGORIES = ["뷰티", "패션", "음식", "여행", "게임", "음악", "스포츠", "교육"]
+# 스케줄러 모드 (fixed: 고정 시각 일괄 수집, adaptive: 카테고리별 유입률 기반 수집)
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "fixed")
+# 적응형 모드에서 수집 대상 카테고리를 확인하는 주기 (분)
+ADAPTIVE_TICK_MINUTES = 5
+# 스케줄 수집 1회당 최대 수집 영상 수
+SCHEDULED_MAX_RESULTS = 50
+
+log = get_logger("scheduler")
 
 
 def collect_all_categories(incremental: bool = True):
-    """모든 카테고리 데이터 수집
+    """모든 활성 카테고리 데이터 수집
+
+    적응형 모드와 같은 하루 할당량 상한(YOUTUBE_DAILY_QUOTA_CAP)을 적용해,
+    상한을 넘길 것 같으면 남은 카테고리는 이번 실행에서 건너뛴다 (다음 정기 실행에서 수집).
     
     Args:
         incremental: 증분 수집 여부 (True: 마지막 수집 이후 새 영상만, False: 전체 수집)
     """
+    db: Session = SessionLocal()
+    try:
+        categories = get_active_category_names(db)
+    finally:
+        db.close()
+
     total_collected = 0
-    for category in CATEGORIES:
+    mode = "incremental" if incremental else "full"
+    for position, category in enumerate(categories):
         db: Session = SessionLocal()
-        try:
-            collector = DataCollector(db)
-            mode = "증분 수집" if incremental else "전체 수집"
-            print(f"[스케줄러] {category} 카테고리 {mode} 시작...")
-            count = collector.collect_videos(
-                category_name=category,
-                time_range_days=7,
-                max_results=50,
-                incremental=incremental,
+        with log_context(category=category, mode=mode):
+            try:
+                if not has_quota_for(db, ESTIMATED_RUN_UNITS):
+                    log.warning(
+                        "일일 할당량 상한 도달: 남은 카테고리는 이번 수집에서 건너뜀",
+                        skipped=", ".join(categories[position:]),
+                    )
+                    break
+                collector = DataCollector(db)
+                log.info("카테고리 수집 시작")
+                count = collector.collect_videos(
+                    category_name=category,
+                    time_range_days=7,
+                    max_results=SCHEDULED_MAX_RESULTS,
+                    incremental=incremental,
+                )
+                total_collected += count
+                log.info("카테고리 수집 완료", videos=count)
+            except Exception as e:
+                log.error("카테고리 수집 실패", error=str(e))
+                db.rollback()
+            finally:
+                db.close()
+    log.info("전체 수집 완료", mode=mode, videos=total_collected, categories=len(categories))
+
+
+def collect_due_categories():
+    """적응형 모드: 다음 수집 시각이 지난 카테고리만 증분 수집
+
+    카테고리별 신규 영상 유입률로 다음 수집 시각을 다시 계산하고,
+    하루 할당량 상한(collection_runs의 오늘 사용량 기준)을 넘길 것 같으면
+    남은 카테고리는 다음 날로 미룬다.
+    """
+    db: Session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        get_active_category_names(db)  # 레지스트리가 비어 있으면 기본 카테고리 시드
+        due_categories = (
+            db.query(Category)
+            .filter(
+                Category.is_active.is_(True),
+                or_(Category.next_collection_at.is_(None), Category.next_collection_at <= now),
             )
-            total_collected += count
-            print(f"[스케줄러] {category} 카테고리: {count}개 영상 수집 완료")
-        except Exception as e:
-            print(f"[스케줄러] {category} 카테고리 수집 실패: {str(e)}")
-            db.rollback()
-        finally:
-            db.close()
-    print(f"[스케줄러] 전체 수집 완료: 총 {total_collected}개 영상")
+            .order_by(Category.next_collection_at)
+            .all()
+        )
+
+        for category in due_categories:
+            if not has_quota_for(db, ESTIMATED_RUN_UNITS):
+                next_reset = next_quota_reset()
+                for postponed in due_categories[due_categories.index(category):]:
+                    postponed.next_collection_at = next_reset
+                db.commit()
+                log.warning("일일 할당량 상한 도달: 남은 카테고리는 다음 초기화 이후 수집", next_reset=next_reset)
+                break
+
+            with log_context(category=category.name, mode="incremental"):
+                try:
+                    collector = DataCollector(db)
+                    count = collector.collect_videos(
+                        category_name=category.name,
+                        time_range_days=7,
+                        max_results=SCHEDULED_MAX_RESULTS,
+                        incremental=True,
+                    )
+                except Exception as e:
+                    db.rollback()
+                    # 일시적 오류로 유입률이 낮아져 간격이 늘지 않도록 추정치는 그대로 두고 최소 간격 뒤 재시도
+                    defer_after_failure(category)
+                    db.commit()
+                    log.error("카테고리 수집 실패", error=str(e), next_collection_at=category.next_collection_at)
+                    continue
+
+                update_category_schedule(category, count, SCHEDULED_MAX_RESULTS)
+                db.commit()
+                log.info(
+                    "카테고리 수집 완료", videos=count,
+                    arrival_rate=round(category.arrival_rate, 2), next_collection_at=category.next_collection_at,
+                )
+    except Exception as e:
+        log.exception("적응형 수집 실패", error=str(e))
+        db.rollback()
+    finally:
+        db.close()
+
+
+def compact_stat_snapshots():
+    """통계 스냅샷 다운샘플링 및 보존 기간 초과분 삭제"""
+    db: Session = SessionLocal()
+    try:
+        result = downsample_snapshots(db)
+        log.info("통계 스냅샷 정리 완료", expired=result["expired"], downsampled=result["downsampled"])
+    except Exception as e:
+        log.exception("통계 스냅샷 정리 실패", error=str(e))
+        db.rollback()
+    finally:
+        db.close()
+
+
+def archive_expired_videos():
+    """보존 기간이 지난 게시 월의 영상 보관 및 삭제"""
+    db: Session = SessionLocal()
+    try:
+        result = archive_old_videos(db)
+        log.info("영상 보관 완료", cutoff=result["cutoff"], archived=result["archived"], months=len(result["months"]))
+    except Exception as e:
+        log.exception("영상 보관 실패", error=str(e))
+        db.rollback()
+    finally:
+        db.close()
+
+
+def refresh_stale_statistics():
+    """우선순위 기반 기존 영상 통계 갱신"""
+    db: Session = SessionLocal()
+    try:
+        result = refresh_video_statistics(db)
+        log.info(
+            "통계 갱신 완료", selected=result["selected"], updated=result["updated"], api_units=result["api_units"],
+        )
+    except Exception as e:
+        log.exception("통계 갱신 실패", error=str(e))
+        db.rollback()
+    finally:
+        db.close()
 
 
 def start_scheduler():
     """스케줄러 시작"""
     scheduler = BackgroundScheduler()
     
-    # 매일 오전 2시에 모든 카테고리 증분 수집 (새 영상만)
-    scheduler.add_job(
-        lambda: collect_all_categories(incremental=True),
-        trigger=CronTrigger(hour=2, minute=0),
-        id="daily_incremental_collection",
-        name="일일 증분 데이터 수집",
-        replace_existing=True,
-    )
+    if SCHEDULER_MODE == "adaptive":
+        # 5분마다 수집 시각이 된 카테고리만 증분 수집 (카테고리별 유입률 기반)
+        scheduler.add_job(
+            collect_due_categories,
+            trigger=IntervalTrigger(minutes=ADAPTIVE_TICK_MINUTES),
+            id="adaptive_incremental_collection",
+            name="적응형 증분 데이터 수집",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+    else:
+        # 매일 오전 2시에 모든 카테고리 증분 수집 (새 영상만)
+        scheduler.add_job(
+            lambda: collect_all_categories(incremental=True),
+            trigger=CronTrigger(hour=2, minute=0),
+            id="daily_incremental_collection",
+            name="일일 증분 데이터 수집",
+            replace_existing=True,
+        )
     
     # 매주 일요일 오전 3시에 전체 수집 (백업용)
     scheduler.add_job(
@@ -59,10 +211,38 @@ def start_scheduler():
         replace_existing=True,
     )
     
+    # 3시간마다 우선순위 기반 통계 갱신 (Videos API만 사용)
+    scheduler.add_job(
+        refresh_stale_statistics,
+        trigger=IntervalTrigger(hours=3),
+        id="statistics_refresh",
+        name="영상 통계 갱신",
+        replace_existing=True,
+    )
+    
+    # 매일 오전 4시에 통계 스냅샷 다운샘플링/보존 정책 적용
+    scheduler.add_job(
+        compact_stat_snapshots,
+        trigger=CronTrigger(hour=4, minute=0),
+        id="daily_snapshot_compaction",
+        name="일일 통계 스냅샷 정리",
+        replace_existing=True,
+    )
+    
+    # 매일 오전 4시 30분에 보존 기간이 지난 영상 보관 (RETENTION_DAYS=0이면 등록하지 않음)
+    if RETENTION_DAYS > 0:
+        scheduler.add_job(
+            archive_expired_videos,
+            trigger=CronTrigger(hour=4, minute=30),
+            id="daily_video_retention",
+            name="일일 영상 보관",
+            replace_existing=True,
+        )
+    
     scheduler.start()
-    print("[스케줄러] 데이터 수집 스케줄러가 시작되었습니다.")
-    print("[스케줄러] 매일 오전 2시: 증분 수집 (새 영상만)")
-    print("[스케줄러] 매주 일요일 오전 3시: 전체 수집 (백업)")
+    log.info("데이터 수집 스케줄러가 시작되었습니다", mode=SCHEDULER_MODE)
+    for job in scheduler.get_jobs():
+        log.info("스케줄 등록", job=job.name, trigger=job.trigger)
     
     return scheduler
 
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..models import CategoryDaySketch, Hashtag, Video, VideoHashtag
+from ..utils.sketches import CountMinSketch, HeavyHitters, HyperLogLog, TopK
+from ..utils.text import title_keywords
+
+# 재구축 시 한 번에 읽는 영상 수
+REBUILD_BATCH_SIZE = 2000
+
+
+def _publish_day(published_at: datetime) -> date:
+    """게시 시각의 UTC 날짜"""
+    if published_at.tzinfo is not None:
+        published_at = published_at.astimezone(timezone.utc)
+    return published_at.date()
+
+
+class Sketches:
+    """하루(또는 여러 날을 병합한 구간)의 스케치 묶음"""
+
+    def __init__(
+        self,
+        video_count: int = 0,
+        tag_hll: Optional[HyperLogLog] = None,
+        channel_hll: Optional[HyperLogLog] = None,
+        tags: Optional[HeavyHitters] = None,
+        tokens: Optional[HeavyHitters] = None,
+    ):
+        self.video_count = video_count
+        self.tag_hll = tag_hll or HyperLogLog()
+        self.channel_hll = channel_hll or HyperLogLog()
+        self.tags = tags or HeavyHitters()
+        self.tokens = tokens or HeavyHitters()
+
+    def add_video(self, channel_id: Optional[str], title: Optional[str], tags: Iterable[str]) -> None:
+        """신규 영상 하나 반영 (영상당 태그는 한 번씩만 센다)"""
+        self.video_count += 1
+        if channel_id:
+            self.channel_hll.add(channel_id)
+        for tag in set(tags):
+            self.tag_hll.add(tag)
+            self.tags.add(tag)
+        self.tokens.update(title_keywords(title))
+
+    @classmethod
+    def from_row(cls, row: CategoryDaySketch) -> "Sketches":
+        return cls(
+            video_count=row.video_count or 0,
+            tag_hll=HyperLogLog.from_bytes(row.tag_hll),
+            channel_hll=HyperLogLog.from_bytes(row.channel_hll),
+            tags=HeavyHitters(CountMinSketch.from_bytes(row.tag_cms), TopK.from_json(row.tag_topk)),
+            tokens=HeavyHitters(CountMinSketch.from_bytes(row.token_cms), TopK.from_json(row.token_topk)),
+        )
+
+    def apply_to(self, row: CategoryDaySketch) -> None:
+        row.video_count = self.video_count
+        row.tag_hll = self.tag_hll.to_bytes()
+        row.channel_hll = self.channel_hll.to_bytes()
+        row.tag_cms = self.tags.cms.to_bytes()
+        row.tag_topk = self.tags.topk.to_json()
+        row.token_cms = self.tokens.cms.to_bytes()
+        row.token_topk = self.tokens.topk.to_json()
+
+    @classmethod
+    def merge_all(cls, sketches: List["Sketches"]) -> "Sketches":
+        merged = cls()
+        for sketch in sketches:
+            merged.video_count += sketch.video_count
+            merged.tag_hll.merge(sketch.tag_hll)
+            merged.channel_hll.merge(sketch.channel_hll)
+        merged.tags = HeavyHitters.merge_all([s.tags for s in sketches])
+        merged.tokens = HeavyHitters.merge_all([s.tokens for s in sketches])
+        return merged
+
+
+def record_new_videos(db: Session, category_id: int, videos: List[Dict]) -> None:
+    """신규 영상을 게시일별 스케치에 반영 (커밋은 호출자가 수행)
+
+    Args:
+        videos: published_at, channel_id, title, tags 키를 가진 영상 데이터
+    """
+    if not videos:
+        return
+    by_day: Dict[date, List[Dict]] = defaultdict(list)
+    for video in videos:
+        by_day[_publish_day(video["published_at"])].append(video)
+
+    # 없는 날짜 행을 먼저 만들고 (동시에 수집하는 작업이 먼저 만든 행은 건너뜀) 행 잠금 후 병합
+    # (조회 후 추가하면 두 작업이 같은 (category_id, day) 행을 함께 추가해 기본 키 충돌)
+    db.execute(
+        insert(CategoryDaySketch.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"category_id": category_id, "day": day, "video_count": 0} for day in by_day],
+    )
+    rows = {
+        row.day: row
+        for row in db.query(CategoryDaySketch)
+        .filter(
+            CategoryDaySketch.category_id == category_id,
+            CategoryDaySketch.day.in_(list(by_day)),
+        )
+        .with_for_update()
+        .all()
+    }
+    for day, day_videos in by_day.items():
+        row = rows[day]
+        sketches = Sketches.from_row(row)
+        for video in day_videos:
+            sketches.add_video(video.get("channel_id"), video.get("title"), video.get("tags") or [])
+        sketches.apply_to(row)
+
+
+def rebuild_sketches(db: Session, category_id: int) -> int:
+    """카테고리 스케치를 저장된 영상으로 다시 만듦 (도입 전 데이터 반영용, 커밋 포함)
+
+    Returns:
+        반영한 영상 수
+    """
+    db.query(CategoryDaySketch).filter(CategoryDaySketch.category_id == category_id).delete()
+
+    by_day: Dict[date, Sketches] = defaultdict(Sketches)
+    last_id = 0
+    video_count = 0
+    while True:
+        videos = (
+            db.query(Video.id, Video.published_at, Video.channel_id, Video.title)
+            .filter(Video.category_id == category_id, Video.id > last_id)
+            .order_by(Video.id)
+            .limit(REBUILD_BATCH_SIZE)
+            .all()
+        )
+        if not videos:
+            break
+        tags_by_video: Dict[int, List[str]] = defaultdict(list)
+        for video_id, tag in (
+            db.query(VideoHashtag.video_id, Hashtag.tag)
+            .join(Hashtag, Hashtag.id == VideoHashtag.hashtag_id)
+            .filter(VideoHashtag.video_id.in_([v.id for v in videos]))
+            .all()
+        ):
+            tags_by_video[video_id].append(tag)
+        for video in videos:
+            by_day[_publish_day(video.published_at)].add_video(
+                video.channel_id, video.title, tags_by_video.get(video.id, [])
+            )
+        video_count += len(videos)
+        last_id = videos[-1].id
+
+    for day, sketches in by_day.items():
+        row = CategoryDaySketch(category_id=category_id, day=day)
+        sketches.apply_to(row)
+        db.add(row)
+    db.commit()
+    return video_count
+
+
+def window_sketches(db: Session, category_id: int, days: int, now: Optional[datetime] = None) -> Sketches:
+    """최근 days일(게시일 기준) 스케치 병합"""
+    now = now or datetime.utcnow()
+    start_day = (now - timedelta(days=days)).date()
+    rows = (
+        db.query(CategoryDaySketch)
+        .filter(CategoryDaySketch.category_id == category_id, CategoryDaySketch.day >= start_day)
+        .all()
+    )
+    return Sketches.merge_all([Sketches.from_row(row) for row in rows])
+
+
+def sketch_summary(db: Session, category_id: int, days: int, top_n: int = 20) -> Dict:
+    """기간 근사 통계와 오차 범위
+
+    - 고유 개수: HyperLogLog 추정값과 상대 표준 오차
+    - 상위 빈도: Count-Min 추정값 (실제보다 작지 않고, 확률 1 - delta 이상으로 max_overcount 이내로 큼)
+    """
+    sketches = window_sketches(db, category_id, days)
+
+    def heavy_hitters(hitters: HeavyHitters, key: str) -> Dict:
+        return {
+            "items": [{key: item, "count": count} for item, count in hitters.top(top_n)],
+            "total": hitters.cms.total,
+            "max_overcount": hitters.cms.max_overcount,
+            "epsilon": round(hitters.cms.epsilon, 6),
+            "delta": round(hitters.cms.delta, 6),
+        }
+
+    return {
+        "days": days,
+        "video_count": sketches.video_count,
+        "distinct_tags": {
+            "estimate": int(round(sketches.tag_hll.estimate())),
+            "relative_error": round(sketches.tag_hll.relative_error, 4),
+        },
+        "distinct_channels": {
+            "estimate": int(round(sketches.channel_hll.estimate())),
+            "relative_error": round(sketches.channel_hll.relative_error, 4),
+        },
+        "top_tags": heavy_hitters(sketches.tags, "tag"),
+        "top_keywords": heavy_hitters(sketches.tokens, "keyword"),
+    }
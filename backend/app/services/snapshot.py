@@ -0,0 +1,406 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy import Boolean, DateTime, Float, Integer, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+from ..models import Category, Hashtag, HashtagAlias, Video, VideoDetail, VideoHashtag
+from ..utils.log import get_logger
+
+# 스냅샷 대상 테이블 (적재 순서 = 외래 키 의존 순서)
+SNAPSHOT_TABLES: List[Table] = [
+    Category.__table__,
+    Hashtag.__table__,
+    HashtagAlias.__table__,
+    Video.__table__,
+    VideoDetail.__table__,
+    VideoHashtag.__table__,
+]
+MANIFEST_FILE = "manifest.json"
+# CSV의 NULL 표기 (MySQL LOAD DATA 기본값과 동일)
+CSV_NULL = "\\N"
+# 스냅샷 CSV의 백슬래시 처리 (값의 '\'를 '\\'로 써서 LOAD DATA의 ESCAPED BY '\'와 맞춤, manifest에 기록)
+CSV_ESCAPE = "backslash"
+# 스트리밍 조회/적재 배치 크기
+EXPORT_BATCH_SIZE = 10000
+IMPORT_BATCH_SIZE = 5000
+
+log = get_logger("snapshot")
+
+
+def parquet_available() -> bool:
+    """pyarrow 설치 여부 (Parquet 형식은 선택 의존성)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def format_csv_value(value, escape_backslash: bool = False) -> str:
+    """CSV 셀 값 변환 (None -> \\N, datetime -> 'YYYY-MM-DD HH:MM:SS.ffffff', bool -> 0/1)
+
+    escape_backslash: 값의 백슬래시를 두 번 씀 (MySQL LOAD DATA가 '\\n' 등을 이스케이프로 읽지 않도록)
+    """
+    if value is None:
+        return CSV_NULL
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if escape_backslash and isinstance(value, str):
+        return value.replace("\\", "\\\\")
+    return str(value)
+
+
+def iter_csv_chunks(
+    columns: Sequence[str], rows: Iterable[Sequence], rows_per_chunk: int = 1000, escape_backslash: bool = False
+) -> Iterator[str]:
+    """헤더 + 행들을 일정 행 수 단위의 CSV 문자열 조각으로 변환"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([format_csv_value(v, escape_backslash) for v in row])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _column_parser(column) -> Callable[[str], object]:
+    """CSV 문자열을 컬럼 타입에 맞는 파이썬 값으로 변환하는 함수"""
+    if isinstance(column.type, Boolean):
+        return lambda v: v not in ("0", "false", "False")
+    if isinstance(column.type, Integer):
+        return int
+    if isinstance(column.type, Float):
+        return float
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat
+    return lambda v: v
+
+
+def _stream_rows(conn: Connection, table: Table) -> Iterator[Sequence]:
+    """서버 측 커서로 테이블 전체를 일정 크기씩 스트리밍"""
+    result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(
+        select(table).order_by(*table.primary_key.columns)
+    )
+    for partition in result.partitions():
+        yield from partition
+
+
+def _arrow_type(sql_type):
+    """SQLAlchemy 컬럼 타입 -> Arrow 타입 (첫 배치가 전부 NULL이어도 스키마가 고정되도록)"""
+    import pyarrow as pa
+
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter 출력을 모아 두었다가 조각 단위로 꺼내는 쓰기 전용 버퍼"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_parquet_chunks(
+    columns: Sequence[str],
+    sql_types: Sequence,
+    rows: Iterable[Sequence],
+    rows_per_group: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """행 스트림을 row group 단위로 인코딩한 Parquet 바이트 조각으로 변환 (pyarrow 필요)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, _arrow_type(t)) for name, t in zip(columns, sql_types)])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+    def to_table(batch):
+        return pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)],
+            schema=schema,
+        )
+
+    batch: List[Sequence] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= rows_per_group:
+            writer.write_table(to_table(batch))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(to_table(batch))
+    writer.close()
+    yield sink.drain()
+
+
+def export_snapshot(engine: Engine, output_dir: str, file_format: str = "csv") -> Dict:
+    """스냅샷 내보내기 (테이블별 csv.gz 또는 parquet 파일 + manifest.json)"""
+    if file_format == "parquet" and not parquet_available():
+        raise RuntimeError("Parquet 형식은 pyarrow가 필요합니다. (pip install pyarrow)")
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {"created_at": datetime.utcnow().isoformat(), "format": file_format, "tables": []}
+    if file_format != "parquet":
+        manifest["csv_escape"] = CSV_ESCAPE
+    with engine.connect() as conn:
+        for table in SNAPSHOT_TABLES:
+            columns = [c.name for c in table.columns]
+            counter = _RowCounter(_stream_rows(conn, table))
+            if file_format == "parquet":
+                file_name = f"{table.name}.parquet"
+                with open(os.path.join(output_dir, file_name), "wb") as f:
+                    for chunk in iter_parquet_chunks(columns, [c.type for c in table.columns], counter):
+                        f.write(chunk)
+            else:
+                file_name = f"{table.name}.csv.gz"
+                with gzip.open(os.path.join(output_dir, file_name), "wt", encoding="utf-8", newline="") as f:
+                    for chunk in iter_csv_chunks(columns, counter, escape_backslash=True):
+                        f.write(chunk)
+            manifest["tables"].append({
+                "table": table.name,
+                "file": file_name,
+                "columns": columns,
+                "rows": counter.count,
+            })
+            log.info("테이블 내보내기 완료", table=table.name, rows=counter.count)
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+class _RowCounter:
+    """행 스트림을 그대로 넘겨주면서 개수를 세는 이터러블"""
+
+    def __init__(self, rows: Iterable[Sequence]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Sequence]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def _iter_file_batches(
+    path: str, table: Table, columns: List[str], escaped: bool = True
+) -> Iterator[List[Dict]]:
+    """스냅샷 파일을 적재용 dict 배치로 읽기 (escaped: CSV 값의 백슬래시가 두 번 쓰여 있음)"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=IMPORT_BATCH_SIZE):
+            yield record_batch.to_pylist()
+        return
+
+    parsers = {
+        name: _column_parser(table.columns[name]) if name in table.columns else (lambda v: v)
+        for name in columns
+    }
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        batch = []
+        for row in reader:
+            batch.append({
+                name: (
+                    None if value == CSV_NULL
+                    else parsers[name](value.replace("\\\\", "\\") if escaped else value)
+                )
+                for name, value in zip(header, row)
+            })
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _split_legacy_columns(batch: List[Dict], legacy: List[str]) -> List[Dict]:
+    """현재 테이블에 없는 컬럼을 행에서 제거 (이전 스냅샷의 videos.description은 video_details 행으로 반환)"""
+    details = []
+    for row in batch:
+        description = row.get("description") if "description" in legacy else None
+        for name in legacy:
+            row.pop(name, None)
+        if description:
+            details.append({"video_id": row["id"], "description": description})
+    return details
+
+
+def _load_data_infile(conn: Connection, path: str, table: Table, columns: List[str]) -> int:
+    """MySQL LOAD DATA LOCAL INFILE로 csv.gz 적재 (압축 해제한 임시 파일 사용)
+
+    파일은 백슬래시를 두 번 쓰고 NULL은 \\N, 따옴표는 ""로 쓴 형식이어야 한다 (ESCAPED BY '\\' 기본값,
+    manifest의 csv_escape). 감싼 값 안의 ""는 MySQL도 따옴표 하나로 읽는다.
+    """
+    with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as tmp:
+        with gzip.open(path, "rb") as src:
+            while chunk := src.read(1 << 20):
+                tmp.write(chunk)
+        tmp_path = tmp.name
+    try:
+        result = conn.execute(text(
+            f"LOAD DATA LOCAL INFILE :path INTO TABLE {table.name} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' IGNORE 1 LINES ({', '.join(columns)})"
+        ), {"path": tmp_path})
+        return result.rowcount
+    finally:
+        os.remove(tmp_path)
+
+
+def _deferred_indexes(table: Table, is_mysql: bool) -> List:
+    """적재 동안 지웠다가 다시 만들 보조 인덱스
+
+    외래 키 컬럼으로 시작하는 인덱스는 제외한다 (MySQL은 foreign_key_checks = 0이어도 외래 키가 쓰는
+    인덱스를 지울 수 없음, 오류 1553). MySQL(InnoDB)에서는 모든 테이블의 보조 인덱스가 외래 키에 걸려
+    있거나 DISABLE KEYS가 효과가 없으므로 아무것도 미루지 않는다.
+    """
+    if is_mysql:
+        return []
+    fk_columns = {fk.parent.name for fk in table.foreign_keys}
+    return [
+        index for index in table.indexes
+        if not index.unique and next(iter(index.columns)).name not in fk_columns
+    ]
+
+
+def _load_tables(
+    conn: Connection,
+    input_dir: str,
+    manifest: Dict,
+    tables: Dict[str, Table],
+    truncate: bool,
+    use_load_data: bool,
+    escaped: bool,
+) -> Dict[str, int]:
+    """import_snapshot의 데이터 적재 부분 (호출자의 트랜잭션 안에서 실행)"""
+    is_mysql = conn.dialect.name == "mysql"
+    loaded: Dict[str, int] = {}
+    if truncate:
+        for table in reversed(SNAPSHOT_TABLES):
+            conn.execute(table.delete())
+    else:
+        for table in SNAPSHOT_TABLES:
+            if conn.execute(select(table).limit(1)).first() is not None:
+                raise RuntimeError(f"{table.name} 테이블이 비어 있지 않습니다. (--truncate 사용)")
+
+    for entry in manifest["tables"]:
+        table = tables[entry["table"]]
+        path = os.path.join(input_dir, entry["file"])
+
+        # 이전 스키마로 만든 스냅샷의 컬럼 (videos의 설명/썸네일 등)
+        legacy = [name for name in entry["columns"] if name not in table.columns]
+        if use_load_data and is_mysql and path.endswith(".csv.gz") and escaped and not legacy:
+            row_count = _load_data_infile(conn, path, table, entry["columns"])
+        else:
+            row_count = 0
+            for batch in _iter_file_batches(path, table, entry["columns"], escaped):
+                details = _split_legacy_columns(batch, legacy) if legacy else []
+                conn.execute(table.insert(), batch)
+                if details:
+                    conn.execute(VideoDetail.__table__.insert(), details)
+                row_count += len(batch)
+
+        loaded[table.name] = row_count
+        log.info("테이블 적재 완료", table=table.name, rows=row_count)
+    return loaded
+
+
+def import_snapshot(
+    engine: Engine,
+    input_dir: str,
+    truncate: bool = False,
+    use_load_data: bool = False,
+) -> Dict[str, int]:
+    """스냅샷 적재
+
+    데이터(삭제 + 적재)는 한 트랜잭션에서 처리한다. 미룰 수 있는 보조 인덱스(_deferred_indexes, SQLite만)는
+    데이터 트랜잭션 밖에서 먼저 지웠다가 적재가 끝나면(실패해도) 다시 만든다.
+    MySQL에서는 보조 인덱스를 그대로 두고 외래 키/유니크 검사만 적재 동안 끈다.
+
+    Args:
+        truncate: 기존 데이터를 지우고 적재 (False이면 대상 테이블이 비어 있어야 함)
+        use_load_data: MySQL이고 csv 형식이면 LOAD DATA LOCAL INFILE 사용
+            (DATABASE_URL에 local_infile=1 필요, 백슬래시 처리 이전 스냅샷은 일반 적재)
+    """
+    with open(os.path.join(input_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    tables = {t.name: t for t in SNAPSHOT_TABLES}
+    is_mysql = engine.dialect.name == "mysql"
+    escaped = manifest.get("csv_escape") == CSV_ESCAPE
+
+    deferred = [
+        index for entry in manifest["tables"] for index in _deferred_indexes(tables[entry["table"]], is_mysql)
+    ]
+    with engine.begin() as conn:
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+    try:
+        with engine.connect() as conn:
+            try:
+                with conn.begin():
+                    if is_mysql:
+                        conn.execute(text("SET foreign_key_checks = 0"))
+                        conn.execute(text("SET unique_checks = 0"))
+                    loaded = _load_tables(conn, input_dir, manifest, tables, truncate, use_load_data, escaped)
+            finally:
+                # 세션 변수라 실패해도 되돌린 뒤 커넥션을 풀에 반환
+                if is_mysql:
+                    conn.execute(text("SET unique_checks = 1"))
+                    conn.execute(text("SET foreign_key_checks = 1"))
+                    conn.commit()
+    finally:
+        with engine.begin() as conn:
+            for index in deferred:
+                index.create(conn, checkfirst=True)
+
+    return loaded
+
+
+def snapshot_summary(input_dir: str) -> Optional[Dict]:
+    """manifest.json 내용 (없으면 None)"""
+    path = os.path.join(input_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,208 @@
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import event, insert, delete, and_
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+import numpy as np
+from ..database import SessionLocal
+from ..models import VideoStatSnapshot
+
+# 원본 스냅샷 보존 기간 (이후 일 단위로 다운샘플링)
+RAW_SNAPSHOT_DAYS = 7
+# 스냅샷 최대 보존 기간 (이후 삭제)
+SNAPSHOT_RETENTION_DAYS = 90
+# IN 절 / 삭제 배치 크기
+_BATCH_SIZE = 1000
+
+GROWTH_COLUMNS = [
+    "video_id", "base_views", "latest_views", "view_delta", "hours", "views_per_hour", "growth_rate",
+]
+# 세션별 성장 지표 캐시 키 (Session.info)
+_GROWTH_CACHE_KEY = "view_growth_cache"
+
+
+def _clear_growth_cache(session: Session, transaction) -> None:
+    """트랜잭션이 끝나면 (커밋/롤백/세션 종료) 성장 지표 캐시를 비움"""
+    session.info.pop(_GROWTH_CACHE_KEY, None)
+
+
+def install_growth_cache_reset(session_factory: sessionmaker) -> None:
+    """세션 팩토리에 캐시 비우기 이벤트 등록 (앱 SessionLocal은 import 시 등록, 별도 팩토리를 쓰는 스크립트용)
+
+    전역 Session 클래스에 걸면 앱과 무관한 세션의 트랜잭션마다 호출되므로 팩토리 단위로 등록한다.
+    """
+    if not event.contains(session_factory, "after_transaction_end", _clear_growth_cache):
+        event.listen(session_factory, "after_transaction_end", _clear_growth_cache)
+
+
+install_growth_cache_reset(SessionLocal)
+
+
+def build_snapshot_rows(videos: Iterable[Dict], captured_at: Optional[datetime] = None) -> List[Dict]:
+    """영상 데이터(id=videos.id, view_count/like_count/comment_count 키) 목록으로 스냅샷 행 생성"""
+    captured_at = captured_at or datetime.utcnow()
+    return [
+        {
+            "video_id": v["id"],
+            "captured_at": captured_at,
+            "view_count": v.get("view_count") or 0,
+            "like_count": v.get("like_count") or 0,
+            "comment_count": v.get("comment_count") or 0,
+        }
+        for v in videos
+    ]
+
+
+def record_snapshots(db: Session, rows: List[Dict]) -> int:
+    """스냅샷 일괄 기록 (executemany 한 번, 커밋은 호출자 트랜잭션에 맡김)"""
+    if not rows:
+        return 0
+    db.execute(insert(VideoStatSnapshot), rows)
+    db.info.pop(_GROWTH_CACHE_KEY, None)
+    return len(rows)
+
+
+def get_view_growth(db: Session, video_ids: Iterable[int], window_days: int = 7) -> pd.DataFrame:
+    """영상별 실측 조회수 성장 지표 계산 (numpy 벡터 연산)
+
+    기간 내 첫 스냅샷과 마지막 스냅샷을 비교한다. 스냅샷이 2개 미만인 영상은 제외된다.
+
+    Returns:
+        video_id, base_views, latest_views, view_delta, hours, views_per_hour, growth_rate 컬럼의 DataFrame
+    """
+    ids = np.unique(np.asarray(list(video_ids), dtype=np.int64))
+    if len(ids) == 0:
+        return pd.DataFrame(columns=GROWTH_COLUMNS)
+
+    cutoff = datetime.utcnow() - timedelta(days=window_days)
+    rows = []
+    for i in range(0, len(ids), _BATCH_SIZE):
+        batch = ids[i : i + _BATCH_SIZE].tolist()
+        rows.extend(
+            db.query(
+                VideoStatSnapshot.video_id,
+                VideoStatSnapshot.captured_at,
+                VideoStatSnapshot.view_count,
+            )
+            .filter(
+                and_(
+                    VideoStatSnapshot.video_id.in_(batch),
+                    VideoStatSnapshot.captured_at >= cutoff,
+                )
+            )
+            .all()
+        )
+    if not rows:
+        return pd.DataFrame(columns=GROWTH_COLUMNS)
+
+    snap = pd.DataFrame(rows, columns=["video_id", "captured_at", "view_count"])
+    snap = snap.sort_values(["video_id", "captured_at"], kind="mergesort")
+    vid = snap["video_id"].to_numpy()
+    ts = snap["captured_at"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    views = snap["view_count"].to_numpy(dtype=np.int64)
+
+    # 정렬된 video_id 기준으로 그룹 경계 계산 (첫/마지막 스냅샷 인덱스)
+    starts = np.flatnonzero(np.r_[True, vid[1:] != vid[:-1]])
+    ends = np.r_[starts[1:], len(vid)] - 1
+    multi = ends > starts
+    starts, ends = starts[multi], ends[multi]
+    if len(starts) == 0:
+        return pd.DataFrame(columns=GROWTH_COLUMNS)
+
+    base = views[starts]
+    latest = views[ends]
+    delta = latest - base
+    hours = (ts[ends] - ts[starts]) / 3600.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = np.where(hours > 0, delta / hours, 0.0)
+        growth_rate = np.where(base > 0, delta / base, 0.0)
+
+    return pd.DataFrame({
+        "video_id": vid[starts],
+        "base_views": base,
+        "latest_views": latest,
+        "view_delta": delta,
+        "hours": hours,
+        "views_per_hour": velocity,
+        "growth_rate": growth_rate,
+    })
+
+
+def get_view_growth_cached(db: Session, video_ids: Iterable[int], window_days: int = 7) -> pd.DataFrame:
+    """get_view_growth + 세션(트랜잭션) 단위 캐시
+
+    한 요청에서 여러 분석 함수가 같은 영상의 스냅샷을 다시 조회하지 않도록,
+    이미 계산한 영상은 캐시에서 가져오고 나머지 영상만 조회한다.
+    """
+    ids = np.unique(np.asarray(list(video_ids), dtype=np.int64))
+    cache = db.info.setdefault(_GROWTH_CACHE_KEY, {})
+    known, frame = cache.get(window_days, (np.empty(0, dtype=np.int64), pd.DataFrame(columns=GROWTH_COLUMNS)))
+    missing = np.setdiff1d(ids, known, assume_unique=True)
+    if len(missing):
+        fetched = get_view_growth(db, missing, window_days)
+        if not fetched.empty:
+            frame = fetched if frame.empty else pd.concat([frame, fetched], ignore_index=True)
+        known = np.union1d(known, missing)
+        cache[window_days] = (known, frame)
+    if frame.empty:
+        return frame
+    return frame[frame["video_id"].isin(ids)].reset_index(drop=True)
+
+
+def format_growth(rate: float) -> str:
+    """성장률(비율)을 '+12%' 형식 문자열로 변환"""
+    return f"{rate * 100:+.0f}%"
+
+
+def downsample_snapshots(
+    db: Session,
+    raw_days: int = RAW_SNAPSHOT_DAYS,
+    retention_days: int = SNAPSHOT_RETENTION_DAYS,
+) -> Dict[str, int]:
+    """스냅샷 다운샘플링 및 보존 정책 적용
+
+    - retention_days 이전 스냅샷: 삭제
+    - raw_days ~ retention_days 사이 스냅샷: 영상별 하루 마지막 스냅샷만 유지
+
+    원본 구간 경계는 자정으로 내림한다 (경계가 하루 중간이면 그날의 앞부분과 다음 실행의 뒷부분이
+    따로 다운샘플링되어 하루에 스냅샷이 두 개 남음).
+    """
+    now = datetime.utcnow()
+    retention_cutoff = now - timedelta(days=retention_days)
+    raw_start = now - timedelta(days=raw_days)
+    raw_cutoff = datetime(raw_start.year, raw_start.month, raw_start.day)
+
+    expired = db.execute(
+        delete(VideoStatSnapshot).where(VideoStatSnapshot.captured_at < retention_cutoff)
+    ).rowcount or 0
+
+    # 하루 단위로 나누어 처리 (메모리 사용량 제한)
+    downsampled = 0
+    day_start = datetime(retention_cutoff.year, retention_cutoff.month, retention_cutoff.day)
+    while day_start < raw_cutoff:
+        day_end = min(day_start + timedelta(days=1), raw_cutoff)
+        rows = (
+            db.query(VideoStatSnapshot.id, VideoStatSnapshot.video_id)
+            .filter(
+                and_(
+                    VideoStatSnapshot.captured_at >= day_start,
+                    VideoStatSnapshot.captured_at < day_end,
+                )
+            )
+            .order_by(VideoStatSnapshot.video_id, VideoStatSnapshot.captured_at)
+            .all()
+        )
+        if rows:
+            day_df = pd.DataFrame(rows, columns=["id", "video_id"])
+            drop_ids = day_df.loc[day_df["video_id"].duplicated(keep="last"), "id"].tolist()
+            for i in range(0, len(drop_ids), _BATCH_SIZE):
+                db.execute(
+                    delete(VideoStatSnapshot).where(
+                        VideoStatSnapshot.id.in_(drop_ids[i : i + _BATCH_SIZE])
+                    )
+                )
+            downsampled += len(drop_ids)
+        day_start = day_end
+
+    db.commit()
+    return {"expired": int(expired), "downsampled": downsampled}
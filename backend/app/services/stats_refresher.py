@@ -0,0 +1,163 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import update, func
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import time
+import pandas as pd
+import numpy as np
+from ..models import Video
+from .youtube_service import YouTubeService
+from .stats_history import get_view_growth, record_snapshots
+from .collection_runs import start_run, finish_run, fail_run
+from ..utils.metrics import record_collection
+
+# 갱신 대상 최대 영상 나이 (이보다 오래된 영상은 조회수 변화가 작아 제외)
+REFRESH_MAX_AGE_DAYS = 30
+# 최소 갱신 간격 (이 시간 안에 갱신된 영상은 제외)
+REFRESH_MIN_INTERVAL_HOURS = 1
+# 1회 실행당 갱신할 최대 영상 수 (50개당 할당량 1 단위)
+REFRESH_LIMIT = 1000
+# 우선순위를 계산할 후보 수 = limit * 배수 (오래 갱신되지 않은 순, 최근 게시 순으로 각각 SQL에서 먼저 추림)
+REFRESH_CANDIDATE_FACTOR = 5
+
+
+def compute_refresh_priority(candidates: pd.DataFrame, now: datetime) -> pd.Series:
+    """갱신 우선순위 계산 (numpy 벡터 연산)
+
+    오래 갱신되지 않았고, 최근 조회수 증가 속도가 빠르고, 게시된 지 얼마 안 된 영상일수록 높다.
+    priority = 경과 시간(h) * (1 + log1p(시간당 조회수 증가)) / sqrt(1 + 영상 나이(일))
+    """
+    staleness_hours = (now - candidates['last_refreshed_at']).dt.total_seconds() / 3600
+    age_days = (now - candidates['published_at']).dt.total_seconds().clip(lower=0) / 86400
+    velocity = candidates['views_per_hour'].fillna(0).clip(lower=0)
+    return staleness_hours * (1 + np.log1p(velocity)) / np.sqrt(1 + age_days)
+
+
+def select_refresh_candidates(
+    db: Session,
+    limit: int = REFRESH_LIMIT,
+    max_age_days: int = REFRESH_MAX_AGE_DAYS,
+    min_interval_hours: int = REFRESH_MIN_INTERVAL_HOURS,
+) -> pd.DataFrame:
+    """우선순위 순으로 통계 갱신 대상 영상 선택
+
+    대상 구간 전체를 읽지 않고, 우선순위를 키우는 두 요인(갱신 후 경과 시간, 영상 나이)별로
+    SQL에서 limit * REFRESH_CANDIDATE_FACTOR개씩 먼저 추린 뒤 그 후보만 조회수 증가 속도를 조회해 점수를 매긴다.
+
+    Returns:
+        id, video_id, priority 컬럼의 DataFrame (우선순위 내림차순)
+    """
+    now = datetime.utcnow()
+    last_refreshed_at = func.coalesce(Video.updated_at, Video.collected_at)
+    eligible = (
+        db.query(
+            Video.id,
+            Video.video_id,
+            Video.published_at,
+            last_refreshed_at.label('last_refreshed_at'),
+        )
+        .filter(
+            Video.published_at >= now - timedelta(days=max_age_days),
+            last_refreshed_at < now - timedelta(hours=min_interval_hours),
+        )
+    )
+    pool_size = limit * REFRESH_CANDIDATE_FACTOR
+    rows = {
+        row.id: row
+        for query in (
+            eligible.order_by(last_refreshed_at, Video.id),
+            eligible.order_by(Video.published_at.desc(), Video.id),
+        )
+        for row in query.limit(pool_size).all()
+    }
+    if not rows:
+        return pd.DataFrame(columns=['id', 'video_id', 'priority'])
+
+    candidates = pd.DataFrame(
+        [rows[pk] for pk in sorted(rows)], columns=['id', 'video_id', 'published_at', 'last_refreshed_at']
+    )
+    candidates['published_at'] = pd.to_datetime(candidates['published_at'])
+    candidates['last_refreshed_at'] = pd.to_datetime(candidates['last_refreshed_at'])
+
+    # 최근 3일 스냅샷 기반 조회수 증가 속도
+    growth = get_view_growth(db, candidates['id'], window_days=3)
+    candidates = candidates.merge(
+        growth[['video_id', 'views_per_hour']].rename(columns={'video_id': 'id'}),
+        on='id',
+        how='left',
+    )
+    candidates['priority'] = compute_refresh_priority(candidates, now)
+    return candidates.nlargest(limit, 'priority')[['id', 'video_id', 'priority']]
+
+
+def refresh_video_statistics(
+    db: Session,
+    limit: int = REFRESH_LIMIT,
+    youtube_service: Optional[YouTubeService] = None,
+) -> Dict[str, int]:
+    """우선순위가 높은 영상의 통계를 Videos API로 재조회하여 일괄 갱신
+
+    Search API(100 단위) 대신 Videos API(50개당 1 단위)만 사용하므로
+    할당량 대비 최신 데이터를 더 많이 확보할 수 있다.
+    """
+    candidates = select_refresh_candidates(db, limit=limit)
+    if candidates.empty:
+        return {"selected": 0, "updated": 0, "api_units": 0}
+
+    youtube_service = youtube_service or YouTubeService()
+    video_ids = candidates['video_id'].tolist()
+    run = start_run(db, category_id=None, mode="refresh")
+    units_before = youtube_service.quota_units_used
+    calls_before = getattr(youtube_service, "api_calls", 0)
+    started = time.perf_counter()
+
+    try:
+        statistics_map = youtube_service.get_video_statistics(video_ids)
+
+        now = datetime.utcnow()
+        update_rows = [
+            {"id": int(pk), "updated_at": now, **statistics_map[vid]}
+            for pk, vid in zip(candidates['id'], candidates['video_id'])
+            if vid in statistics_map
+        ]
+
+        if update_rows:
+            # 기본 키 기준 일괄 UPDATE (executemany) + 스냅샷 일괄 INSERT
+            db.execute(update(Video), update_rows)
+            snapshot_rows = [
+                {
+                    "video_id": row["id"],
+                    "captured_at": now,
+                    "view_count": row["view_count"],
+                    "like_count": row["like_count"],
+                    "comment_count": row["comment_count"],
+                }
+                for row in update_rows
+            ]
+            record_snapshots(db, snapshot_rows)
+
+        api_units = youtube_service.quota_units_used - units_before
+        finish_run(db, run, rows_written=len(update_rows), videos_new=0, api_units=api_units)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        fail_run(db, run, str(e), youtube_service.quota_units_used - units_before)
+        record_collection(
+            "all", "refresh", "failed", time.perf_counter() - started,
+            api_calls=getattr(youtube_service, "api_calls", 0) - calls_before,
+            quota_units=youtube_service.quota_units_used - units_before,
+        )
+        raise
+
+    record_collection(
+        "all", "refresh", "succeeded", time.perf_counter() - started,
+        api_calls=getattr(youtube_service, "api_calls", 0) - calls_before,
+        quota_units=api_units,
+        rows_upserted=len(update_rows),
+    )
+
+    return {
+        "selected": len(video_ids),
+        "updated": len(update_rows),
+        "api_units": api_units,
+    }
@@ -1,12 +1,22 @@
 import os
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .category_registry import DEFAULT_CATEGORIES
+from ..utils.log import get_logger
+
 load_dotenv()
 
+# YouTube Data API 할당량 비용 (호출 1회당 단위)
+SEARCH_QUOTA_COST = 100
+VIDEOS_QUOTA_COST = 1
+# API 기본 URL (비우면 Google 기본값, 오프라인 테스트 시 benchmarks/fake_youtube_api.py 주소 지정)
+YOUTUBE_API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL", "")
+
+log = get_logger("youtube")
+
 
 class YouTubeService:
     def __init__(self):
@@ -14,26 +24,28 @@ class YouTubeService:
         if not self.api_key:
             raise ValueError("YOUTUBE_API_KEY 환경 변수가 설정되지 않았습니다.")
         
-        # googleapiclient로 YouTube API 클라이언트 생성
-        self.youtube = build("youtube", "v3", developerKey=self.api_key)
+        # googleapiclient로 YouTube API 클라이언트 생성 (discovery 모듈은 무거워 사용 시점에 import)
+        from googleapiclient.discovery import build
+
+        client_options = {"api_endpoint": YOUTUBE_API_BASE_URL} if YOUTUBE_API_BASE_URL else None
+        self.youtube = build("youtube", "v3", developerKey=self.api_key, client_options=client_options)
+        # 이 인스턴스가 사용한 API 할당량 (단위)과 호출 수
+        self.quota_units_used = 0
+        self.api_calls = 0
+
+    def _charge(self, units: int) -> None:
+        """API 호출 1회와 할당량 사용 기록"""
+        self.api_calls += 1
+        self.quota_units_used += units
 
     def get_category_query(self, category: str) -> str:
-        """카테고리별 검색 쿼리 생성"""
-        category_queries = {
-            "뷰티": "뷰티 메이크업",
-            "패션": "패션 스타일",
-            "음식": "요리 레시피",
-            "여행": "여행 브이로그",
-            "게임": "게임 플레이",
-            "음악": "음악 뮤직비디오",
-            "스포츠": "스포츠 하이라이트",
-            "교육": "교육 강의",
-        }
-        return category_queries.get(category, category)
+        """카테고리별 기본 검색 쿼리 (레지스트리에 쿼리가 없을 때 사용)"""
+        return DEFAULT_CATEGORIES.get(category, category)
 
     def get_video_view_count(self, video_id: str) -> int:
         """개별 영상의 조회수 가져오기 (예시 코드와 동일)"""
         try:
+            self._charge(VIDEOS_QUOTA_COST)
             video_response = self.youtube.videos().list(
                 part="statistics",
                 id=video_id
@@ -47,7 +59,7 @@ class YouTubeService:
                     return int(view_count)
             return 0
         except HttpError as e:
-            print(f"HTTP Error: {e}")
+            log.warning("YouTube API HTTP 오류", status=e.resp.status, error=str(e))
             return 0
 
     def search_videos(
@@ -73,10 +85,11 @@ class YouTubeService:
             request_params["pageToken"] = page_token
 
         try:
+            self._charge(SEARCH_QUOTA_COST)
             search_response = self.youtube.search().list(**request_params).execute()
             return search_response
         except HttpError as e:
-            print(f"HTTP Error: {e}")
+            log.warning("YouTube API HTTP 오류", status=e.resp.status, error=str(e))
             raise
 
     def get_video_details(self, video_ids: List[str]) -> Dict:
@@ -86,30 +99,64 @@ class YouTubeService:
         for i in range(0, len(video_ids), 50):
             batch = video_ids[i : i + 50]
             try:
+                self._charge(VIDEOS_QUOTA_COST)
                 video_response = self.youtube.videos().list(
                     part="snippet,statistics",
                     id=",".join(batch)
                 ).execute()
                 all_items.extend(video_response.get("items", []))
             except HttpError as e:
-                print(f"HTTP Error: {e}")
+                log.warning("YouTube API HTTP 오류", status=e.resp.status, error=str(e))
                 continue
 
         return {"items": all_items}
 
+    def get_video_statistics(self, video_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        """Videos API로 통계만 일괄 조회 (50개 배치당 할당량 1 단위)
+
+        Returns:
+            video_id -> {"view_count", "like_count", "comment_count"} 매핑 (삭제/비공개 영상은 제외)
+        """
+        statistics_map = {}
+        for i in range(0, len(video_ids), 50):
+            batch = video_ids[i : i + 50]
+            try:
+                self._charge(VIDEOS_QUOTA_COST)
+                video_response = self.youtube.videos().list(
+                    part="statistics",
+                    id=",".join(batch),
+                ).execute()
+            except HttpError as e:
+                log.warning("YouTube API HTTP 오류", status=e.resp.status, error=str(e))
+                continue
+
+            for item in video_response.get("items", []):
+                statistics = item.get("statistics", {})
+                statistics_map[item["id"]] = {
+                    "view_count": int(statistics.get("viewCount", 0)),
+                    "like_count": int(statistics.get("likeCount", 0)),
+                    "comment_count": int(statistics.get("commentCount", 0)),
+                }
+
+        return statistics_map
+
     def search_videos_with_pagination(
         self,
         search_query: str,
         max_results: Optional[int] = None,
         published_after: Optional[datetime] = None,
+        on_page: Optional[Callable[[int, int], None]] = None,
     ) -> List[Dict]:
         """
         검색 쿼리로 모든 영상 수집 (페이지네이션 지원)
         Python 예시 코드와 동일한 구조
+
+        on_page가 주어지면 검색 페이지를 가져올 때마다 (가져온 페이지 수, 누적 영상 수)로 호출한다.
         """
         videos = []
         next_page_token = None
         total_collected = 0
+        pages_fetched = 0
 
         try:
             while True:
@@ -127,8 +174,13 @@ class YouTubeService:
                 if next_page_token:
                     request_params["pageToken"] = next_page_token
 
+                self._charge(SEARCH_QUOTA_COST)
                 search_response = self.youtube.search().list(**request_params).execute()
 
+                pages_fetched += 1
+                if on_page:
+                    on_page(pages_fetched, total_collected)
+
                 items = search_response.get("items", [])
                 if len(items) == 0:
                     break
@@ -185,7 +237,7 @@ class YouTubeService:
 
             return videos
         except HttpError as e:
-            print(f"HTTP Error: {e}")
+            log.warning("YouTube API HTTP 오류", status=e.resp.status, error=str(e))
             return []
 
     def fetch_video_data(
@@ -194,16 +246,21 @@ class YouTubeService:
         max_results: int = 50,
         time_range_days: int = 7,
         published_after: Optional[datetime] = None,
+        query: Optional[str] = None,
+        on_page: Optional[Callable[[int, int], None]] = None,
     ) -> List[Dict]:
-        """카테고리별 영상 데이터 가져오기 (기존 메서드와 호환)"""
-        query = self.get_category_query(category)
+        """카테고리별 영상 데이터 가져오기 (기존 메서드와 호환)
+
+        query가 주어지지 않으면 카테고리 기본 검색 쿼리를 사용한다.
+        """
+        query = query or self.get_category_query(category)
         
         # published_after가 지정되지 않은 경우, time_range_days 기준으로 계산
         if published_after is None:
             published_after = datetime.utcnow() - timedelta(days=time_range_days)
 
         # 페이지네이션을 지원하는 새로운 메서드 사용
-        return self.search_videos_with_pagination(query, max_results, published_after)
+        return self.search_videos_with_pagination(query, max_results, published_after, on_page=on_page)
 
     def search_videos(self, search_query: str, max_results: Optional[int] = None) -> List[Dict]:
         """
@@ -1,17 +1,75 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
+import logging
 import re
-from ..models import Video, Category, Hashtag, VideoHashtag
+from ..services.stats_history import get_view_growth_cached, format_growth
+from ..services.hot_store import hot_store
+from ..services.sketch_store import Sketches, window_sketches
+from .cooccurrence import cooccurrence_index
+from .grouped import group_stats
+from .log import get_logger
+from .metrics import timed_analyzer
+from .profiling import phase
+from .classify import BRAND, CATEGORY_SYNONYMS, CATEGORY_TERM, FOREIGN, HANGUL, SPAM, category_terms, matches_terms
+from .text import clean_keyword
+
+log = get_logger("analysis")
+
+# 해시태그 분석에서 제외할 분류 (수집 시 계산한 플래그, utils/classify.py)
+EXCLUDED_TAG_FLAGS = FOREIGN | SPAM
+# 카테고리별로 추가로 제외할 분류 (여행: 아이돌 홍보 태그)
+CATEGORY_EXCLUDED_TAG_FLAGS = {'여행': BRAND}
+
+
+def _measured_growth(
+    db: Session, key_df: pd.DataFrame, key_col: str, time_range_days: int
+) -> pd.Series:
+    """키(주제/해시태그)별 실측 조회수 성장률 계산 (통계 스냅샷 기반)
+
+    키에 속한 영상들의 기간 내 조회수 증가량 합 / 기준 조회수 합.
+    스냅샷이 2개 이상 쌓이지 않은 키는 결과에서 빠진다.
+    """
+    growth = get_view_growth_cached(db, key_df['video_id'], time_range_days)
+    if growth.empty:
+        return pd.Series(dtype=float)
+    merged = key_df[[key_col, 'video_id']].merge(
+        growth[['video_id', 'base_views', 'view_delta']], on='video_id'
+    )
+    sums = merged.groupby(key_col)[['base_views', 'view_delta']].sum()
+    sums = sums[sums['base_views'] > 0]
+    return sums['view_delta'] / sums['base_views']
+
+
+def _apply_measured_growth(
+    stats: pd.DataFrame, key_col: str, measured: pd.Series
+) -> pd.Series:
+    """실측 성장률이 있는 키는 실측값으로, 없는 키는 기존 추정값으로 growth 컬럼 구성"""
+    if measured.empty:
+        return stats['growth']
+    measured_growth = stats[key_col].map(measured).dropna().map(format_growth)
+    return measured_growth.reindex(stats.index).fillna(stats['growth'])
+
+
+def _covering_sketches(db: Session, category_id: int, time_range_days: int, window_videos: int) -> Optional[Sketches]:
+    """기간의 일별 스케치 병합 (기간 내 영상을 모두 반영한 경우만, 스케치 도입 전 영상이 섞이면 None)
+
+    스케치는 게시일 단위라 cutoff보다 조금 넓은 구간을 덮으므로 영상 수는 저장소 구간 영상 수 이상이어야 한다.
+    """
+    sketches = window_sketches(db, category_id, time_range_days)
+    if sketches.video_count == 0 or sketches.video_count < window_videos:
+        return None
+    return sketches
 
 
+@timed_analyzer
 def calculate_metrics(db: Session, category_name: str, time_range_days: int = 7) -> Dict:
-    """메트릭 카드 데이터 계산 (pandas 활용)"""
-    category = db.query(Category).filter(Category.name == category_name).first()
-    if not category:
+    """메트릭 카드 데이터 계산 (pandas 활용, 인메모리 저장소 기반)"""
+    phase("store")
+    columns = hot_store.get(db, category_name)
+    if columns is None:
         return {
             "avg_views": "0",
             "trending_topics": 0,
@@ -21,27 +79,10 @@ def calculate_metrics(db: Session, category_name: str, time_range_days: int = 7)
 
     cutoff_date = datetime.utcnow() - timedelta(days=time_range_days)
 
-    # 지정된 기간 내 영상 조회
-    videos = (
-        db.query(Video)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .all()
-    )
-    
-    # 데이터가 부족하면 (10개 미만) 전체 기간 사용
-    if len(videos) < 10:
-        videos = (
-            db.query(Video)
-            .filter(Video.category_id == category.id)
-            .all()
-        )
+    # 지정된 기간 내 영상 (데이터가 부족하면 (10개 미만) 저장소 구간(최근 HOT_STORE_WINDOW_DAYS일) 전체 사용)
+    rows = columns.window_rows(cutoff_date)
 
-    if not videos:
+    if len(rows) == 0:
         return {
             "avg_views": "0",
             "trending_topics": 0,
@@ -50,12 +91,13 @@ def calculate_metrics(db: Session, category_name: str, time_range_days: int = 7)
         }
 
     # pandas DataFrame으로 변환
-    df = pd.DataFrame([{
-        'id': v.id,
-        'view_count': v.view_count,
-        'like_count': v.like_count,
-        'comment_count': v.comment_count,
-    } for v in videos])
+    phase("frame")
+    df = pd.DataFrame({
+        'id': columns.ids[rows],
+        'view_count': columns.view_count[rows],
+        'like_count': columns.like_count[rows],
+        'comment_count': columns.comment_count[rows],
+    })
 
     # 평균 조회수 계산 (numpy 활용)
     avg_views = df['view_count'].mean()
@@ -63,55 +105,25 @@ def calculate_metrics(db: Session, category_name: str, time_range_days: int = 7)
         f"{avg_views / 1000:.1f}K" if avg_views >= 1000 else str(int(avg_views))
     )
 
-    # 고유 해시태그 수
-    hashtag_ids = (
-        db.query(VideoHashtag.hashtag_id)
-        .join(Video)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .distinct()
-        .all()
-    )
-    trending_topics = len(hashtag_ids)
+    phase("aggregate")
+    # 고유 해시태그 수 (기간 내) - 일별 HyperLogLog 스케치 병합으로 근사 (스케치가 없는 기간은 저장소에서 정확히)
+    recent_rows = columns.rows_since(cutoff_date)
+    tag_rows, tag_codes = columns.tag_pairs(recent_rows)
+    sketches = _covering_sketches(db, columns.category_id, time_range_days, len(recent_rows))
+    if sketches is not None:
+        trending_topics = int(round(sketches.tag_hll.estimate()))
+    else:
+        trending_topics = len(np.unique(tag_codes))
 
     # 추천 해시태그 수 (평균 조회수 30K 이상) - pandas로 계산
-    hashtag_video_data = (
-        db.query(
-            Hashtag.tag,
-            Video.view_count,
-        )
-        .join(VideoHashtag, VideoHashtag.hashtag_id == Hashtag.id)
-        .join(Video, Video.id == VideoHashtag.video_id)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .all()
-    )
-    
-    # 데이터가 부족하면 전체 기간 사용
-    if len(hashtag_video_data) < 10:
-        hashtag_video_data = (
-            db.query(
-                Hashtag.tag,
-                Video.view_count,
-            )
-            .join(VideoHashtag, VideoHashtag.hashtag_id == Hashtag.id)
-            .join(Video, Video.id == VideoHashtag.video_id)
-            .filter(Video.category_id == category.id)
-            .all()
-        )
-
-    if hashtag_video_data:
-        hashtag_df = pd.DataFrame(hashtag_video_data)
-        hashtag_avg_views = hashtag_df.groupby('tag')['view_count'].mean()
-        recommended_hashtags = (hashtag_avg_views >= 30000).sum()
+    # 데이터가 부족하면 저장소 구간(최근 HOT_STORE_WINDOW_DAYS일) 전체 사용
+    if len(tag_codes) < 10:
+        tag_rows, tag_codes = columns.tag_pairs(columns.all_rows())
+
+    if len(tag_codes) > 0:
+        # 태그 문자열과 코드가 1:1이므로 코드로 바로 묶음
+        hashtag_groups = group_stats(tag_codes, {'view_count': columns.view_count[tag_rows]})
+        recommended_hashtags = (hashtag_groups.mean['view_count'] >= 30000).sum()
     else:
         recommended_hashtags = 0
 
@@ -119,53 +131,41 @@ def calculate_metrics(db: Session, category_name: str, time_range_days: int = 7)
         "avg_views": avg_views_formatted,
         "trending_topics": trending_topics,
         "recommended_hashtags": int(recommended_hashtags),
-        "total_videos": len(videos),
+        "total_videos": len(rows),
     }
 
 
+@timed_analyzer
 def analyze_trends(
     db: Session, category_name: str, time_range_days: int = 7
 ) -> Tuple[List[Dict], List[Dict]]:
-    """트렌드 데이터 분석 (pandas/numpy 활용)"""
-    category = db.query(Category).filter(Category.name == category_name).first()
-    if not category:
+    """트렌드 데이터 분석 (pandas/numpy 활용, 인메모리 저장소 기반)"""
+    phase("store")
+    columns = hot_store.get(db, category_name)
+    if columns is None:
         return [], []
 
     cutoff_date = datetime.utcnow() - timedelta(days=time_range_days)
 
-    # 지정된 기간 내 영상 조회
-    videos = (
-        db.query(Video)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .all()
-    )
-    
-    # 데이터가 부족하면 (10개 미만) 전체 기간 사용
-    if len(videos) < 10:
-        videos = (
-            db.query(Video)
-            .filter(Video.category_id == category.id)
-            .all()
-        )
+    # 지정된 기간 내 영상 (데이터가 부족하면 (10개 미만) 저장소 구간(최근 HOT_STORE_WINDOW_DAYS일) 전체 사용)
+    rows = columns.window_rows(cutoff_date)
 
-    if not videos:
+    if len(rows) == 0:
         return [], []
 
     # pandas DataFrame으로 변환
-    df = pd.DataFrame([{
-        'published_at': v.published_at,
-        'view_count': v.view_count,
-        'like_count': v.like_count,
-        'comment_count': v.comment_count,
-        'title': v.title,
-    } for v in videos])
+    phase("frame")
+    df = pd.DataFrame({
+        'id': columns.ids[rows],
+        'published_at': columns.published_at[rows],
+        'view_count': columns.view_count[rows],
+        'like_count': columns.like_count[rows],
+        'comment_count': columns.comment_count[rows],
+        'title': columns.titles[rows],
+    })
 
     # 시간 범위에 따른 데이터 그룹화 (pandas 활용)
+    phase("aggregate")
     now = datetime.utcnow()
     # days_ago 계산: 음수는 0으로, time_range_days 초과는 time_range_days로 클리핑
     df['days_ago'] = (now - df['published_at']).dt.days
@@ -191,14 +191,19 @@ def analyze_trends(
         # 정렬을 위한 순서 매핑 (오래된 날짜가 작은 값)
         period_order = {"이번 주": 5, "1주 전": 4, "2주 전": 3, "3주 전": 2, "4주 전": 1}
 
-    # 기간별 집계 (pandas groupby)
-    period_stats = df.groupby('period').agg({
-        'view_count': ['sum', 'count'],
-        'like_count': 'sum',
-        'comment_count': 'sum',
-    }).reset_index()
-
-    period_stats.columns = ['date', 'total_views', 'videos', 'total_likes', 'total_comments']
+    # 기간별 집계
+    period_groups = group_stats(df['period'].to_numpy(), {
+        'view_count': df['view_count'].to_numpy(),
+        'like_count': df['like_count'].to_numpy(),
+        'comment_count': df['comment_count'].to_numpy(),
+    })
+    period_stats = pd.DataFrame({
+        'date': period_groups.keys,
+        'total_views': period_groups.sum['view_count'],
+        'videos': period_groups.count,
+        'total_likes': period_groups.sum['like_count'],
+        'total_comments': period_groups.sum['comment_count'],
+    })
     
     # 7일 기준: 데이터가 없는 날짜도 포함 (0으로 채움)
     if time_range_days == 7:
@@ -247,93 +252,73 @@ def analyze_trends(
             return '메이크업 / makeup'
         return normalized
     
-    all_words = []
-    word_videos = []
-    original_words_map = {}  # 정규화된 단어 -> 원본 단어들 집합
-    
-    for idx, row in df.iterrows():
-        words = row['title'].split()
-        for word in words:
-            # 원본 단어 저장
-            original_word = word.lstrip('#').strip()
-            original_word = re.sub(r'[^\w\s가-힣]', '', original_word).strip()
-            
-            if len(original_word) > 1:
-                # 정규화된 단어
-                normalized_word = normalize_topic(original_word)
-                
-                # 원본 단어들을 맵에 저장
-                if normalized_word not in original_words_map:
-                    original_words_map[normalized_word] = set()
-                original_words_map[normalized_word].add(original_word)
-                
-                all_words.append(normalized_word)
-                word_videos.append({'word': normalized_word, 'view_count': row['view_count']})
-
-    if word_videos:
-        word_df = pd.DataFrame(word_videos)
-        word_stats = word_df.groupby('word').agg({
-            'view_count': ['count', 'mean']
-        }).reset_index()
-        word_stats.columns = ['topic', 'count', 'avg_views']
+    phase("tokenize")
+    # 제목 토큰은 저장소에 사전 코드로 들어 있으므로 정제/정규화는 고유 토큰마다 한 번만 수행
+    token_rows, token_codes = columns.token_pairs(rows)
+    unique_codes, inverse = np.unique(token_codes, return_inverse=True)
+    token_values = columns.token_values()
+    token_flags = columns.token_flags()
+    original_words = [
+        re.sub(r'[^\w\s가-힣]', '', token_values[code].lstrip('#').strip()).strip()
+        for code in unique_codes
+    ]
+    normalized_words = np.array(
+        [normalize_topic(word) if len(word) > 1 else None for word in original_words], dtype=object
+    )
+    original_words_map = {}  # 정규화된 단어 -> {원본 단어: 분류 플래그}
+    for code, original_word, normalized_word in zip(unique_codes, original_words, normalized_words):
+        if normalized_word is not None:
+            original_words_map.setdefault(normalized_word, {})[original_word] = int(token_flags[code])
+
+    # 정규화된 주제 코드 (길이가 1 이하인 단어는 -1로 제외)
+    valid_tokens = np.array([w is not None for w in normalized_words], dtype=bool)
+    topic_labels, topic_of_token = np.unique(normalized_words[valid_tokens], return_inverse=True)
+    token_topics = np.full(len(unique_codes), -1, dtype=np.int64)
+    token_topics[valid_tokens] = topic_of_token
+    occurrence_topics = token_topics[inverse]
+    valid = occurrence_topics >= 0
+    word_df = pd.DataFrame({
+        'word': topic_labels[occurrence_topics[valid]],
+        'video_id': columns.ids[token_rows[valid]],
+        'view_count': columns.view_count[token_rows[valid]],
+    })
+
+    if not word_df.empty:
+        word_groups = group_stats(
+            occurrence_topics[valid], {'view_count': word_df['view_count'].to_numpy()}, labels=topic_labels
+        )
+        word_stats = pd.DataFrame({
+            'topic': word_groups.keys,
+            'count': word_groups.count,
+            'avg_views': word_groups.mean['view_count'],
+        })
 
         # 최소 3회 이상 언급된 주제만
         word_stats = word_stats[word_stats['count'] >= 3].copy()
 
-        # 성장률 계산 (numpy 활용)
+        # 성장률 계산: 통계 스냅샷이 있으면 실측값, 없으면 평균 조회수 기반 추정값 (numpy 활용)
         word_stats['growth'] = np.where(
             word_stats['avg_views'] > 10000, '+45%',
             np.where(word_stats['avg_views'] > 5000, '+30%', '+15%')
         )
+        phase("growth")
+        word_stats['growth'] = _apply_measured_growth(
+            word_stats, 'topic', _measured_growth(db, word_df, 'word', time_range_days)
+        )
+
+        phase("score")
+        # 카테고리 이름/동의어와 부분 일치하는 주제 제외
+        # 토큰 사전에 넣을 때 계산한 CATEGORY_TERM 플래그가 있는 단어만 이 카테고리의 용어와 비교한다
+        # (동의어 표에 없는 카테고리는 이름과 직접 비교)
+        exclusion_terms = category_terms(category_name)
+        registered = category_name in CATEGORY_SYNONYMS
 
-        # 카테고리 이름과 영어 번역 매핑
-        category_exclusions = {
-            '뷰티': ['뷰티', 'beauty', 'beauty tip', 'beautytips'],
-            '패션': ['패션', 'fashion', '패션스타일', 'fashionstyle', 'fashion style'],
-            '음식': ['음식', 'food', '맛집'],
-            '여행': ['여행', 'travel', 'trip', 'tour', '관광', 'tourism', 'traveling'],
-            '게임': ['게임', 'game', 'games', 'gaming', '게이밍'],
-            '음악': ['음악', 'music', 'song', 'songs', '뮤직'],
-            '스포츠': ['스포츠', 'sports', 'sport', '운동', 'athletic', 'athletics'],
-            '교육': ['교육', 'education', 'learn', 'learning', 'study', 'studying']
-        }
-        
-        # 카테고리 이름과 영어 번역 제외
-        exclusion_list = category_exclusions.get(category_name, [])
-        # 대소문자 구분 없이 비교하기 위해 소문자로 변환
-        exclusion_list_lower = [ex.lower().strip() for ex in exclusion_list]
-        # 카테고리 이름 자체도 추가
-        exclusion_list_lower.append(category_name.lower())
-        
-        # 제외할 주제 필터링 (더 강력한 필터링)
         def should_exclude(topic_key: str) -> bool:
-            if not topic_key:
-                return False
-            topic_lower = topic_key.lower().strip()
-            
-            # 1. 정규화된 주제 키 직접 확인
-            if topic_lower in exclusion_list_lower:
-                return True
-            
-            # 2. 부분 일치 확인 (카테고리 이름이 포함된 경우)
-            for exclusion in exclusion_list_lower:
-                if exclusion in topic_lower or topic_lower in exclusion:
-                    return True
-            
-            # 3. 원본 단어들 확인
-            original_words = original_words_map.get(topic_key, {topic_key})
-            for word in original_words:
-                word_lower = word.lower().strip()
-                if word_lower in exclusion_list_lower:
-                    return True
-                # 부분 일치 확인
-                for exclusion in exclusion_list_lower:
-                    if exclusion in word_lower or word_lower in exclusion:
-                        return True
-            
-            return False
-        
-        # 제외할 주제 필터링
+            return any(
+                (flags & CATEGORY_TERM or not registered) and matches_terms(word.lower().strip(), exclusion_terms)
+                for word, flags in original_words_map.get(topic_key, {}).items()
+            )
+
         word_stats_filtered = word_stats[~word_stats['topic'].apply(should_exclude)].copy()
         
         if len(word_stats_filtered) > 0:
@@ -374,9 +359,9 @@ def analyze_trends(
         for row in word_stats_filtered:
             topic_key = row['topic']
             # 원본 단어들 가져오기
-            original_words = original_words_map.get(topic_key, {topic_key})
-            # 중복 제거 및 정렬 (한글 우선, 그 다음 영문)
-            unique_words = sorted(list(original_words), key=lambda x: (not bool(re.search(r'[가-힣]', x)), x.lower()))
+            original_words = original_words_map.get(topic_key, {topic_key: 0})
+            # 정렬 (한글이 들어간 단어 우선, 그 다음 영문)
+            unique_words = sorted(original_words, key=lambda x: (not original_words[x] & HANGUL, x.lower()))
             
             # 표시 형식: 여러 단어가 있으면 ' / '로 연결
             if len(unique_words) > 1:
@@ -395,122 +380,72 @@ def analyze_trends(
     return trend_data, trending_topics
 
 
+@timed_analyzer
 def analyze_hashtags(
     db: Session, category_name: str, time_range_days: int = 7
 ) -> Tuple[List[Dict], Dict]:
-    """해시태그 효과 분석 (pandas/numpy 활용)"""
-    category = db.query(Category).filter(Category.name == category_name).first()
-    if not category:
+    """해시태그 효과 분석 (pandas/numpy 활용, 인메모리 저장소 기반)"""
+    phase("store")
+    columns = hot_store.get(db, category_name)
+    if columns is None:
         return [], {"tags": [], "expected_views": "0", "correlation": "낮음"}
 
     cutoff_date = datetime.utcnow() - timedelta(days=time_range_days)
 
-    # 카테고리별 제외할 해시태그 패턴 (포함된 문자열) - 먼저 정의
-    category_hashtag_pattern_exclusions = {
-        # 필요시 다른 카테고리 패턴 제외 추가 가능
-    }
+    # 해시태그별 통계 데이터 (영상-해시태그 쌍)
+    phase("frame")
+    tag_rows, tag_codes = columns.tag_pairs(columns.rows_since(cutoff_date))
 
-    # 해시태그별 통계 데이터 가져오기
-    hashtag_video_data = (
-        db.query(
-            Hashtag.tag,
-            Video.view_count,
-            Video.like_count,
-        )
-        .join(VideoHashtag, VideoHashtag.hashtag_id == Hashtag.id)
-        .join(Video, Video.id == VideoHashtag.video_id)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .all()
-    )
-    
-    # 데이터가 부족하면 (10개 미만) 전체 기간 사용
-    if len(hashtag_video_data) < 10:
-        hashtag_video_data = (
-            db.query(
-                Hashtag.tag,
-                Video.view_count,
-                Video.like_count,
-            )
-            .join(VideoHashtag, VideoHashtag.hashtag_id == Hashtag.id)
-            .join(Video, Video.id == VideoHashtag.video_id)
-            .filter(Video.category_id == category.id)
-            .all()
-        )
-    
-    # 데이터를 가져온 직후 필터링 적용 (가장 빠른 단계)
-    original_count = len(hashtag_video_data)
-    if category_name in category_hashtag_pattern_exclusions:
-        exclusion_patterns = category_hashtag_pattern_exclusions[category_name]
-        filtered_data = []
-        excluded_tags = []
-        for tag, view_count, like_count in hashtag_video_data:
-            tag_clean = str(tag).lstrip('#').lower()  # str()로 변환하여 안전하게 처리
-            should_exclude = False
-            for pattern in exclusion_patterns:
-                if pattern.lower() in tag_clean:
-                    should_exclude = True
-                    excluded_tags.append(tag)
-                    break
-            if not should_exclude:
-                filtered_data.append((tag, view_count, like_count))
-        hashtag_video_data = filtered_data
-        print(f"[필터링] {category_name} 카테고리: {original_count}개 -> {len(hashtag_video_data)}개 (제외된 태그: {excluded_tags[:5]})")
-
-    if not hashtag_video_data:
-        return [], {"tags": [], "expected_views": "0", "correlation": "낮음"}
+    # 데이터가 부족하면 (10개 미만) 저장소 구간(최근 HOT_STORE_WINDOW_DAYS일) 전체 사용
+    if len(tag_codes) < 10:
+        tag_rows, tag_codes = columns.tag_pairs(columns.all_rows())
 
     # pandas DataFrame으로 변환 (컬럼 이름 명시)
-    df = pd.DataFrame(hashtag_video_data, columns=['tag', 'view_count', 'like_count'])
-
-    # 해시태그별 집계 (pandas groupby)
-    hashtag_stats = df.groupby('tag').agg({
-        'view_count': ['mean', 'count'],
-        'like_count': 'mean',
-    }).reset_index()
+    df = pd.DataFrame({
+        'tag': columns.tag_values()[tag_codes],
+        'tag_code': tag_codes,
+        'video_id': columns.ids[tag_rows],
+        'view_count': columns.view_count[tag_rows],
+        'like_count': columns.like_count[tag_rows],
+    })
+
+    if df.empty:
+        return [], {"tags": [], "expected_views": "0", "correlation": "낮음"}
 
-    hashtag_stats.columns = ['tag', 'avg_views', 'video_count', 'avg_likes']
+    phase("aggregate")
+    # 해시태그별 집계 (태그 코드로 묶고 그룹 순서는 태그 문자열 순)
+    tag_groups = group_stats(
+        df['tag_code'].to_numpy(),
+        {'view_count': df['view_count'].to_numpy(), 'like_count': df['like_count'].to_numpy()},
+        labels=columns.tag_values(),
+    )
+    hashtag_stats = pd.DataFrame({
+        'tag': tag_groups.keys,
+        'avg_views': tag_groups.mean['view_count'],
+        'video_count': tag_groups.count,
+        'avg_likes': tag_groups.mean['like_count'],
+    })
 
     # 최소 2개 이상의 영상에 사용된 태그만
     hashtag_stats_all = hashtag_stats[hashtag_stats['video_count'] >= 2].copy()
 
-    # 카테고리별 제외할 해시태그 목록 (정확히 일치하는 태그)
-    category_hashtag_exclusions = {
-        '뷰티': ['may阿may之美', 'may阿may美妆', 'may阿may频道', 'may阿may风格', '专业教程', '个性妆容', '创意妆容', '化妆技巧', '大胆手法', '实用教程', '时尚之美。', '时尚妆容'],
-        '여행': ['A-NA', 'CARMEN', 'Hearts2Hearts', 'IAN', 'JIWOO', 'JUUN', 'STELLA', 'YE-ON', 'YUHA', '스텔라', '에이나', '예온', '유하', '이안', '주은', '지우', '카르멘', '하츠투하츠']
-    }
-    
-    # 해당 카테고리의 제외 목록이 있으면 필터링 (정확히 일치)
-    if category_name in category_hashtag_exclusions:
-        exclusion_tags = category_hashtag_exclusions[category_name]
-        # 대소문자 구분 없이 비교
-        exclusion_tags_lower = [tag.lower() for tag in exclusion_tags]
-        hashtag_stats_all = hashtag_stats_all[
-            ~hashtag_stats_all['tag'].str.lower().isin(exclusion_tags_lower)
-        ].copy()
-    
-    # 해당 카테고리의 패턴 제외 목록이 있으면 필터링 (문자열 포함) - 추가 안전장치
-    if category_name in category_hashtag_pattern_exclusions:
-        exclusion_patterns = category_hashtag_pattern_exclusions[category_name]
-        # 대소문자 구분 없이 패턴이 포함된 태그 제외
-        # 태그를 문자열로 변환 후 비교 (더 강력한 필터링)
-        for pattern in exclusion_patterns:
-            pattern_lower = pattern.lower()
-            # 태그를 문자열로 변환 후 '#' 제거하고 비교
-            mask = hashtag_stats_all['tag'].astype(str).str.lstrip('#').str.lower().str.contains(pattern_lower, na=False)
-            excluded_count = mask.sum()
-            if excluded_count > 0:
-                excluded_tags_list = hashtag_stats_all[mask]['tag'].tolist()
-                print(f"[필터링-추가] {category_name} 카테고리에서 '{pattern}' 패턴 제외: {excluded_count}개 태그 제외됨 (예: {excluded_tags_list[:3]})")
-            hashtag_stats_all = hashtag_stats_all[~mask].copy()
+    # 외국어/스팸 태그와 카테고리별 제외 분류 (태그 코드별 플래그 비트 검사)
+    excluded_flags = EXCLUDED_TAG_FLAGS | CATEGORY_EXCLUDED_TAG_FLAGS.get(category_name, 0)
+    group_codes = hashtag_stats_all['tag'].map(columns.vocabularies["tags"].codes).to_numpy(dtype=np.int64)
+    excluded = (columns.tag_flags()[group_codes] & excluded_flags) != 0
+    if excluded.any():
+        # 요청마다 반복되는 메시지라 카테고리별로 표본만 기록
+        log.sampled(
+            f"analysis.filter.{category_name}", 100, "분류 플래그 제외 필터링", level=logging.DEBUG,
+            category=category_name, excluded=int(excluded.sum()),
+            examples=hashtag_stats_all['tag'][excluded].head(5).tolist(),
+        )
+        hashtag_stats_all = hashtag_stats_all[~excluded].copy()
 
     if len(hashtag_stats_all) == 0:
         return [], {"tags": [], "expected_views": "0", "correlation": "낮음"}
 
+    phase("score")
     # 전체 카테고리의 평균 참여율 계산 (기준점)
     category_avg_engagement = (df['like_count'].sum() / df['view_count'].sum()) * 100 if df['view_count'].sum() > 0 else 0
     
@@ -550,9 +485,14 @@ def analyze_hashtags(
             np.where(hashtag_stats_all['avg_views'] >= category_avg_views * 0.8, 8, 5)))
         )
     
-    # 성장률 포맷팅
+    phase("growth")
+    # 성장률 포맷팅 (통계 스냅샷이 있는 태그는 실측 성장률로 대체)
     hashtag_stats_all['growth'] = '+' + hashtag_stats_all['growth_percent'].round(0).astype(int).astype(str) + '%'
+    hashtag_stats_all['growth'] = _apply_measured_growth(
+        hashtag_stats_all, 'tag', _measured_growth(db, df, 'tag', time_range_days)
+    )
 
+    phase("select")
     # 전체 해시태그의 참여율 범위 계산 (정규화 기준으로 사용)
     all_min_engagement = hashtag_stats_all['engagement_rate'].min()
     all_max_engagement = hashtag_stats_all['engagement_rate'].max()
@@ -623,33 +563,9 @@ def analyze_hashtags(
     # 최소값 0.5, 최대값 0.95로 클리핑 (안전장치)
     hashtag_stats['correlation'] = np.clip(hashtag_stats['correlation'], 0.5, 0.95)
 
-    # 최종 결과 생성 전에 다시 한 번 필터링 (안전장치)
-    if category_name in category_hashtag_pattern_exclusions:
-        exclusion_patterns = category_hashtag_pattern_exclusions[category_name]
-        for pattern in exclusion_patterns:
-            pattern_lower = pattern.lower()
-            mask = hashtag_stats['tag'].astype(str).str.lstrip('#').str.lower().str.contains(pattern_lower, na=False)
-            excluded_count = mask.sum()
-            if excluded_count > 0:
-                excluded_tags = hashtag_stats[mask]['tag'].tolist()
-                print(f"[필터링-최종전] {category_name}: '{pattern}' 패턴으로 {excluded_count}개 제외: {excluded_tags}")
-            hashtag_stats = hashtag_stats[~mask].copy()
-
     hashtag_data = []
     for _, row in hashtag_stats.iterrows():
         tag_str = str(row['tag']).lstrip('#')
-        # 최종 필터링: "may"가 포함된 태그는 제외
-        if category_name in category_hashtag_pattern_exclusions:
-            exclusion_patterns = category_hashtag_pattern_exclusions[category_name]
-            should_exclude = False
-            for pattern in exclusion_patterns:
-                if pattern.lower() in tag_str.lower():
-                    should_exclude = True
-                    print(f"[필터링-최종] 제외된 태그: {tag_str} (패턴: {pattern})")
-                    break
-            if should_exclude:
-                continue
-        
         hashtag_data.append({
             # 태그에서 기존 '#' 제거 후 다시 추가 (중복 방지)
             "tag": f"#{tag_str}",
@@ -659,23 +575,6 @@ def analyze_hashtags(
             "video_count": int(row['video_count']),
         })
 
-    # 추천 해시태그 조합 생성 전에 다시 한 번 필터링 (이중 안전장치)
-    if category_name in category_hashtag_pattern_exclusions:
-        exclusion_patterns = category_hashtag_pattern_exclusions[category_name]
-        filtered_hashtag_data = []
-        for h in hashtag_data:
-            tag_without_hash = h["tag"].lstrip('#').lower()
-            should_exclude = False
-            for pattern in exclusion_patterns:
-                if pattern.lower() in tag_without_hash:
-                    should_exclude = True
-                    print(f"[필터링-추천전] 제외된 태그: {h['tag']} (패턴: {pattern})")
-                    break
-            if not should_exclude:
-                filtered_hashtag_data.append(h)
-        hashtag_data = filtered_hashtag_data
-        print(f"[필터링-최종] {category_name} 카테고리: 최종 {len(hashtag_data)}개 해시태그 반환")
-
     # 추천 해시태그 조합 - 통계적 유의성 기반 동적 선택
     if len(hashtag_data) > 0:
         # 통계적 유의성 기준으로 필터링:
@@ -704,6 +603,29 @@ def analyze_hashtags(
         combination_views = np.mean([h["avg_views"] for h in top_tags_list])
         avg_correlation = np.mean([h["correlation"] for h in top_tags_list])
 
+        phase("combinations")
+        # 실제로 함께 쓰인 조합이 있으면 그 조합과 해당 영상들의 평균 조회수 사용
+        # (상위 태그를 기준으로 동시 출현 인덱스에서 조회, 분석 기간과 제외 목록 적용)
+        index = cooccurrence_index(columns)
+        allowed_codes = np.array(
+            [code for code in (index.tag_code(t) for t in hashtag_stats_all['tag']) if code is not None],
+            dtype=np.int64,
+        )
+        for anchor in top_tags:
+            combinations = index.best_tag_sets(
+                anchor,
+                max_size=max(2, len(top_tags)),
+                rows=np.unique(tag_rows),
+                allowed=allowed_codes,
+                limit=1,
+            )
+            if combinations:
+                combination_tags, _, combination_views = combinations[0]
+                top_tags = list(combination_tags)
+                correlations = {h["tag"].lstrip('#'): h["correlation"] for h in hashtag_data}
+                avg_correlation = np.mean([correlations.get(t, 0.5) for t in top_tags])
+                break
+
         recommended = {
             # 태그에서 기존 '#' 제거 후 다시 추가 (중복 방지)
             "tags": [f"#{tag.lstrip('#')}" for tag in top_tags],
@@ -718,35 +640,31 @@ def analyze_hashtags(
     return hashtag_data, recommended
 
 
+@timed_analyzer
 def get_wordcloud_data(
     db: Session, category_name: str, time_range_days: int = 7, max_words: int = 20
 ) -> List[Dict]:
-    """워드클라우드용 해시태그 빈도 데이터 조회"""
-    category = db.query(Category).filter(Category.name == category_name).first()
-    if not category:
+    """워드클라우드용 해시태그 빈도 데이터 조회 (인메모리 저장소 기반)"""
+    phase("store")
+    columns = hot_store.get(db, category_name)
+    if columns is None:
         return []
 
     cutoff_date = datetime.utcnow() - timedelta(days=time_range_days)
 
-    # 해시태그별 빈도 계산
-    hashtag_counts = (
-        db.query(
-            Hashtag.tag,
-            func.count(VideoHashtag.video_id).label('frequency')
-        )
-        .join(VideoHashtag, VideoHashtag.hashtag_id == Hashtag.id)
-        .join(Video, Video.id == VideoHashtag.video_id)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .group_by(Hashtag.tag)
-        .order_by(func.count(VideoHashtag.video_id).desc())
-        .limit(max_words)
-        .all()
-    )
+    # 해시태그별 빈도 계산 (빈도 내림차순, 같으면 태그 순)
+    phase("aggregate")
+    recent_rows = columns.rows_since(cutoff_date)
+    sketches = _covering_sketches(db, columns.category_id, time_range_days, len(recent_rows))
+    if sketches is not None:
+        # 일별 Count-Min/상위 K 스케치 병합으로 근사 (조인/그룹 집계 없이 일 수만큼 병합)
+        hashtag_counts = sketches.tags.top(max_words)
+    else:
+        _, tag_codes = columns.tag_pairs(recent_rows)
+        codes, frequencies = np.unique(tag_codes, return_counts=True)
+        counts_df = pd.DataFrame({'tag': columns.tag_values()[codes], 'frequency': frequencies})
+        counts_df = counts_df.sort_values(['frequency', 'tag'], ascending=[False, True]).head(max_words)
+        hashtag_counts = list(counts_df.itertuples(index=False, name=None))
 
     if not hashtag_counts:
         return []
@@ -768,46 +686,33 @@ def get_wordcloud_data(
     return wordcloud_data
 
 
+@timed_analyzer
 def analyze_title_patterns(
     db: Session, category_name: str, time_range_days: int = 7
 ) -> Tuple[List[Dict], List[Dict], str]:
-    """제목 패턴 분석 (pandas/numpy 활용)"""
-    category = db.query(Category).filter(Category.name == category_name).first()
-    if not category:
+    """제목 패턴 분석 (pandas/numpy 활용, 인메모리 저장소 기반)"""
+    phase("store")
+    columns = hot_store.get(db, category_name)
+    if columns is None:
         return [], [], ""
 
     cutoff_date = datetime.utcnow() - timedelta(days=time_range_days)
 
-    # 지정된 기간 내 영상 조회
-    videos = (
-        db.query(Video)
-        .filter(
-            and_(
-                Video.category_id == category.id,
-                Video.published_at >= cutoff_date,
-            )
-        )
-        .all()
-    )
-    
-    # 데이터가 부족하면 (10개 미만) 전체 기간 사용
-    if len(videos) < 10:
-        videos = (
-            db.query(Video)
-            .filter(Video.category_id == category.id)
-            .all()
-        )
+    # 지정된 기간 내 영상 (데이터가 부족하면 (10개 미만) 저장소 구간(최근 HOT_STORE_WINDOW_DAYS일) 전체 사용)
+    rows = columns.window_rows(cutoff_date)
 
-    if not videos:
+    if len(rows) == 0:
         return [], [], ""
 
     # pandas DataFrame으로 변환
-    df = pd.DataFrame([{
-        'title': v.title,
-        'view_count': v.view_count,
-    } for v in videos])
+    phase("frame")
+    df = pd.DataFrame({
+        'title': columns.titles[rows],
+        'view_count': columns.view_count[rows],
+    })
 
     # 패턴 분석 (pandas/numpy 활용)
+    phase("patterns")
     patterns_data = []
 
     # 숫자 포함
@@ -868,23 +773,32 @@ def analyze_title_patterns(
     # 효과적인 키워드 분석 (pandas 활용)
     positive_keywords = ['꿀팁', '추천', '완벽', '최고', '솔직', '신상', '꿀템']
     
-    all_keywords = []
-    for _, row in df.iterrows():
-        words = row['title'].split()
-        for word in words:
-            clean_word = ''.join(c for c in word if c.isalnum() or ord(c) >= 0xAC00)
-            if len(clean_word) > 1:
-                all_keywords.append({
-                    'word': clean_word,
-                    'view_count': row['view_count'],
-                })
-
-    if all_keywords:
-        keyword_df = pd.DataFrame(all_keywords)
-        keyword_stats = keyword_df.groupby('word').agg({
-            'view_count': ['count', 'mean']
-        }).reset_index()
-        keyword_stats.columns = ['word', 'frequency', 'avg_views']
+    # 고유 토큰마다 한 번만 정제 (한글/영숫자만 남김)
+    phase("tokenize")
+    token_rows, token_codes = columns.token_pairs(rows)
+    unique_codes, inverse = np.unique(token_codes, return_inverse=True)
+    token_values = columns.token_values()
+    clean_words = np.array([clean_keyword(token_values[code]) for code in unique_codes], dtype=object)
+    # 정제된 키워드 코드 (길이가 1 이하인 키워드는 -1로 제외)
+    valid_tokens = np.array([len(word) > 1 for word in clean_words], dtype=bool)
+    keyword_labels, keyword_of_token = np.unique(clean_words[valid_tokens], return_inverse=True)
+    token_keywords = np.full(len(unique_codes), -1, dtype=np.int64)
+    token_keywords[valid_tokens] = keyword_of_token
+    occurrence_keywords = token_keywords[inverse]
+    valid = occurrence_keywords >= 0
+
+    phase("score")
+    if valid.any():
+        keyword_groups = group_stats(
+            occurrence_keywords[valid],
+            {'view_count': columns.view_count[token_rows[valid]]},
+            labels=keyword_labels,
+        )
+        keyword_stats = pd.DataFrame({
+            'word': keyword_groups.keys,
+            'frequency': keyword_groups.count,
+            'avg_views': keyword_groups.mean['view_count'],
+        })
 
         # 최소 5회 이상 언급된 키워드만
         keyword_stats = keyword_stats[keyword_stats['frequency'] >= 5].copy()
@@ -0,0 +1,133 @@
+import re
+from typing import Dict, List
+
+from .text import hashtag_key
+
+# 분류 비트 플래그 (hashtags.flags, videos.title_flags, 저장소의 제목 토큰 사전)
+# 포함된 문자 체계
+HANGUL = 1 << 0
+LATIN = 1 << 1
+HAN = 1 << 2
+KANA = 1 << 3
+OTHER_SCRIPT = 1 << 4
+# 주 언어 (문자 체계로 추정, 글자가 있으면 하나만)
+LANG_KO = 1 << 5
+LANG_EN = 1 << 6
+LANG_ZH = 1 << 7
+LANG_JA = 1 << 8
+LANG_OTHER = 1 << 9
+# 패턴
+SPAM = 1 << 10  # URL, 맞구독 요청, (해시태그) 같은 글자 반복
+BRAND = 1 << 11  # 브랜드/인물명 (BRAND_TERMS)
+CATEGORY_TERM = 1 << 12  # 카테고리 이름/동의어와 부분 일치 (CATEGORY_SYNONYMS)
+
+# 한국어/영어가 아닌 주 언어
+FOREIGN = LANG_ZH | LANG_JA | LANG_OTHER
+
+# 카테고리 이름과 동의어 (영어 번역 등, 소문자)
+CATEGORY_SYNONYMS: Dict[str, List[str]] = {
+    '뷰티': ['뷰티', 'beauty', 'beauty tip', 'beautytips'],
+    '패션': ['패션', 'fashion', '패션스타일', 'fashionstyle', 'fashion style'],
+    '음식': ['음식', 'food', '맛집'],
+    '여행': ['여행', 'travel', 'trip', 'tour', '관광', 'tourism', 'traveling'],
+    '게임': ['게임', 'game', 'games', 'gaming', '게이밍'],
+    '음악': ['음악', 'music', 'song', 'songs', '뮤직'],
+    '스포츠': ['스포츠', 'sports', 'sport', '운동', 'athletic', 'athletics'],
+    '교육': ['교육', 'education', 'learn', 'learning', 'study', 'studying'],
+}
+
+# 브랜드/인물명 해시태그 (정규화 키)
+BRAND_TERMS = frozenset(hashtag_key(term) for term in [
+    # 하츠투하츠 (여행 카테고리에 대량으로 붙는 아이돌 홍보 태그)
+    'Hearts2Hearts', '하츠투하츠', 'A-NA', 'CARMEN', 'IAN', 'JIWOO', 'JUUN', 'STELLA', 'YE-ON', 'YUHA',
+    '스텔라', '에이나', '예온', '유하', '이안', '주은', '지우', '카르멘',
+])
+
+_SPAM_PATTERN = re.compile(
+    r"https?://|www\.|\.(?:com|net|kr|cn)\b|sub4sub|follow4follow|like4like|맞구독|맞팔", re.IGNORECASE
+)
+# 같은 글자 6번 이상 반복 (해시태그만, 제목의 'ㅋㅋㅋ' 등은 흔함)
+_REPEAT_PATTERN = re.compile(r"(.)\1{5,}")
+_ALL_CATEGORY_TERMS = sorted({
+    term for name, synonyms in CATEGORY_SYNONYMS.items() for term in [name.lower(), *synonyms]
+})
+
+
+def _script(char: str) -> int:
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return HANGUL
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+        return KANA
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0xF900 <= code <= 0xFAFF or code >= 0x20000:
+        return HAN
+    if not char.isalpha():
+        return 0
+    if code < 0x250 or 0x1E00 <= code <= 0x1EFF:
+        return LATIN
+    return OTHER_SCRIPT
+
+
+def classify_text(text: str) -> int:
+    """포함된 문자 체계와 주 언어 플래그
+
+    가나가 있으면 일본어, 한자만 있고 한글이 없으면 중국어, 나머지는 글자 수가 가장 많은 문자 체계로 정한다.
+    """
+    counts: Dict[int, int] = {}
+    for char in text or "":
+        script = _script(char)
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return 0
+    flags = 0
+    for script in counts:
+        flags |= script
+    if KANA in counts:
+        return flags | LANG_JA
+    if HAN in counts and HANGUL not in counts:
+        return flags | LANG_ZH
+    hangul, latin, other = counts.get(HANGUL, 0), counts.get(LATIN, 0), counts.get(OTHER_SCRIPT, 0)
+    if hangul >= latin and hangul >= other:
+        return flags | LANG_KO
+    return flags | (LANG_EN if latin >= other else LANG_OTHER)
+
+
+def matches_terms(word: str, terms: List[str]) -> bool:
+    """단어(소문자)가 용어 중 하나를 포함하거나 용어에 포함되는지"""
+    return any(term in word or word in term for term in terms) if word else False
+
+
+def category_terms(category_name: str) -> List[str]:
+    """카테고리 이름과 동의어 (소문자)"""
+    return [term.lower().strip() for term in CATEGORY_SYNONYMS.get(category_name, [])] + [category_name.lower()]
+
+
+def classify_tag(tag: str) -> int:
+    """해시태그 분류 (문자 체계/주 언어, 스팸, 브랜드/인물명, 카테고리 동의어)"""
+    key = hashtag_key(tag)
+    flags = classify_text(key)
+    if _SPAM_PATTERN.search(key) or _REPEAT_PATTERN.search(key):
+        flags |= SPAM
+    if key in BRAND_TERMS:
+        flags |= BRAND
+    if len(key) > 1 and matches_terms(key, _ALL_CATEGORY_TERMS):
+        flags |= CATEGORY_TERM
+    return flags
+
+
+def classify_title(title: str) -> int:
+    """영상 제목 분류 (문자 체계/주 언어, 스팸)"""
+    flags = classify_text(title)
+    if title and _SPAM_PATTERN.search(title):
+        flags |= SPAM
+    return flags
+
+
+def classify_term(token: str) -> int:
+    """제목 토큰 분류 ('#'/구두점을 뗀 단어 기준 문자 체계/주 언어, 카테고리 동의어)"""
+    word = re.sub(r'[^\w\s가-힣]', '', (token or "").lstrip('#').strip()).strip()
+    flags = classify_text(word)
+    if len(word) > 1 and matches_terms(word.lower(), _ALL_CATEGORY_TERMS):
+        flags |= CATEGORY_TERM
+    return flags
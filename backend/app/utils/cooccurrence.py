@@ -0,0 +1,249 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .text import hashtag_key
+
+# 쌍 생성 시 한 번에 처리하는 영상 수 (영상당 태그 k개 -> k^2 쌍이므로 메모리 상한)
+PAIR_CHUNK_ROWS = 5000
+# 조합 확장 시 태그 하나당 검사하는 동시 출현 상대 수 (조회수 순 상위)
+PARTNER_CANDIDATES = 50
+# 조합 크기별로 다음 단계로 넘기는 후보 수
+BEAM_WIDTH = 10
+
+_SHIFT = np.int64(32)
+_LOW_MASK = np.int64((1 << 32) - 1)
+
+
+def _ragged_arange(lengths: np.ndarray) -> np.ndarray:
+    """[0..l0), [0..l1), ... 를 이어 붙인 배열"""
+    total = int(lengths.sum())
+    return np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+
+def _tag_pairs(indptr: np.ndarray, codes: np.ndarray, rows: np.ndarray, views: np.ndarray):
+    """영상별 해시태그의 모든 순서쌍 (대각 포함) 키와 쌍별 조회수
+
+    키는 (행 태그 << 32) | 열 태그로, 정렬하면 행 우선 순서(CSR)가 된다.
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    # 항목(영상의 태그 하나)마다 같은 영상의 태그 수만큼 반복
+    entry_starts = np.repeat(starts, lengths)
+    entry_lengths = np.repeat(lengths, lengths)
+    entry_views = np.repeat(views[rows], lengths)
+    entries = entry_starts + _ragged_arange(lengths)
+
+    left = codes[np.repeat(entries, entry_lengths)].astype(np.int64)
+    right = codes[np.repeat(entry_starts, entry_lengths) + _ragged_arange(entry_lengths)].astype(np.int64)
+    return (left << _SHIFT) | right, np.repeat(entry_views, entry_lengths)
+
+
+def _aggregate(keys: np.ndarray, counts: np.ndarray, view_sums: np.ndarray):
+    """같은 키끼리 합산 (키 정렬 결과)"""
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return (
+        unique_keys,
+        np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int64),
+        np.bincount(inverse, weights=view_sums, minlength=len(unique_keys)).astype(np.int64),
+    )
+
+
+def _pair_delta(indptr, codes, rows, views, sign: int):
+    """행 묶음의 쌍 기여분 (sign=-1이면 제거분)"""
+    parts = []
+    for begin in range(0, len(rows), PAIR_CHUNK_ROWS):
+        keys, pair_views = _tag_pairs(indptr, codes, rows[begin:begin + PAIR_CHUNK_ROWS], views)
+        if len(keys):
+            parts.append(_aggregate(keys, np.ones(len(keys), dtype=np.int64), pair_views))
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    keys, counts, view_sums = _aggregate(*(np.concatenate(part) for part in zip(*parts)))
+    return keys, counts * sign, view_sums * sign
+
+
+class CooccurrenceIndex:
+    """카테고리 해시태그 동시 출현 행렬 (희소, 대칭) + 태그별 영상 목록
+
+    - 행렬: 정렬된 키 배열(행 태그 << 32 | 열 태그)과 같은 순서의 영상 수/조회수 합.
+      키가 행 우선으로 정렬되어 있어 태그 X의 행은 이진 탐색 두 번으로 잘라낸다 (CSR과 동일).
+      대각 (X, X)는 태그 X 자체의 영상 수/조회수 합이다.
+    - 태그별 영상 목록: 해시태그 CSR을 뒤집은 것 (태그 -> 행 번호, 오름차순)
+
+    행렬은 태그 사전 코드 기준이라 인메모리 저장소가 증분 갱신될 때 바뀐 영상의 기여분만 빼고 더하며,
+    태그별 영상 목록은 행 번호가 바뀌므로 새 열 객체에서 다시 만든다 (정렬 한 번).
+    """
+
+    def __init__(self, columns, keys: np.ndarray, counts: np.ndarray, view_sums: np.ndarray):
+        self.columns = columns
+        self.keys = keys
+        self.counts = counts
+        self.view_sums = view_sums
+        n_tags = len(columns.vocabularies["tags"].values)
+        order = np.argsort(columns.tag_codes, kind="stable")
+        owners = np.repeat(np.arange(len(columns)), np.diff(columns.tag_indptr))
+        self._posting_rows = owners[order]
+        self._posting_indptr = np.zeros(n_tags + 1, dtype=np.int64)
+        self._posting_indptr[1:] = np.cumsum(np.bincount(columns.tag_codes, minlength=n_tags))
+        self._key_codes: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def build(cls, columns) -> "CooccurrenceIndex":
+        """열 객체 전체로 새로 구성"""
+        keys, counts, view_sums = _pair_delta(
+            columns.tag_indptr, columns.tag_codes, columns.all_rows(), columns.view_count, 1
+        )
+        return cls(columns, keys, counts, view_sums)
+
+    def updated(self, columns, changed_ids: np.ndarray) -> "CooccurrenceIndex":
+        """증분 갱신된 열 객체에 맞춘 새 인덱스 (기존 인덱스는 그대로 두어 읽는 쪽과 겹치지 않음)
+
+        이전 열에서 사라졌거나 바뀐 영상의 기여분을 빼고, 새 열에서 바뀐 영상의 기여분을 더한다.
+        """
+        old = self.columns
+        removed = np.flatnonzero(~np.isin(old.ids, columns.ids) | np.isin(old.ids, changed_ids))
+        added = np.flatnonzero(np.isin(columns.ids, changed_ids))
+        deltas = [
+            _pair_delta(old.tag_indptr, old.tag_codes, removed, old.view_count, -1),
+            _pair_delta(columns.tag_indptr, columns.tag_codes, added, columns.view_count, 1),
+        ]
+        delta_keys, delta_counts, delta_views = _aggregate(
+            *(np.concatenate(part) for part in zip(*deltas))
+        )
+
+        # 기존 키는 제자리에서 더하고, 새 키만 정렬 위치에 끼워 넣음 (전체 재정렬 없음)
+        keys, counts, view_sums = self.keys, self.counts.copy(), self.view_sums.copy()
+        positions = np.searchsorted(keys, delta_keys)
+        exists = positions < len(keys)
+        exists[exists] = keys[positions[exists]] == delta_keys[exists]
+        counts[positions[exists]] += delta_counts[exists]
+        view_sums[positions[exists]] += delta_views[exists]
+        new = ~exists
+        keys = np.insert(keys, positions[new], delta_keys[new])
+        counts = np.insert(counts, positions[new], delta_counts[new])
+        view_sums = np.insert(view_sums, positions[new], delta_views[new])
+
+        live = counts > 0
+        return CooccurrenceIndex(columns, keys[live], counts[live], view_sums[live])
+
+    @property
+    def nnz(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.keys.nbytes + self.counts.nbytes + self.view_sums.nbytes
+            + self._posting_rows.nbytes + self._posting_indptr.nbytes
+        )
+
+    def tag_code(self, tag: str) -> Optional[int]:
+        """태그 코드 (저장된 표기와 다르면 정규화 키로 찾음, 예: 'Makeup' -> 'makeup')"""
+        vocabulary = self.columns.vocabularies["tags"]
+        code = vocabulary.codes.get(tag)
+        if code is not None:
+            return code
+        if self._key_codes is None:
+            # 이 인덱스를 만들 때의 사전 범위만 (공유 사전은 이후에도 커질 수 있음)
+            key_codes: Dict[str, int] = {}
+            for code, value in enumerate(vocabulary.values[:len(self._posting_indptr) - 1]):
+                key_codes.setdefault(hashtag_key(value), code)
+            self._key_codes = key_codes
+        return self._key_codes.get(hashtag_key(tag))
+
+    def postings(self, code: int) -> np.ndarray:
+        """태그가 붙은 행 번호 (오름차순)"""
+        if code + 1 >= len(self._posting_indptr):
+            return np.empty(0, dtype=np.int64)
+        return self._posting_rows[self._posting_indptr[code]:self._posting_indptr[code + 1]]
+
+    def row(self, code: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """태그 X와 함께 쓰인 태그들 (상대 태그 코드, 동시 출현 영상 수, 조회수 합, 대각 포함)"""
+        base = np.int64(code) << _SHIFT
+        lo, hi = np.searchsorted(self.keys, [base, base + (np.int64(1) << _SHIFT)])
+        return self.keys[lo:hi] & _LOW_MASK, self.counts[lo:hi], self.view_sums[lo:hi]
+
+    def partners(self, code: int, min_videos: int = 2, allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """동시 출현 영상이 min_videos 이상인 상대 태그 (평균 조회수 내림차순, 최대 PARTNER_CANDIDATES개)"""
+        partners, counts, view_sums = self.row(code)
+        keep = (counts >= min_videos) & (partners != code)
+        if allowed is not None:
+            keep &= np.isin(partners, allowed)
+        partners, counts, view_sums = partners[keep], counts[keep], view_sums[keep]
+        order = np.argsort(-(view_sums / counts), kind="stable")[:PARTNER_CANDIDATES]
+        return partners[order]
+
+    def best_tag_sets(
+        self,
+        tag: str,
+        max_size: int = 3,
+        min_videos: int = 2,
+        limit: int = 10,
+        rows: Optional[np.ndarray] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[Tuple[str, ...], int, float]]:
+        """태그 X를 포함하는 조합 중 평균 조회수가 높은 순
+
+        행렬로 후보를 고르고 (조합의 영상 수는 구성 쌍의 동시 출현 수를 넘을 수 없으므로
+        모든 구성 태그와 min_videos 이상 함께 쓰인 태그만 확장), 실제 값은 태그별 영상 목록의
+        교집합으로 계산한다 (조합마다 행 마스크를 한 번 만들고 상대 태그 목록을 마스크로 거름).
+
+        Args:
+            rows: 대상 행 번호 (오름차순, 분석 기간 제한용 / None이면 저장소 전체 구간)
+            allowed: 조합에 넣을 수 있는 태그 코드 (None이면 전체)
+
+        Returns:
+            [(태그 조합, 영상 수, 평균 조회수)]
+        """
+        code = self.tag_code(tag)
+        if code is None:
+            return []
+        base_rows = self.postings(code)
+        if rows is not None:
+            base_rows = np.intersect1d(base_rows, rows, assume_unique=True)
+
+        views = self.columns.view_count
+        values = self.columns.tag_values()
+        partner_sets = {code: set(self.partners(code, min_videos, allowed).tolist())}
+        beam = [((code,), base_rows)]
+        results = {}
+        for _ in range(max_size - 1):
+            candidates = {}
+            for members, member_rows in beam:
+                shared = set.intersection(*(partner_sets[m] for m in members))
+                member_mask = np.zeros(len(views), dtype=bool)
+                member_mask[member_rows] = True
+                for partner in shared:
+                    combination = tuple(sorted(members + (partner,)))
+                    if combination in candidates or combination in results:
+                        continue
+                    partner_rows = self.postings(partner)
+                    joint = partner_rows[member_mask[partner_rows]]
+                    if len(joint) >= min_videos:
+                        candidates[combination] = joint
+            if not candidates:
+                break
+            scored = sorted(
+                candidates.items(),
+                key=lambda item: (-views[item[1]].mean(), -len(item[1]), item[0]),
+            )
+            for combination, joint in scored:
+                results[combination] = (len(joint), float(views[joint].mean()))
+            beam = scored[:BEAM_WIDTH]
+            for members, _ in beam:
+                for member in members:
+                    if member not in partner_sets:
+                        partner_sets[member] = set(self.partners(member, min_videos, allowed).tolist())
+
+        ranked = sorted(results.items(), key=lambda item: (-item[1][1], -item[1][0], item[0]))[:limit]
+        return [
+            # 조합 안의 순서는 기준 태그 먼저, 나머지는 태그 문자열 순
+            ((tag,) + tuple(sorted(values[m] for m in combination if m != code)), count, avg_views)
+            for combination, (count, avg_views) in ranked
+        ]
+
+
+def cooccurrence_index(columns) -> CooccurrenceIndex:
+    """열 객체에 붙은 인덱스 (없으면 새로 구성해 붙임)"""
+    if columns.cooccurrence is None:
+        columns.cooccurrence = CooccurrenceIndex.build(columns)
+    return columns.cooccurrence
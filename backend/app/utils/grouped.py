@@ -0,0 +1,104 @@
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+def factorize(keys: np.ndarray, labels: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """키를 0부터 시작하는 그룹 코드로 변환
+
+    그룹 순서는 키(또는 labels가 있으면 라벨 문자열)의 정렬 순서로, pandas groupby(sort=True)와 같다.
+
+    Args:
+        keys: 그룹 키 배열 (labels가 있으면 labels에 대한 정수 코드)
+        labels: 코드 -> 라벨 배열 (사전 인코딩된 키를 문자열 순서로 묶을 때 사용)
+
+    Returns:
+        (그룹 코드, 그룹 키) - 그룹 키는 labels가 있으면 라벨 값
+    """
+    if labels is None:
+        codes, unique_keys = pd.factorize(keys, sort=True)
+        return codes, np.asarray(unique_keys)
+
+    # 사전 코드는 범위가 정해져 있으므로 정렬 없이 등장한 코드만 골라 라벨 순서로 번호를 매김
+    present = np.flatnonzero(np.bincount(keys, minlength=len(labels)))
+    present_labels = labels[present]
+    order = np.argsort(present_labels, kind="stable")
+    lookup = np.empty(len(labels), dtype=np.int64)
+    lookup[present[order]] = np.arange(len(present))
+    return lookup[keys], present_labels[order]
+
+
+class GroupedStats:
+    """그룹별 집계 결과 (모든 배열은 keys와 같은 순서)
+
+    - keys: 그룹 키
+    - count: 그룹별 행 수
+    - sum/mean/min/max: 값 컬럼 이름 -> 그룹별 값
+    - percentile: (값 컬럼 이름, q) -> 그룹별 백분위수 (선형 보간, np.percentile과 동일)
+    """
+
+    def __init__(self, keys: np.ndarray, count: np.ndarray):
+        self.keys = keys
+        self.count = count
+        self.sum: Dict[str, np.ndarray] = {}
+        self.mean: Dict[str, np.ndarray] = {}
+        self.min: Dict[str, np.ndarray] = {}
+        self.max: Dict[str, np.ndarray] = {}
+        self.percentile: Dict[Tuple[str, float], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def group_stats(
+    keys: np.ndarray,
+    values: Dict[str, np.ndarray],
+    labels: Optional[np.ndarray] = None,
+    percentiles: Sequence[float] = (),
+    extrema: bool = False,
+) -> GroupedStats:
+    """키별 count/sum/mean (+ 선택적으로 min/max/백분위수)을 한 번에 계산
+
+    count/sum은 그룹 코드에 대한 np.bincount 한 번씩으로 구하고 (정렬 없음),
+    min/max/백분위수를 요청한 경우에만 (코드, 값) 순으로 한 번 정렬해 그룹 경계에서 읽는다.
+    그룹 수에 비례한 파이썬 루프가 없으므로 작은 그룹이 많아도 비용이 일정하다.
+
+    Args:
+        keys: 그룹 키 배열 (factorize 참고)
+        values: 값 컬럼 이름 -> keys와 같은 길이의 배열
+        labels: keys가 사전 코드일 때 코드 -> 라벨 배열
+        percentiles: 계산할 백분위수 (0~100)
+        extrema: min/max 계산 여부
+    """
+    keys = np.asarray(keys)
+    codes, group_keys = factorize(keys, labels)
+    n_groups = len(group_keys)
+    count = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(count) - count
+
+    result = GroupedStats(group_keys, count)
+    for name, column in values.items():
+        column = np.asarray(column)
+        sums = np.bincount(codes, weights=column, minlength=n_groups)
+        if np.issubdtype(column.dtype, np.integer):
+            # 정수 합은 2^53 미만이면 float64에서도 정확
+            sums = sums.astype(np.int64)
+        result.sum[name] = sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result.mean[name] = sums / count
+
+        if not (extrema or percentiles):
+            continue
+        # 그룹 안에서 값까지 정렬 (코드가 1순위, 값이 2순위)
+        within = column[np.lexsort((column, codes))]
+        if extrema:
+            result.min[name] = within[starts]
+            result.max[name] = within[starts + count - 1]
+        within = within.astype(np.float64)
+        for q in percentiles:
+            position = starts + (count - 1) * (q / 100.0)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, starts + count - 1)
+            fraction = position - lower
+            result.percentile[(name, q)] = within[lower] + (within[upper] - within[lower]) * fraction
+    return result
@@ -0,0 +1,151 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator
+
+# 로그 레벨 (DEBUG / INFO / WARNING / ERROR)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 출력 형식 (text: 사람이 읽는 한 줄, json: 한 줄에 JSON 객체 하나)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# 비동기 출력 큐 크기 (가득 차면 새 로그는 버리고 개수만 셈)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+ROOT_LOGGER = "consultube"
+
+# 현재 실행 흐름의 상관관계 필드 (수집 실행 id, 작업 id, 카테고리 등)
+_log_context: ContextVar[Dict[str, object]] = ContextVar("log_context", default={})
+
+_configure_lock = threading.Lock()
+_configured = False
+_sample_lock = threading.Lock()
+_sample_counts: Dict[str, int] = {}
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """호출 스레드에서는 큐에 넣기만 하는 핸들러 (큐가 가득 차면 기다리지 않고 버림)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지/예외는 호출 스레드에서 문자열로 만들고, 상관관계 필드를 함께 담음
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.context = _log_context.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, object]:
+    fields = dict(getattr(record, "context", None) or {})
+    fields.update(getattr(record, "fields", None) or {})
+    return fields
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (ts, level, logger, msg, 상관관계/구조화 필드, exc)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update(_fields(record))
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽는 한 줄 (시각 레벨 [모듈] 메시지 key=value ...)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        name = record.name[len(ROOT_LOGGER) + 1:] if record.name.startswith(ROOT_LOGGER + ".") else record.name
+        line = f"{self.formatTime(record)} {record.levelname} [{name}] {record.getMessage()}"
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+def configure_logging() -> None:
+    """consultube 로거에 비동기(큐) 핸들러 연결 (한 번만, get_logger가 처음 호출될 때 자동 실행)"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+        log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        listener = logging.handlers.QueueListener(log_queue, stream)
+        listener.start()
+        atexit.register(listener.stop)
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(_DroppingQueueHandler(log_queue))
+        root.propagate = False
+        _configured = True
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """키워드 인자를 구조화 필드로 기록하는 로거
+
+    예) log.info("수집 완료", category="뷰티", videos=42)
+    """
+
+    _RESERVED = {"exc_info", "stack_info", "stacklevel", "extra"}
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in self._RESERVED}
+        extra = dict(kwargs.get("extra") or {})
+        extra["fields"] = fields
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+    def sampled(self, key: str, every: int, msg: str, level: int = logging.INFO, **fields) -> None:
+        """같은 key의 메시지는 every번 중 한 번만 기록 (반복 빈도가 높은 메시지용, 누적 횟수 포함)"""
+        if not self.isEnabledFor(level):
+            return
+        with _sample_lock:
+            count = _sample_counts[key] = _sample_counts.get(key, 0) + 1
+        if (count - 1) % max(1, every) == 0:
+            self.log(level, msg, occurrences=count, sample_every=every, **fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """모듈별 로거 (consultube.<name>)"""
+    configure_logging()
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"), {})
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """with 블록 안의 모든 로그에 상관관계 필드 추가 (수집 실행 id, 작업 id 등, 중첩 가능)"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
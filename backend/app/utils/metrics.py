@@ -0,0 +1,274 @@
+import functools
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Prometheus 텍스트 형식 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 기본 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 SQL 문 수 버킷
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# 수집 실행 시간 버킷 (초)
+RUN_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """라벨 조합별 값을 가진 메트릭 (스레드 안전)"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames}가 필요합니다 (받은 값: {sorted(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ] + self.samples()
+
+
+class Counter(_Metric):
+    """누적 카운터"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(_Metric):
+    """현재 값"""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (_bucket/_sum/_count)"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*s[0]], s[1], s[2])) for key, s in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """메트릭 목록 + 수집 시점에 값을 만드는 콜백 (다른 모듈 상태를 읽어 노출할 때 사용)"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP 요청
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "consultube_http_requests_total", "HTTP 요청 수", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "consultube_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route")))
+REQUEST_DB_STATEMENTS = REGISTRY.register(Histogram(
+    "consultube_http_request_db_statements", "요청당 SQL 문 수", ("route",), buckets=STATEMENT_BUCKETS))
+REQUEST_DB_SECONDS = REGISTRY.register(Histogram(
+    "consultube_http_request_db_seconds", "요청당 SQL 실행 시간 합", ("route",)))
+REQUEST_DB_ROWS = REGISTRY.register(Counter(
+    "consultube_http_request_db_rows_total", "요청에서 조회한 행 수 (드라이버가 SELECT 행 수를 알려줄 때만)", ("route",)))
+
+# DB 전체 (요청 밖의 스케줄러/작업 큐 포함)
+DB_STATEMENTS = REGISTRY.register(Counter(
+    "consultube_db_statements_total", "실행한 SQL 문 수"))
+DB_SECONDS = REGISTRY.register(Counter(
+    "consultube_db_seconds_total", "SQL 실행 시간 합"))
+
+# 분석 함수
+ANALYZER_SECONDS = REGISTRY.register(Histogram(
+    "consultube_analyzer_duration_seconds", "분석 함수 전체 실행 시간", ("function",)))
+ANALYZER_COMPUTE_SECONDS = REGISTRY.register(Histogram(
+    "consultube_analyzer_compute_seconds", "분석 함수에서 SQL을 뺀 계산 시간 (pandas/numpy)", ("function",)))
+ANALYZER_PHASE_SECONDS = REGISTRY.register(Histogram(
+    "consultube_analyzer_phase_seconds", "분석 함수 구간별 실행 시간 (저장소 조회, DataFrame 구성, 토큰화, 점수 계산 등)",
+    ("function", "phase")))
+
+# 수집
+COLLECTION_RUNS = REGISTRY.register(Counter(
+    "consultube_collection_runs_total", "수집 실행 수", ("category", "mode", "status")))
+COLLECTION_DURATION = REGISTRY.register(Histogram(
+    "consultube_collection_run_duration_seconds", "수집 실행 시간", ("category", "mode"), buckets=RUN_BUCKETS))
+COLLECTION_API_CALLS = REGISTRY.register(Counter(
+    "consultube_collection_api_calls_total", "YouTube API 호출 수", ("category",)))
+COLLECTION_QUOTA_UNITS = REGISTRY.register(Counter(
+    "consultube_collection_quota_units_total", "사용한 YouTube API 할당량 (단위)", ("category",)))
+COLLECTION_ROWS_UPSERTED = REGISTRY.register(Counter(
+    "consultube_collection_rows_upserted_total", "저장(추가/갱신)한 영상 수", ("category",)))
+COLLECTION_VIDEOS_NEW = REGISTRY.register(Counter(
+    "consultube_collection_videos_new_total", "새로 추가한 영상 수", ("category",)))
+
+
+def _hot_store_metrics() -> List[_Metric]:
+    """인메모리 분석 저장소 카운터 (저장소 모듈이 로드되지 않았으면 생략, import를 유발하지 않음)"""
+    module = sys.modules.get("app.services.hot_store")
+    if module is None:
+        return []
+    stats = module.hot_store.stats()
+    requests = Counter("consultube_hot_store_requests_total", "분석 저장소 조회 수 (hit/load/refresh)", ("result",))
+    requests.inc(stats["hits"], result="hit")
+    requests.inc(stats["loads"], result="load")
+    requests.inc(stats["refreshes"], result="refresh")
+    total = stats["hits"] + stats["loads"] + stats["refreshes"]
+    hit_ratio = Gauge("consultube_hot_store_hit_ratio", "분석 저장소 캐시 적중률")
+    hit_ratio.set(stats["hits"] / total if total else 0.0)
+    category_bytes = Gauge("consultube_hot_store_bytes", "카테고리별 분석 저장소 메모리 사용량", ("category_id",))
+    category_rows = Gauge("consultube_hot_store_rows", "카테고리별 분석 저장소 영상 수", ("category_id",))
+    for category_id, entry in stats["categories"].items():
+        category_bytes.set(entry["bytes"], category_id=category_id)
+        category_rows.set(entry["rows"], category_id=category_id)
+    return [requests, hit_ratio, category_bytes, category_rows]
+
+
+REGISTRY.add_collector(_hot_store_metrics)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, query_stats) -> None:
+    """HTTP 요청 하나의 지연 시간/SQL 통계 기록"""
+    HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+    HTTP_LATENCY.observe(seconds, method=method, route=route)
+    REQUEST_DB_STATEMENTS.observe(query_stats.statements, route=route)
+    REQUEST_DB_SECONDS.observe(query_stats.seconds, route=route)
+    if query_stats.rows:
+        REQUEST_DB_ROWS.inc(query_stats.rows, route=route)
+
+
+def record_collection(
+    category: str,
+    mode: str,
+    status: str,
+    seconds: float,
+    api_calls: int,
+    quota_units: int,
+    rows_upserted: int = 0,
+    videos_new: int = 0,
+) -> None:
+    """수집 실행 하나의 결과 기록"""
+    COLLECTION_RUNS.inc(category=category, mode=mode, status=status)
+    COLLECTION_DURATION.observe(seconds, category=category, mode=mode)
+    COLLECTION_API_CALLS.inc(api_calls, category=category)
+    COLLECTION_QUOTA_UNITS.inc(quota_units, category=category)
+    COLLECTION_ROWS_UPSERTED.inc(rows_upserted, category=category)
+    COLLECTION_VIDEOS_NEW.inc(videos_new, category=category)
+
+
+def timed_analyzer(func: Callable) -> Callable:
+    """분석 함수 실행 시간과 그중 SQL을 뺀 계산 시간 기록 (함수 안에서 profiling.phase()로 구간 구분)"""
+    from .profiling import analyzer_phases
+    from .query_stats import track_queries
+
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with track_queries() as stats, analyzer_phases(name, stats):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                ANALYZER_SECONDS.observe(elapsed, function=name)
+                ANALYZER_COMPUTE_SECONDS.observe(max(0.0, elapsed - stats.seconds), function=name)
+
+    return wrapper
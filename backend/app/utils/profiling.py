@@ -0,0 +1,206 @@
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter as _Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# 요청 프로파일링 (기본값: 끔)
+# - PROFILE_SAMPLE_RATE: 이 비율의 요청을 프로파일링해서 저장 (0~1)
+# - PROFILE_SLOW_MS: 0보다 크면 대상 요청마다 스택 샘플러를 켜 두고, 이 시간보다 오래 걸린 요청만 저장
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+# 스택 샘플링 간격 (밀리초)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# 표본 요청에서 tracemalloc으로 메모리 할당 위치도 기록할지 (할당마다 비용이 들어 느린 요청 감시에는 쓰지 않음)
+PROFILE_TRACEMALLOC = os.getenv("PROFILE_TRACEMALLOC", "false").lower() == "true"
+# 프로파일링 대상 경로 접두사 (쉼표로 구분)
+PROFILE_PATH_PREFIXES = tuple(
+    prefix.strip() for prefix in os.getenv("PROFILE_PATH_PREFIXES", "/api/").split(",") if prefix.strip()
+)
+# tracemalloc 상위 할당 위치 수
+TRACEMALLOC_TOP = 25
+
+# 현재 분석 함수의 구간 타이머 / 현재 요청의 프로파일 수집기
+_current_phases: ContextVar[Optional["PhaseTimer"]] = ContextVar("analyzer_phases", default=None)
+_current_capture: ContextVar[Optional["ProfileCapture"]] = ContextVar("profile_capture", default=None)
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+class PhaseTimer:
+    """분석 함수 안의 구간(저장소 조회, DataFrame 구성, 토큰화, 점수 계산 등)별 실행 시간/SQL 시간
+
+    phase(name)을 호출하면 이전 구간이 끝나고 새 구간이 시작된다.
+    구간 시간은 메트릭 히스토그램에 항상 기록하고, 프로파일 대상 요청이면 프로파일에도 남긴다.
+    """
+
+    def __init__(self, function: str, query_stats):
+        self.function = function
+        self.query_stats = query_stats
+        self.name: Optional[str] = None
+
+    def start(self, name: str) -> None:
+        self.close()
+        self.name = name
+        self.started = time.perf_counter()
+        self.sql_seconds = self.query_stats.seconds
+        self.sql_statements = self.query_stats.statements
+
+    def close(self) -> None:
+        if self.name is None:
+            return
+        from .metrics import ANALYZER_PHASE_SECONDS
+
+        elapsed = time.perf_counter() - self.started
+        ANALYZER_PHASE_SECONDS.observe(elapsed, function=self.function, phase=self.name)
+        capture = _current_capture.get()
+        if capture is not None:
+            capture.spans.append({
+                "function": self.function,
+                "phase": self.name,
+                "ms": round(elapsed * 1000, 3),
+                "sql_ms": round((self.query_stats.seconds - self.sql_seconds) * 1000, 3),
+                "sql_statements": self.query_stats.statements - self.sql_statements,
+            })
+        self.name = None
+
+
+@contextmanager
+def analyzer_phases(function: str, query_stats) -> Iterator[PhaseTimer]:
+    """분석 함수 실행 범위 (timed_analyzer에서 사용, 끝나면 마지막 구간을 닫음)"""
+    timer = PhaseTimer(function, query_stats)
+    token = _current_phases.set(timer)
+    try:
+        yield timer
+    finally:
+        timer.close()
+        _current_phases.reset(token)
+
+
+def phase(name: str) -> None:
+    """현재 분석 함수의 새 구간 시작 (분석 함수 밖에서는 아무 일도 하지 않음)"""
+    timer = _current_phases.get()
+    if timer is not None:
+        timer.start(name)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for marker in ("/site-packages/", "/app/"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            filename = filename[index + 1:]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 읽는 샘플링 프로파일러 (결과: collapsed stack 형식)
+
+    async 라우트는 이벤트 루프 스레드에서 실행되므로, 같은 시간에 처리 중인 다른 요청의
+    스택이 섞일 수 있다 (분석 함수는 동기 코드라 실행 중에는 루프를 점유한다).
+    """
+
+    def __init__(self, thread_id: int, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks: _Counter = _Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope에서 읽을 수 있는 "스택;스택 횟수" 줄 목록"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _start_tracemalloc() -> bool:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            return False  # 다른 도구가 이미 사용 중이면 건드리지 않음
+        if _tracemalloc_users == 0:
+            tracemalloc.start()
+        _tracemalloc_users += 1
+        return True
+
+
+def _stop_tracemalloc() -> List[Dict]:
+    global _tracemalloc_users
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),  # 샘플러 자신의 할당 제외
+    ))
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+    stats = snapshot.statistics("lineno")[:TRACEMALLOC_TOP]
+    return [
+        {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in stats
+    ]
+
+
+class ProfileCapture:
+    """요청 하나의 프로파일 수집 상태 (스택 샘플, 구간 시간, 메모리 할당 위치)"""
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled
+        self.spans: List[Dict] = []
+        self.memory: Optional[List[Dict]] = None
+        self.sampler = StackSampler(threading.get_ident()).start()
+        self._tracing = sampled and PROFILE_TRACEMALLOC and _start_tracemalloc()
+        self._token = _current_capture.set(self)
+
+    def finish(self, seconds: float) -> Optional[str]:
+        """수집 종료, 저장할 이유(sampled/slow) 반환 (저장하지 않으면 None)"""
+        _current_capture.reset(self._token)
+        self.sampler.stop()
+        if self._tracing:
+            self.memory = _stop_tracemalloc()
+        if self.sampled:
+            return "sampled"
+        if PROFILE_SLOW_MS > 0 and seconds * 1000 >= PROFILE_SLOW_MS:
+            return "slow"
+        return None
+
+
+def start_capture(path: str) -> Optional[ProfileCapture]:
+    """요청 프로파일링 시작 여부 결정 (대상이 아니면 None, 설정이 꺼져 있으면 비용 없음)"""
+    if PROFILE_SAMPLE_RATE <= 0 and PROFILE_SLOW_MS <= 0:
+        return None
+    if not path.startswith(PROFILE_PATH_PREFIXES):
+        return None
+    sampled = PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+    if not sampled and PROFILE_SLOW_MS <= 0:
+        return None
+    return ProfileCapture(sampled)
@@ -0,0 +1,121 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .log import get_logger
+
+# 디버그 모드: 요청마다 SQL 문장별 실행 횟수를 세어 같은 문장이 반복되면 경고 (N+1 의심)
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() == "true"
+# 같은 문장이 이 횟수 이상 실행되면 반복으로 간주
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+
+log = get_logger("query")
+
+# 현재 실행 흐름(요청, 분석 함수 등)에서 열려 있는 집계 범위 (중첩 가능)
+_active_scopes: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats_scopes", default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """query_budget 범위에서 허용한 SQL 문 수를 넘음"""
+
+
+class QueryStats:
+    """한 범위 안에서 실행된 SQL 문 수/실행 시간/조회 행 수
+
+    record_statements=True면 문장(파라미터 제외)별 실행 횟수도 센다.
+    executemany는 드라이버 호출 한 번이므로 한 문장으로 센다.
+    """
+
+    def __init__(self, record_statements: bool = False):
+        self.statements = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.statement_counts: Optional[Dict[str, int]] = {} if record_statements else None
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.rows += rows
+        if self.statement_counts is not None:
+            self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """threshold회 이상 실행된 문장과 횟수 (많은 순, record_statements=True일 때만)"""
+        if not self.statement_counts:
+            return []
+        return sorted(
+            ((statement, count) for statement, count in self.statement_counts.items() if count >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def summary(self, limit: int = 5) -> str:
+        """실행 횟수가 많은 문장 요약 (오류/경고 메시지용)"""
+        if not self.statement_counts:
+            return ""
+        top = sorted(self.statement_counts.items(), key=lambda item: -item[1])[:limit]
+        return "\n".join(f"  {count}회: {_shorten(statement)}" for statement, count in top)
+
+
+def _shorten(statement: str, width: int = 160) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= width else statement[:width - 3] + "..."
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """with 블록 안에서 실행된 SQL 집계 (바깥 범위에도 함께 집계됨)
+
+    contextvars 기반이라 같은 요청의 스레드풀 작업에는 전파되고, 다른 요청/스레드와는 섞이지 않는다.
+    """
+    stats = QueryStats(record_statements)
+    token = _active_scopes.set(_active_scopes.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_scopes.reset(token)
+
+
+@contextmanager
+def query_budget(max_statements: int, label: str = "") -> Iterator[QueryStats]:
+    """with 블록의 SQL 문 수가 max_statements를 넘으면 QueryBudgetExceeded (테스트/벤치마크용)
+
+    예) 영상 50개(태그 20개씩) 수집이 SQL 10개 이내인지 확인:
+        with query_budget(10, "collect 50x20"):
+            collector.collect_videos(...)
+    """
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.statements > max_statements:
+        raise QueryBudgetExceeded(
+            f"{label or 'query_budget'}: SQL {stats.statements}개 실행 (허용 {max_statements}개)\n{stats.summary()}"
+        )
+
+
+def warn_repeated(stats: QueryStats, label: str, threshold: int = QUERY_REPEAT_THRESHOLD) -> None:
+    """같은 문장이 threshold회 이상 반복됐으면 경고 로그 (QUERY_DEBUG 모드에서 요청마다 호출)"""
+    for statement, count in stats.repeated(threshold):
+        log.warning("N+1 의심: 같은 SQL 반복 실행", scope=label, count=count, statement=_shorten(statement))
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """엔진에 SQL 실행 이벤트 훅 등록 (열린 집계 범위와 전역 메트릭에 반영)"""
+    from .metrics import DB_SECONDS, DB_STATEMENTS
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started_at", None)
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        # SELECT 행 수는 드라이버가 알려줄 때만 (pymysql 버퍼 커서는 제공, sqlite3는 -1)
+        rows = cursor.rowcount if cursor.description is not None and cursor.rowcount > 0 else 0
+
+        DB_STATEMENTS.inc()
+        DB_SECONDS.inc(elapsed)
+        for stats in _active_scopes.get():
+            stats.record(statement, elapsed, rows)
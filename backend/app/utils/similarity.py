@@ -0,0 +1,219 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .text import clean_keyword
+
+
+def _normalized_labels(values: np.ndarray, codes: np.ndarray, prefix: str, clean: bool) -> np.ndarray:
+    """사전 코드 -> 정규화한 용어 문자열 (코드 종류별로 한 번만 정규화)"""
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    labels = []
+    for value in values[unique_codes]:
+        value = str(value).lstrip('#').lower()
+        if clean:
+            value = clean_keyword(value)
+        labels.append(f"{prefix}{value}" if len(value) > 1 else "")
+    return np.array(labels, dtype=object)[inverse]
+
+
+def _gather(indptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """CSR에서 지정한 행들의 원소 위치 (행 순서대로)"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+def _merge_sorted(n: int, first: Tuple[np.ndarray, ...], second: Tuple[np.ndarray, ...]):
+    """소유자 오름차순인 두 (소유자, 코드, tf) 묶음 -> 소유자별로 first, second 순서인 CSR (indptr, 코드, tf)
+
+    정렬 없이 소유자별 시작 위치만 계산해 제자리에 놓는다 (원소 수에 비례).
+    """
+    counts = [np.bincount(part[0], minlength=n) for part in (first, second)]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(counts[0] + counts[1])
+    codes = np.empty(indptr[-1], dtype=np.int32)
+    tf = np.empty(indptr[-1], dtype=np.int32)
+    for (owners, part_codes, part_tf), part_counts, base in (
+        (first, counts[0], indptr[:-1]),
+        (second, counts[1], indptr[:-1] + counts[0]),
+    ):
+        local_starts = np.cumsum(part_counts) - part_counts
+        destination = base[owners] + np.arange(len(owners)) - local_starts[owners]
+        codes[destination] = part_codes
+        tf[destination] = part_tf
+    return indptr, codes, tf
+
+
+class SimilarityIndex:
+    """카테고리 영상 TF-IDF 희소 행렬 (해시태그 + 정제한 제목 키워드)
+
+    - 용어: 해시태그('#' 제거, 소문자)와 제목 키워드(clean_keyword, 소문자, 2글자 이상)를 구분해 사용
+    - 가중치: tf * (log((1 + N) / (1 + df)) + 1), 영상별 L2 정규화 -> 내적이 코사인 유사도
+    - 저장: 행(영상) 기준 CSR과 열(용어) 기준 CSC에 등장 횟수(tf)를 두고, idf와 영상별 노름은 따로 유지
+
+    조회는 질의 영상의 용어 열들만 모아 가중치를 계산하고 np.bincount로 전체 영상 점수를 한 번에 더한 뒤
+    np.argpartition으로 상위 k개만 고른다 (점수 계산 비용은 질의 용어의 영상 수 합에 비례).
+
+    인메모리 저장소가 적재/증분 갱신할 때 함께 구성/갱신한다. 증분 갱신은 바뀐 영상의 용어만 새로 추출하고
+    나머지 영상의 tf는 행 번호만 바꿔 옮기므로 정렬 없이 원소 수에 비례한다.
+    용어 사전은 추가만 하고 (더 쓰이지 않는 용어는 df 0), 전체 재적재 때 새로 만든다.
+    """
+
+    def __init__(
+        self, columns, terms: List[str], term_codes: Dict[str, int],
+        row_indptr: np.ndarray, row_terms: np.ndarray, row_tf: np.ndarray,
+        col_indptr: np.ndarray, col_rows: np.ndarray, col_tf: np.ndarray,
+    ):
+        self.columns = columns
+        self.terms = terms
+        self._term_codes = term_codes
+        self.row_indptr, self.row_terms, self.row_tf = row_indptr, row_terms, row_tf
+        self.col_indptr, self.col_rows, self.col_tf = col_indptr, col_rows, col_tf
+
+        n_docs = len(columns)
+        self.idf = np.log((1 + n_docs) / (1 + np.diff(col_indptr))) + 1
+        weights = row_tf * self.idf[row_terms]
+        owners = np.repeat(np.arange(n_docs), np.diff(row_indptr))
+        self.norms = np.sqrt(np.bincount(owners, weights=weights * weights, minlength=n_docs))
+        self._id_order = np.argsort(columns.ids)
+
+    @classmethod
+    def build(cls, columns) -> "SimilarityIndex":
+        """열 객체 전체로 새로 구성"""
+        terms: List[str] = []
+        term_codes: Dict[str, int] = {}
+        rows, term_ids, tf = cls._extract(columns, columns.all_rows(), terms, term_codes)
+        n_docs, n_terms = len(columns), len(terms)
+        empty = (np.empty(0, dtype=np.int32),) * 3
+        row_indptr, row_terms, row_tf = _merge_sorted(n_docs, (rows, term_ids, tf), empty)
+        order = np.argsort(term_ids, kind="stable")
+        col_indptr, col_rows, col_tf = _merge_sorted(n_terms, (term_ids[order], rows[order], tf[order]), empty)
+        return cls(columns, terms, term_codes, row_indptr, row_terms, row_tf, col_indptr, col_rows, col_tf)
+
+    def updated(self, columns, changed_ids: np.ndarray) -> "SimilarityIndex":
+        """증분 갱신된 열 객체에 맞춘 새 인덱스 (기존 인덱스는 그대로 두어 읽는 쪽과 겹치지 않음)
+
+        바뀌지 않은 영상의 tf는 행 번호만 바꿔 옮기고, 새로 들어오거나 바뀐 영상만 용어를 추출한다.
+        """
+        n_docs = len(columns)
+        old_rows = self._rows_of(columns.ids)
+        old_rows[np.isin(columns.ids, changed_ids)] = -1
+        kept = np.flatnonzero(old_rows >= 0)
+        new_row_of_old = np.full(len(self.row_indptr) - 1, -1, dtype=np.int32)
+        new_row_of_old[old_rows[kept]] = kept
+
+        rows, term_ids, tf = self._extract(columns, np.flatnonzero(old_rows < 0), self.terms, self._term_codes)
+        n_terms = len(self.terms)
+
+        # 행 기준: 남은 영상은 새 행 번호 순서대로 기존 원소를 옮기고, 추출한 영상을 더함
+        positions = _gather(self.row_indptr, old_rows[kept])
+        kept_owners = np.repeat(kept, np.diff(self.row_indptr)[old_rows[kept]])
+        row_indptr, row_terms, row_tf = _merge_sorted(
+            n_docs,
+            (kept_owners, self.row_terms[positions], self.row_tf[positions]),
+            (rows, term_ids, tf),
+        )
+
+        # 열 기준: 기존 원소 중 남은 영상만 행 번호를 바꿔 유지하고 (용어 순서 유지), 추출한 원소를 용어 순으로 더함
+        col_terms = np.repeat(np.arange(len(self.col_indptr) - 1, dtype=np.int32), np.diff(self.col_indptr))
+        col_rows = new_row_of_old[self.col_rows]
+        live = col_rows >= 0
+        order = np.argsort(term_ids, kind="stable")
+        col_indptr, col_rows, col_tf = _merge_sorted(
+            n_terms,
+            (col_terms[live], col_rows[live], self.col_tf[live]),
+            (term_ids[order], rows[order], tf[order]),
+        )
+        return SimilarityIndex(
+            columns, self.terms, self._term_codes,
+            row_indptr, row_terms, row_tf, col_indptr, col_rows, col_tf,
+        )
+
+    @staticmethod
+    def _extract(columns, rows: np.ndarray, terms: List[str], term_codes: Dict[str, int]):
+        """지정한 행들의 (행 번호, 용어 코드, tf) (행 -> 용어 순 정렬, 새 용어는 사전에 추가)"""
+        tag_rows, tag_codes = columns.tag_pairs(rows)
+        token_rows, token_codes = columns.token_pairs(rows)
+        doc_rows = np.concatenate([tag_rows, token_rows]).astype(np.int64)
+        labels = np.concatenate([
+            _normalized_labels(columns.tag_values(), tag_codes, "#", clean=False),
+            _normalized_labels(columns.token_values(), token_codes, "", clean=True),
+        ])
+        keep = labels != ""
+        local_ids, local_terms = pd.factorize(labels[keep])
+        mapping = np.empty(len(local_terms), dtype=np.int64)
+        for i, term in enumerate(local_terms):
+            code = term_codes.get(term)
+            if code is None:
+                code = term_codes[term] = len(terms)
+                terms.append(term)
+            mapping[i] = code
+
+        # (영상, 용어)별 등장 횟수 -> 정렬된 키가 곧 행 우선 순서
+        n_terms = max(len(terms), 1)
+        keys, tf = np.unique(doc_rows[keep] * n_terms + mapping[local_ids], return_counts=True)
+        return keys // n_terms, keys % n_terms, tf.astype(np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.row_indptr, self.row_terms, self.row_tf, self.col_indptr, self.col_rows, self.col_tf,
+            self.idf, self.norms, self._id_order,
+        )
+        return sum(a.nbytes for a in arrays)
+
+    def _rows_of(self, video_pks: np.ndarray) -> np.ndarray:
+        """videos.id 배열 -> 행 번호 배열 (없으면 -1)"""
+        ids = self.columns.ids
+        if len(ids) == 0:
+            return np.full(len(video_pks), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(ids, video_pks, sorter=self._id_order), len(ids) - 1)
+        rows = self._id_order[positions]
+        return np.where(ids[rows] == video_pks, rows, -1).astype(np.int64)
+
+    def row_of(self, video_pk: int) -> Optional[int]:
+        """videos.id -> 행 번호 (저장소 구간에 없으면 None)"""
+        row = int(self._rows_of(np.array([video_pk], dtype=np.int64))[0])
+        return row if row >= 0 else None
+
+    def similar(self, row: int, k: int = 10) -> List[Tuple[int, float, List[str]]]:
+        """행과 코사인 유사도가 높은 영상 상위 k개
+
+        Returns:
+            [(행 번호, 유사도, 공통 용어 (질의 쪽 가중치 순 최대 5개))]
+        """
+        start, end = self.row_indptr[row], self.row_indptr[row + 1]
+        query_terms = self.row_terms[start:end]
+        if len(query_terms) == 0:
+            return []
+        query_weights = self.row_tf[start:end] * self.idf[query_terms] / self.norms[row]
+
+        # 질의 용어 열들의 (영상, 가중치)를 이어 붙여 영상별로 합산 (희소 행렬-벡터 곱)
+        slices = [slice(self.col_indptr[t], self.col_indptr[t + 1]) for t in query_terms]
+        doc_rows = np.concatenate([self.col_rows[s] for s in slices])
+        products = np.concatenate([
+            self.col_tf[s] * (self.idf[t] * w) for s, t, w in zip(slices, query_terms, query_weights)
+        ]) / self.norms[doc_rows]
+        scores = np.bincount(doc_rows, weights=products, minlength=len(self.row_indptr) - 1)
+        scores[row] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        query_order = query_terms[np.argsort(-query_weights, kind="stable")]
+        results = []
+        for candidate in candidates:
+            candidate_terms = self.row_terms[self.row_indptr[candidate]:self.row_indptr[candidate + 1]]
+            shared = query_order[np.isin(query_order, candidate_terms)][:5]
+            results.append((int(candidate), float(scores[candidate]), [str(self.terms[t]) for t in shared]))
+        return results
+
+
+def similarity_index(columns) -> SimilarityIndex:
+    """열 객체에 붙은 TF-IDF 인덱스 (저장소가 적재/갱신 때 붙여 두며, 저장소 비활성 시에만 여기서 구성)"""
+    if columns.similarity is None:
+        columns.similarity = SimilarityIndex.build(columns)
+    return columns.similarity
@@ -0,0 +1,203 @@
+import hashlib
+import heapq
+import json
+import math
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# HyperLogLog 레지스터 수 = 2^HLL_PRECISION (상대 표준 오차 1.04 / sqrt(2^p) ≈ 1.6%)
+HLL_PRECISION = 12
+# Count-Min 크기 (추정 오차 <= e / width * 전체 개수, 확률 1 - e^-depth 이상)
+CMS_WIDTH = 1024
+CMS_DEPTH = 4
+# 상위 K 후보 수
+TOPK_CAPACITY = 100
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash128(item: str) -> Tuple[int, int]:
+    """문자열의 64비트 해시 두 개 (프로세스와 무관하게 항상 같은 값)"""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class HyperLogLog:
+    """고유 개수 추정 (병합 = 레지스터별 최대값)"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    def add(self, item: str) -> None:
+        h, _ = _hash128(item)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # 작은 개수 보정 (linear counting)
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    @property
+    def relative_error(self) -> float:
+        """상대 표준 오차"""
+        return 1.04 / math.sqrt(self.m)
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(self.registers.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes], precision: int = HLL_PRECISION) -> "HyperLogLog":
+        if not data:
+            return cls(precision)
+        registers = np.frombuffer(zlib.decompress(data), dtype=np.uint8).copy()
+        return cls(precision, registers)
+
+
+class CountMinSketch:
+    """빈도 추정 (과대 추정만 발생, 병합 = 카운터 합)"""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH, counts: Optional[np.ndarray] = None):
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+
+    def _indexes(self, item: str) -> np.ndarray:
+        h1, h2 = _hash128(item)
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)], dtype=np.int64)
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.counts[self._rows, self._indexes(item)] += count
+
+    def estimate(self, item: str) -> int:
+        return int(self.counts[self._rows, self._indexes(item)].min())
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.counts += other.counts
+
+    @property
+    def total(self) -> int:
+        """추가된 전체 개수"""
+        return int(self.counts[0].sum())
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    @property
+    def max_overcount(self) -> int:
+        """확률 1 - delta 이상으로 보장되는 최대 과대 추정량 (epsilon * 전체 개수)"""
+        return int(math.ceil(self.epsilon * self.total))
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(self.counts.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes], width: int = CMS_WIDTH, depth: int = CMS_DEPTH) -> "CountMinSketch":
+        if not data:
+            return cls(width, depth)
+        counts = np.frombuffer(zlib.decompress(data), dtype=np.uint32).reshape(depth, width).copy()
+        return cls(width, depth, counts)
+
+
+class TopK:
+    """빈도 상위 K개 후보 (최소 힙 + 지연 삭제)
+
+    counts가 기준이고, 힙에는 갱신 전 값이 남아 있을 수 있어 꺼낼 때 현재 값과 비교한다.
+    """
+
+    def __init__(self, capacity: int = TOPK_CAPACITY, counts: Optional[Dict[str, int]] = None):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = dict(counts or {})
+        self._heap: List[Tuple[int, str]] = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def offer(self, item: str, count: int) -> None:
+        """항목의 (추정) 빈도 반영 - 용량을 넘으면 가장 작은 항목 제거"""
+        if item not in self.counts and len(self.counts) >= self.capacity:
+            smallest = self._peek_smallest()
+            if smallest is not None and count <= smallest[0]:
+                return
+        self.counts[item] = count
+        heapq.heappush(self._heap, (count, item))
+        while len(self.counts) > self.capacity:
+            smallest = self._peek_smallest()
+            heapq.heappop(self._heap)
+            del self.counts[smallest[1]]
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _peek_smallest(self) -> Optional[Tuple[int, str]]:
+        while self._heap:
+            count, item = self._heap[0]
+            if self.counts.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+        return None
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """빈도 내림차순 (같으면 항목 순)"""
+        ordered = sorted(self.counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ordered[:limit] if limit else ordered
+
+    def to_json(self) -> str:
+        return json.dumps(self.counts, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: Optional[str], capacity: int = TOPK_CAPACITY) -> "TopK":
+        return cls(capacity, json.loads(data) if data else None)
+
+
+class HeavyHitters:
+    """Count-Min + 상위 K 후보 (항목을 추가할 때마다 추정 빈도로 후보 갱신)"""
+
+    def __init__(self, cms: Optional[CountMinSketch] = None, topk: Optional[TopK] = None):
+        self.cms = cms or CountMinSketch()
+        self.topk = topk or TopK()
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.cms.add(item, count)
+        self.topk.offer(item, self.cms.estimate(item))
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def merge_all(cls, sketches: List["HeavyHitters"], capacity: int = TOPK_CAPACITY) -> "HeavyHitters":
+        """여러 구간 병합 - 후보 합집합을 병합된 Count-Min으로 다시 추정해 상위 K개만 유지"""
+        merged = cls(topk=TopK(capacity))
+        candidates = set()
+        for sketch in sketches:
+            merged.cms.merge(sketch.cms)
+            candidates.update(sketch.topk.counts)
+        for item in candidates:
+            merged.topk.offer(item, merged.cms.estimate(item))
+        return merged
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        return self.topk.items(limit)
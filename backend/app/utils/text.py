@@ -0,0 +1,32 @@
+import unicodedata
+from typing import List
+
+
+def clean_keyword(word: str) -> str:
+    """제목 단어에서 영숫자/한글만 남김 (제목 키워드 분석 기준)"""
+    return ''.join(c for c in word if c.isalnum() or ord(c) >= 0xAC00)
+
+
+def hashtag_key(tag: str) -> str:
+    """해시태그 정규화 키 (NFC, '#'/앞뒤 공백 제거, casefold) - 표기만 다른 태그를 하나로 묶는 기준"""
+    key = unicodedata.normalize("NFC", tag or "").strip().lstrip("#").strip().casefold()
+    # casefold 결과가 분해형이 될 수 있어 한 번 더 NFC
+    return unicodedata.normalize("NFC", key)
+
+
+def title_keywords(title: str) -> List[str]:
+    """제목을 공백으로 나눠 정제한 키워드 목록 (2글자 이상만)"""
+    keywords = []
+    for word in (title or "").split():
+        keyword = clean_keyword(word)
+        if len(keyword) > 1:
+            keywords.append(keyword)
+    return keywords
+
+
+def title_bigrams(title: str) -> List[str]:
+    """소문자 제목의 글자 2-gram (중복 제거, 등장 순서 유지 / 한 글자 제목은 그 글자 하나)"""
+    text = (title or "").lower()
+    if len(text) < 2:
+        return [text] if text else []
+    return list(dict.fromkeys(text[i:i + 2] for i in range(len(text) - 1)))
@@ -0,0 +1,13 @@
+# YouTube 썸네일 URL 형식 (video_id만으로 결정되므로 DB에 저장하지 않음)
+THUMBNAIL_URL = "https://i.ytimg.com/vi/{video_id}/{file}.jpg"
+# API 썸네일 크기 -> 파일명 (default 120x90, medium 320x180, high 480x360)
+THUMBNAIL_FILES = {
+    "default": "default",
+    "medium": "mqdefault",
+    "high": "hqdefault",
+}
+
+
+def thumbnail_url(video_id: str, size: str = "medium") -> str:
+    """영상 썸네일 URL (size: default / medium / high)"""
+    return THUMBNAIL_URL.format(video_id=video_id, file=THUMBNAIL_FILES[size])
@@ -0,0 +1,66 @@
+from typing import Optional
+import numpy as np
+from .text import title_bigrams
+
+
+class TitleIndex:
+    """제목 글자 2-gram 역색인 (2-gram 코드 -> 행 번호, 오름차순)
+
+    인메모리 저장소 열 객체의 2-gram CSR을 한 번 뒤집어 만든다.
+    키워드의 2-gram 목록을 짧은 것부터 교집합한 뒤, 남은 후보만 실제 제목으로 부분 일치를 확인한다
+    (2-gram이 모두 있어도 순서가 다를 수 있으므로).
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        grams = columns.vocabularies["grams"]
+        n_grams = len(grams.values)
+        order = np.argsort(columns.gram_codes, kind="stable")
+        owners = np.repeat(np.arange(len(columns)), np.diff(columns.gram_indptr))
+        self._rows = owners[order]
+        self._indptr = np.zeros(n_grams + 1, dtype=np.int64)
+        self._indptr[1:] = np.cumsum(np.bincount(columns.gram_codes, minlength=n_grams))
+        self._codes = grams.codes
+
+    def postings(self, gram: str) -> np.ndarray:
+        code = self._codes.get(gram)
+        if code is None or code + 1 >= len(self._indptr):
+            return np.empty(0, dtype=np.int64)
+        return self._rows[self._indptr[code]:self._indptr[code + 1]]
+
+    def search(self, keyword: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """제목에 keyword가 포함된 행 번호 (대소문자 무시, 오름차순)
+
+        Args:
+            rows: 검색 대상 행 번호 (오름차순, None이면 전체)
+        """
+        keyword = keyword.lower()
+        if not keyword:
+            return np.empty(0, dtype=np.int64)
+        if len(keyword) == 1:
+            # 한 글자는 2-gram으로 거를 수 없으므로 대상 전체를 제목으로 확인
+            posting_lists = [rows if rows is not None else self.columns.all_rows()]
+        else:
+            posting_lists = sorted((self.postings(gram) for gram in title_bigrams(keyword)), key=len)
+            if rows is not None:
+                posting_lists[0] = np.intersect1d(posting_lists[0], rows, assume_unique=True)
+
+        candidates = posting_lists[0]
+        for postings in posting_lists[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+
+        if len(keyword) == 2:
+            return candidates
+        titles = self.columns.titles
+        return candidates[np.fromiter(
+            (keyword in titles[row].lower() for row in candidates), dtype=bool, count=len(candidates)
+        )]
+
+
+def title_index(columns) -> TitleIndex:
+    """열 객체에 붙은 제목 역색인 (없으면 새로 구성해 붙임)"""
+    if columns.title_index is None:
+        columns.title_index = TitleIndex(columns)
+    return columns.title_index
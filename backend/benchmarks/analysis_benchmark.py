@@ -0,0 +1,204 @@
+"""분석 함수와 수집 경로 규모별 벤치마크
+
+합성 데이터(benchmarks/synthetic_data.py)를 규모별 카테고리(bench_<rows>)에 적재한 뒤 측정한다.
+
+- 분석 함수: calculate_metrics, analyze_trends, analyze_hashtags, analyze_title_patterns,
+  get_wordcloud_data (30일 구간)
+  - cold: 인메모리 저장소를 비운 직후 첫 호출 (DB 적재 포함)
+  - warm: 이후 반복 호출의 중앙값
+- collect_videos: SyntheticYouTubeService가 만든 신규 영상 --collect-batch개를 저장하는 시간
+  (규모가 클수록 기존 테이블에 대한 조회 비용이 드러남)
+
+결과를 --json으로 저장해 두고 --baseline으로 이전 결과와 비교하면
+--max-regression 배율을 넘게 느려진 항목을 표시하고 종료 코드 1을 반환한다.
+
+사용법:
+    python benchmarks/analysis_benchmark.py [--rows 1000 10000 100000] [--repeat 5]
+        [--database-url sqlite:///bench.db] [--json result.json] [--baseline previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from synthetic_data import SyntheticYouTubeService, generate_videos, load_videos
+
+TIME_RANGE_DAYS = 30
+
+
+def analyzers():
+    from app.utils import analysis
+
+    return {
+        "calculate_metrics": analysis.calculate_metrics,
+        "analyze_trends": analysis.analyze_trends,
+        "analyze_hashtags": analysis.analyze_hashtags,
+        "analyze_title_patterns": analysis.analyze_title_patterns,
+        "get_wordcloud_data": analysis.get_wordcloud_data,
+    }
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def ensure_dataset(db, category_name: str, rows: int, seed: int) -> float:
+    """카테고리에 합성 영상이 rows개 있도록 적재 (이미 있으면 건너뜀), 적재 시간 반환"""
+    from app.models import Category, Video
+
+    existing = (
+        db.query(func.count(Video.id))
+        .join(Category, Category.id == Video.category_id)
+        .filter(Category.name == category_name)
+        .scalar()
+    )
+    if existing >= rows:
+        return 0.0
+    if existing:
+        raise SystemExit(f"{category_name}에 영상이 {existing}개 있습니다 (빈 DB나 같은 규모로 다시 실행하세요).")
+    started = time.perf_counter()
+    load_videos(db, category_name, generate_videos(rows, seed=seed, prefix=f"b{rows}_"))
+    return time.perf_counter() - started
+
+
+def bench_size(Session, rows: int, args) -> list:
+    from app.services.data_collector import DataCollector
+    from app.services.hot_store import hot_store
+
+    category_name = f"bench_{rows}"
+    results = []
+    with Session() as db:
+        load_seconds = ensure_dataset(db, category_name, rows, args.seed)
+        if load_seconds:
+            print(f"[{rows}] 합성 데이터 적재: {load_seconds:.1f}s")
+
+        for name, analyzer in analyzers().items():
+            hot_store.invalidate()
+            cold = timed(analyzer, db, category_name, TIME_RANGE_DAYS)
+            warm = statistics.median(
+                timed(analyzer, db, category_name, TIME_RANGE_DAYS) for _ in range(args.repeat)
+            )
+            results.append({"rows": rows, "name": name, "cold_seconds": cold, "warm_seconds": warm})
+
+        collector = DataCollector(db, youtube_service=SyntheticYouTubeService(
+            batch_size=args.collect_batch, prefix=f"c{rows}_",
+        ))
+        collect_times = [
+            timed(collector.collect_videos, category_name, 7, args.collect_batch, False)
+            for _ in range(args.collect_repeat)
+        ]
+        results.append({
+            "rows": rows,
+            "name": "collect_videos",
+            "cold_seconds": collect_times[0],
+            "warm_seconds": statistics.median(collect_times),
+            "batch_size": args.collect_batch,
+        })
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> bool:
+    """이전 결과와 비교해 느려진 항목 출력 (허용 배율 초과가 있으면 False)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["rows"], r["name"]): r for r in json.load(f)["results"]}
+    ok = True
+    print(f"\n기준 결과 비교 ({baseline_path}, 허용 {max_regression:.2f}x)")
+    for result in results:
+        previous = baseline.get((result["rows"], result["name"]))
+        if previous is None:
+            continue
+        for metric in ("cold_seconds", "warm_seconds"):
+            ratio = result[metric] / previous[metric] if previous[metric] > 0 else 1.0
+            flag = ""
+            if ratio > max_regression:
+                flag = "  <- 느려짐"
+                ok = False
+            print(f"{result['rows']:>8} {result['name']:<24} {metric:<13} {ratio:>6.2f}x{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="warm 측정 반복 횟수")
+    parser.add_argument("--collect-batch", type=int, default=200, help="collect_videos 1회당 신규 영상 수")
+    parser.add_argument("--collect-repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="측정 대상 DB (기본값: 임시 SQLite 파일)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장 (회귀 비교용)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=1.3)
+    args = parser.parse_args()
+
+    temp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        temp_dir = tempfile.mkdtemp(prefix="consultube-bench-")
+        database_url = f"sqlite:///{os.path.join(temp_dir, 'bench.db')}"
+
+    from app.migrations import upgrade_schema
+    from app.services.stats_history import install_growth_cache_reset
+
+    engine = create_engine(database_url)
+    upgrade_schema(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    install_growth_cache_reset(Session)
+
+    try:
+        results = []
+        print(f"{'rows':>8} {'function':<24} {'cold':>10} {'warm':>10}")
+        for rows in args.rows:
+            for result in bench_size(Session, rows, args):
+                results.append(result)
+                print(f"{rows:>8} {result['name']:<24} {result['cold_seconds'] * 1000:>8.1f}ms "
+                      f"{result['warm_seconds'] * 1000:>8.1f}ms")
+    finally:
+        engine.dispose()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "revision": git_revision(),
+                    "created_at": datetime.utcnow().isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "database": engine.dialect.name,
+                    "time_range_days": TIME_RANGE_DAYS,
+                },
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""수집 경로 처리량 벤치마크 (가짜 YouTube API 서버 사용, 네트워크/할당량 불필요)
+
+benchmarks/fake_youtube_api.py 서버를 백그라운드 스레드로 띄우고, 실제 YouTubeService
+(googleapiclient)와 DataCollector.collect_videos로 임시 SQLite DB에 수집한다.
+API 호출 수/할당량/영상당 시간을 출력하므로 수집 방식(배치, 병렬 등)을 바꿨을 때 비교할 수 있다.
+
+사용법:
+    python benchmarks/collector_benchmark.py [--max-results 200] [--latency-ms 20]
+        [--error-rate 0.0] [--categories 뷰티 여행] [--json result.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_youtube_api import FakeYouTubeState, serve_in_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", nargs="+", default=["뷰티", "여행"])
+    parser.add_argument("--max-results", type=int, default=200)
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota", type=int, default=1_000_000)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    state = FakeYouTubeState(
+        corpus_size=args.corpus_size, latency_ms=args.latency_ms,
+        quota=args.quota, error_rate=args.error_rate,
+    )
+    server, thread = serve_in_thread(state, port=args.port)
+
+    # 앱 모듈은 환경 변수를 import 시점에 읽으므로 설정 후 import
+    temp_dir = tempfile.mkdtemp(prefix="consultube-collect-")
+    os.environ["YOUTUBE_API_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+    os.environ.setdefault("YOUTUBE_API_KEY", "fake-key")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.migrations import upgrade_schema
+    from app.services.data_collector import DataCollector
+    from app.services.youtube_service import YouTubeService
+
+    engine = create_engine(f"sqlite:///{os.path.join(temp_dir, 'collect.db')}")
+    upgrade_schema(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    results = []
+    try:
+        for category in args.categories:
+            state.reset()
+            with Session() as db:
+                collector = DataCollector(db, youtube_service=YouTubeService())
+                started = time.perf_counter()
+                collected = collector.collect_videos(
+                    category, time_range_days=30, max_results=args.max_results, incremental=False,
+                )
+                seconds = time.perf_counter() - started
+            stats = state.stats()
+            results.append({
+                "category": category,
+                "videos": collected,
+                "seconds": seconds,
+                "videos_per_second": collected / seconds if seconds else None,
+                "search_requests": stats["requests"]["search"],
+                "videos_requests": stats["requests"]["videos"],
+                "quota_used": stats["quota_used"],
+                "injected_errors": stats["injected_errors"],
+            })
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        engine.dispose()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"{'category':<10} {'videos':>7} {'seconds':>8} {'videos/s':>9} {'search':>7} {'videos.list':>12} {'quota':>7}")
+    for r in results:
+        print(f"{r['category']:<10} {r['videos']:>7} {r['seconds']:>8.2f} {r['videos_per_second'] or 0:>9.1f} "
+              f"{r['search_requests']:>7} {r['videos_requests']:>12} {r['quota_used']:>7}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
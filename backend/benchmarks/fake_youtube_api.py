@@ -0,0 +1,294 @@
+"""오프라인 부하 테스트용 YouTube Data API v3 대체 서버
+
+YouTubeService가 사용하는 search.list / videos.list 응답 형태만 구현한다.
+YouTubeService는 YOUTUBE_API_BASE_URL 환경 변수로 이 서버를 가리킨다 (API 키는 아무 값이나 사용).
+
+- 코퍼스: 검색어(q)별로 seed에서 결정되는 합성 영상 --corpus-size개 (benchmarks/synthetic_data.py)
+- search.list: order=date 순, publishedAfter 필터, maxResults(최대 50), pageToken 페이지네이션
+- videos.list: id 최대 50개, part=snippet,statistics
+- 지연: 요청마다 --latency-ms ± --jitter-ms
+- 할당량: 검색 100, videos 1 단위 (--quota 초과 시 403 quotaExceeded)
+- 오류 주입: --error-rate 확률로 429 rateLimitExceeded (Retry-After 헤더 포함)
+- GET /_stats: 요청 수/사용 할당량/주입한 오류 수, POST /_reset: 카운터와 할당량 초기화
+
+사용법:
+    python benchmarks/fake_youtube_api.py [--port 8089] [--corpus-size 2000] [--latency-ms 50]
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8089 YOUTUBE_API_KEY=fake uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import base64
+import os
+import random
+import sys
+import threading
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from synthetic_data import generate_videos
+
+SEARCH_QUOTA_COST = 100
+VIDEOS_QUOTA_COST = 1
+MAX_PAGE_SIZE = 50
+
+
+def _isoformat(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _encode_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> int:
+    padded = token + "=" * (-len(token) % 4)
+    return int(base64.urlsafe_b64decode(padded).decode().split(":", 1)[1])
+
+
+def _error(status: int, reason: str, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """YouTube Data API 오류 응답 형태"""
+    domain = "youtube.quota" if reason == "quotaExceeded" else "usageLimits"
+    return JSONResponse(
+        status_code=status,
+        content={"error": {
+            "code": status,
+            "message": message,
+            "errors": [{"message": message, "domain": domain, "reason": reason}],
+        }},
+        headers=headers,
+    )
+
+
+class FakeYouTubeState:
+    """코퍼스와 카운터 (요청 간 공유)"""
+
+    def __init__(
+        self,
+        corpus_size: int = 2000,
+        seed: int = 42,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        quota: int = 10_000,
+        error_rate: float = 0.0,
+        days: int = 30,
+    ):
+        self.corpus_size = corpus_size
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.quota = quota
+        self.error_rate = error_rate
+        self.days = days
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self._random = random.Random(seed)
+        self._corpora: Dict[str, List[Dict]] = {}
+        self._videos: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = {"search": 0, "videos": 0}
+            self.quota_used = 0
+            self.injected_errors = 0
+            self.quota_errors = 0
+
+    def corpus(self, query: str) -> List[Dict]:
+        """검색어별 코퍼스 (게시 시각 내림차순, 처음 조회할 때 생성)"""
+        with self._lock:
+            corpus = self._corpora.get(query)
+            if corpus is None:
+                query_seed = zlib.crc32(query.encode("utf-8"))
+                corpus = generate_videos(
+                    self.corpus_size, seed=self.seed, start=query_seed % 1_000_000 * 1000,
+                    now=self.now, days=self.days, prefix=f"f{query_seed % 10_000:04d}_",
+                )
+                corpus.sort(key=lambda v: v["published_at"], reverse=True)
+                self._corpora[query] = corpus
+                self._videos.update((v["video_id"], v) for v in corpus)
+            return corpus
+
+    def video(self, video_id: str) -> Optional[Dict]:
+        return self._videos.get(video_id)
+
+    async def admit(self, kind: str, cost: int) -> Optional[JSONResponse]:
+        """지연/오류 주입/할당량 처리 (거절하면 오류 응답 반환)"""
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        with self._lock:
+            self.requests[kind] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.injected_errors += 1
+                return _error(429, "rateLimitExceeded", "Rate limit exceeded (injected).", {"Retry-After": "1"})
+            if self.quota_used + cost > self.quota:
+                self.quota_errors += 1
+                return _error(403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+            self.quota_used += cost
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "quota_used": self.quota_used,
+                "quota": self.quota,
+                "injected_errors": self.injected_errors,
+                "quota_errors": self.quota_errors,
+            }
+
+
+def _snippet(video: Dict, full: bool) -> Dict:
+    snippet = {
+        "publishedAt": _isoformat(video["published_at"]),
+        "channelId": video["channel_id"],
+        "title": video["title"],
+        "description": video["description"],
+        "thumbnails": {
+            "default": {"url": video["thumbnail_default"], "width": 120, "height": 90},
+            "medium": {"url": video["thumbnail_medium"], "width": 320, "height": 180},
+            "high": {"url": video["thumbnail_high"], "width": 480, "height": 360},
+        },
+        "channelTitle": video["channel_title"],
+    }
+    if full:
+        snippet["tags"] = video["tags"]
+        snippet["categoryId"] = video["category_id"]
+    return snippet
+
+
+def create_app(state: FakeYouTubeState) -> FastAPI:
+    app = FastAPI(title="Fake YouTube Data API v3")
+
+    @app.get("/youtube/v3/search")
+    async def search_list(request: Request):
+        params = request.query_params
+        rejected = await state.admit("search", SEARCH_QUOTA_COST)
+        if rejected is not None:
+            return rejected
+
+        corpus = state.corpus(params.get("q", ""))
+        published_after = params.get("publishedAfter")
+        if published_after:
+            cutoff = datetime.fromisoformat(published_after.replace("Z", "+00:00"))
+            if cutoff.tzinfo is None:
+                cutoff = cutoff.replace(tzinfo=timezone.utc)
+            corpus = [v for v in corpus if v["published_at"] > cutoff]
+
+        page_size = max(0, min(int(params.get("maxResults", 5)), MAX_PAGE_SIZE))
+        try:
+            offset = _decode_token(params["pageToken"]) if params.get("pageToken") else 0
+        except (ValueError, IndexError):
+            return _error(400, "invalidPageToken", "The request specifies an invalid page token.")
+        page = corpus[offset:offset + page_size]
+
+        response = {
+            "kind": "youtube#searchListResponse",
+            "regionCode": "KR",
+            "pageInfo": {"totalResults": len(corpus), "resultsPerPage": page_size},
+            "items": [
+                {
+                    "kind": "youtube#searchResult",
+                    "id": {"kind": "youtube#video", "videoId": v["video_id"]},
+                    "snippet": _snippet(v, full=False),
+                }
+                for v in page
+            ],
+        }
+        if offset + page_size < len(corpus):
+            response["nextPageToken"] = _encode_token(offset + page_size)
+        if offset > 0:
+            response["prevPageToken"] = _encode_token(max(0, offset - page_size))
+        return response
+
+    @app.get("/youtube/v3/videos")
+    async def videos_list(request: Request):
+        params = request.query_params
+        rejected = await state.admit("videos", VIDEOS_QUOTA_COST)
+        if rejected is not None:
+            return rejected
+
+        ids = [video_id for video_id in params.get("id", "").split(",") if video_id]
+        if len(ids) > MAX_PAGE_SIZE:
+            return _error(400, "invalidFilters", "Too many video ids (max 50).")
+        parts = set(params.get("part", "").split(","))
+        items = []
+        for video_id in ids:
+            video = state.video(video_id)
+            if video is None:
+                continue
+            item = {"kind": "youtube#video", "id": video_id}
+            if "snippet" in parts:
+                item["snippet"] = _snippet(video, full=True)
+            if "statistics" in parts:
+                item["statistics"] = {
+                    "viewCount": str(video["view_count"]),
+                    "likeCount": str(video["like_count"]),
+                    "favoriteCount": "0",
+                    "commentCount": str(video["comment_count"]),
+                }
+            items.append(item)
+        return {
+            "kind": "youtube#videoListResponse",
+            "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)},
+            "items": items,
+        }
+
+    @app.get("/_stats")
+    async def stats():
+        return state.stats()
+
+    @app.post("/_reset")
+    async def reset():
+        state.reset()
+        return state.stats()
+
+    return app
+
+
+def serve_in_thread(state: FakeYouTubeState, host: str = "127.0.0.1", port: int = 8089):
+    """백그라운드 스레드에서 서버 실행 (벤치마크/부하 테스트용), 종료하려면 server.should_exit = True"""
+    import time
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(state), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"가짜 YouTube API 서버를 시작하지 못했습니다 ({host}:{port})")
+        time.sleep(0.05)
+    return server, thread
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--corpus-size", type=int, default=2000, help="검색어별 영상 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=30, help="코퍼스 게시 시각 구간 (일)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--quota", type=int, default=10_000, help="할당량 (단위, 초과 시 403)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 주입 확률 (0~1)")
+    args = parser.parse_args()
+
+    state = FakeYouTubeState(
+        corpus_size=args.corpus_size, seed=args.seed, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, quota=args.quota, error_rate=args.error_rate, days=args.days,
+    )
+    print(f"가짜 YouTube API: http://{args.host}:{args.port} (YOUTUBE_API_BASE_URL로 지정)")
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""그룹 집계 커널 벤치마크
+
+분석 함수에서 쓰던 pandas `groupby().agg()` 경로와 app.utils.grouped.group_stats를
+같은 합성 데이터(Zipf 분포 키, 로그 정규 분포 조회수)로 비교한다.
+
+- pandas: 긴 형태 DataFrame 생성 + groupby(dict 집계) + 컬럼 이름 변경
+- kernel(labels): 사전 코드 키 + 라벨 (인메모리 저장소의 태그/토큰 코드 경로)
+- kernel(strings): 문자열 키를 그대로 factorize
+
+사용법:
+    python benchmarks/grouped_benchmark.py [--rows 10000 100000 1000000] [--groups 2000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.utils.grouped import group_stats
+
+
+def make_data(rows: int, groups: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    codes = (rng.zipf(1.3, rows) - 1) % groups
+    labels = np.array([f"tag{i:05d}" for i in range(groups)], dtype=object)
+    views = rng.lognormal(mean=8, sigma=2, size=rows).astype(np.int64)
+    likes = (views * rng.uniform(0.001, 0.05, rows)).astype(np.int64)
+    return codes, labels, views, likes
+
+
+def pandas_path(codes, labels, views, likes):
+    df = pd.DataFrame({"tag": labels[codes], "view_count": views, "like_count": likes})
+    stats = df.groupby("tag").agg({
+        "view_count": ["mean", "count"],
+        "like_count": "mean",
+    }).reset_index()
+    stats.columns = ["tag", "avg_views", "video_count", "avg_likes"]
+    return stats
+
+
+def kernel_labels_path(codes, labels, views, likes):
+    return group_stats(codes, {"view_count": views, "like_count": likes}, labels=labels)
+
+
+def kernel_strings_path(codes, labels, views, likes):
+    return group_stats(labels[codes], {"view_count": views, "like_count": likes})
+
+
+def timed(func, args, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def check_equal(reference: pd.DataFrame, result) -> bool:
+    return (
+        list(reference["tag"]) == list(result.keys)
+        and np.array_equal(reference["video_count"].to_numpy(), result.count)
+        and np.allclose(reference["avg_views"].to_numpy(), result.mean["view_count"])
+        and np.allclose(reference["avg_likes"].to_numpy(), result.mean["like_count"])
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--groups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장 (회귀 비교용)")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>10} {'pandas':>10} {'kernel(labels)':>15} {'kernel(strings)':>16} {'speedup':>8}")
+    for rows in args.rows:
+        data = make_data(rows, args.groups)
+        if not (
+            check_equal(pandas_path(*data), kernel_labels_path(*data))
+            and check_equal(pandas_path(*data), kernel_strings_path(*data))
+        ):
+            raise SystemExit(f"결과 불일치 (rows={rows})")
+
+        pandas_seconds = timed(pandas_path, data, args.repeat)
+        labels_seconds = timed(kernel_labels_path, data, args.repeat)
+        strings_seconds = timed(kernel_strings_path, data, args.repeat)
+        results.append({
+            "rows": rows,
+            "groups": args.groups,
+            "pandas_seconds": pandas_seconds,
+            "kernel_labels_seconds": labels_seconds,
+            "kernel_strings_seconds": strings_seconds,
+        })
+        print(f"{rows:>10} {pandas_seconds * 1000:>8.1f}ms {labels_seconds * 1000:>13.1f}ms "
+              f"{strings_seconds * 1000:>14.1f}ms {pandas_seconds / labels_seconds:>7.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""SQL 문 수 예산 검사 (N+1 회귀 방지, 임시 SQLite DB 사용)
+
+주요 경로의 SQL 문 수를 세어 예산을 넘으면 어떤 문장이 몇 번 실행됐는지 출력하고 종료 코드 1로 끝난다.
+문 수는 영상/태그 수에 비례하지 않고 IN 배치 수에만 비례한다. 그래서 예산은 배치 하나일 때의 기본값에
+배치가 늘 때마다 정해진 수만큼 더한 값이다 (budget_for).
+- 영상 IN 배치: 수집 경로는 IN_BATCH_SIZE(500)개, 분석 경로의 스냅샷 조회는 1000개 단위
+- 태그 IN 배치: 고유 해시태그 IN_BATCH_SIZE(500)개 단위
+executemany는 드라이버 호출 한 번이므로 한 문장으로 센다.
+같은 시나리오는 tests/test_query_budget.py에서 pytest로도 검사한다.
+
+사용법:
+    python benchmarks/query_budget.py [--videos 50] [--tags 20]
+"""
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate_videos
+
+# 수집 경로의 IN 조회/삭제 배치 크기 (data_collector.IN_BATCH_SIZE)
+COLLECT_IN_BATCH = 500
+# 분석 경로의 스냅샷 IN 조회 배치 크기 (stats_history._BATCH_SIZE)
+SNAPSHOT_IN_BATCH = 1000
+
+# 시나리오별 (기본 예산, 영상 배치당 추가, 태그 배치당 추가) (수집 실행 기록/워터마크 갱신 포함)
+# - 신규: 영상 id 조회 2번(추가 전/후), 해시태그 키 조회 2번(조회, 추가 후 재조회)
+# - 갱신: 영상 id 조회, 설명/해시태그 연결 삭제 각 1번, 해시태그 키 조회 1번
+# - 분석: 기간 내 영상의 스냅샷 조회 1번 (SNAPSHOT_IN_BATCH 단위), 일별 스케치 조회는 배치와 무관
+BUDGETS: Dict[str, Tuple[int, int, int]] = {
+    "collect_videos (신규)": (20, 2, 2),
+    "collect_videos (기존 영상 갱신)": (16, 3, 1),
+    "분석 API (저장소 적재)": (8, 1, 0),
+    "분석 API (저장소 적중)": (2, 1, 0),
+}
+
+
+def budget_for(name: str, videos: int, tags: int) -> int:
+    """영상 videos개, 영상당 태그 tags개(make_videos)일 때 시나리오의 허용 SQL 문 수"""
+    base, per_video_batch, per_tag_batch = BUDGETS[name]
+    batch_size = SNAPSHOT_IN_BATCH if name.startswith("분석") else COLLECT_IN_BATCH
+    unique_tags = min(2 * tags, videos + tags - 1)
+    video_batches = max(math.ceil(videos / batch_size), 1)
+    tag_batches = max(math.ceil(unique_tags / COLLECT_IN_BATCH), 1)
+    return base + per_video_batch * (video_batches - 1) + per_tag_batch * (tag_batches - 1)
+
+
+class FixedYouTubeService:
+    """항상 같은 영상 목록을 돌려주는 YouTubeService 대체 객체"""
+
+    def __init__(self, videos):
+        self.videos = videos
+        self.quota_units_used = 0
+        self.api_calls = 0
+
+    def fetch_video_data(self, category: str, **kwargs):
+        return self.videos
+
+
+def make_videos(count: int, tags: int, prefix: str = "qb") -> List[dict]:
+    """영상마다 서로 겹치는 태그를 tags개씩 붙인 합성 영상"""
+    videos = generate_videos(count, seed=11, prefix=prefix)
+    for i, video in enumerate(videos):
+        video["tags"] = [f"태그{(i + j) % (tags * 2)}" for j in range(tags)]
+    return videos
+
+
+def updated_videos(videos: List[dict]) -> List[dict]:
+    """같은 영상의 조회수만 늘린 목록 (기존 영상 갱신 경로)"""
+    return [dict(video, view_count=video["view_count"] + 100) for video in videos]
+
+
+def collect(db, category: str, videos: List[dict]) -> int:
+    from app.services.data_collector import DataCollector
+
+    return DataCollector(db, FixedYouTubeService(videos)).collect_videos(category, incremental=False)
+
+
+def create_category(db, category: str) -> None:
+    """카테고리 생성 (예산에서 제외)"""
+    from app.services.data_collector import DataCollector
+
+    DataCollector(db, FixedYouTubeService([])).get_or_create_category(category)
+
+
+def analyze(db, category: str) -> None:
+    from app.utils.analysis import analyze_hashtags, analyze_title_patterns, analyze_trends, calculate_metrics
+
+    calculate_metrics(db, category, 30)
+    analyze_trends(db, category, 30)
+    analyze_hashtags(db, category, 30)
+    analyze_title_patterns(db, category, 30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--tags", type=int, default=20, help="영상당 태그 수")
+    args = parser.parse_args()
+
+    # 앱 모듈은 환경 변수를 import 시점에 읽으므로 설정 후 import
+    temp_dir = tempfile.mkdtemp(prefix="consultube-query-budget-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir, 'budget.db')}"
+    os.environ.setdefault("YOUTUBE_API_KEY", "fake-key")
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_schema
+    from app.services.hot_store import hot_store
+    from app.utils.query_stats import QueryBudgetExceeded, query_budget
+
+    category = "예산"
+    videos = make_videos(args.videos, args.tags)
+
+    engine.echo = False  # SQL 로그는 끄고 문 수만 출력
+    upgrade_schema(engine)
+    with SessionLocal() as db:
+        create_category(db, category)
+
+    scenarios: List[Tuple[str, Callable, Callable]] = [
+        ("collect_videos (신규)", lambda db: None, lambda db: collect(db, category, videos)),
+        ("collect_videos (기존 영상 갱신)", lambda db: None, lambda db: collect(db, category, updated_videos(videos))),
+        ("분석 API (저장소 적재)", lambda db: hot_store.invalidate(), lambda db: analyze(db, category)),
+        ("분석 API (저장소 적중)", lambda db: None, lambda db: analyze(db, category)),
+    ]
+
+    failures = 0
+    print(f"영상 {args.videos}개 x 태그 {args.tags}개")
+    print(f"{'scenario':<28} {'statements':>10} {'budget':>7}")
+    try:
+        for name, prepare, run in scenarios:
+            budget = budget_for(name, args.videos, args.tags)
+            with SessionLocal() as db:
+                prepare(db)
+                try:
+                    with query_budget(budget, name) as stats:
+                        run(db)
+                except QueryBudgetExceeded as e:
+                    failures += 1
+                    print(f"{name:<28} {stats.statements:>10} {budget:>7}  초과")
+                    print(e)
+                    continue
+            print(f"{name:<28} {stats.statements:>10} {budget:>7}")
+    finally:
+        engine.dispose()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""스냅샷 왕복 검사 (내보내기 -> 적재 후 값 비교, 백슬래시/따옴표/줄바꿈/NULL이 든 제목과 설명)
+
+임시 SQLite DB에 검사용 영상을 넣고 csv 형식으로 내보낸 뒤 대상 DB에 적재해 값이 같은지 비교한다.
+다르면 다른 값을 출력하고 종료 코드 1로 끝난다.
+MySQL LOAD DATA 경로는 --target-url로 빈 MySQL DB를 지정하고 --load-data를 붙여 검사한다
+(대상 DB의 스냅샷 테이블은 비워진다).
+
+사용법:
+    python benchmarks/snapshot_roundtrip.py [--target-url mysql+pymysql://...?local_infile=1 --load-data]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+
+# 값 끝의 백슬래시, 이스케이프처럼 보이는 '\n'/'\N', 따옴표, 실제 줄바꿈
+TRICKY_TEXTS = [
+    "C:\\new folder\\tmp",
+    "끝이 백슬래시 \\",
+    'quote " and \\" mixed',
+    "\\N",
+    "NULL",
+    "line\nbreak, comma",
+    "탭\t문자",
+    "plain",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-url", help="적재 대상 DB (기본값: 임시 SQLite)")
+    parser.add_argument("--load-data", action="store_true", help="MySQL LOAD DATA LOCAL INFILE 사용")
+    args = parser.parse_args()
+
+    from app.migrations import upgrade_schema
+    from app.models import Category, Video, VideoDetail
+    from app.services.snapshot import export_snapshot, import_snapshot
+
+    temp_dir = tempfile.mkdtemp(prefix="consultube-snapshot-roundtrip-")
+    source = create_engine(f"sqlite:///{os.path.join(temp_dir, 'source.db')}")
+    target = create_engine(args.target_url or f"sqlite:///{os.path.join(temp_dir, 'target.db')}")
+    upgrade_schema(source)
+    upgrade_schema(target)
+
+    with source.begin() as conn:
+        conn.execute(Category.__table__.insert(), [{"id": 1, "name": "왕복"}])
+        conn.execute(Video.__table__.insert(), [
+            {
+                "id": i + 1, "video_id": f"rt{i}", "title": value, "category_id": 1,
+                "published_at": datetime(2026, 1, 1), "channel_id": "ch", "channel_title": value,
+                "view_count": i, "like_count": 0, "comment_count": 0,
+            }
+            for i, value in enumerate(TRICKY_TEXTS)
+        ])
+        conn.execute(VideoDetail.__table__.insert(), [
+            {"video_id": i + 1, "description": None if value == "NULL" else value}
+            for i, value in enumerate(TRICKY_TEXTS)
+        ])
+
+    export_snapshot(source, os.path.join(temp_dir, "snapshot"), file_format="csv")
+    import_snapshot(target, os.path.join(temp_dir, "snapshot"), truncate=True, use_load_data=args.load_data)
+
+    def rows(engine):
+        with engine.connect() as conn:
+            videos = conn.execute(
+                select(Video.id, Video.title, Video.channel_title).order_by(Video.id)
+            ).all()
+            details = conn.execute(
+                select(VideoDetail.video_id, VideoDetail.description).order_by(VideoDetail.video_id)
+            ).all()
+        return [tuple(r) for r in videos], [tuple(r) for r in details]
+
+    expected, actual = rows(source), rows(target)
+    failures = 0
+    for name, want, got in zip(("videos", "video_details"), expected, actual):
+        for want_row, got_row in zip(want, got):
+            if want_row != got_row:
+                failures += 1
+                print(f"{name}: 기대 {want_row!r} / 실제 {got_row!r}")
+        if len(want) != len(got):
+            failures += 1
+            print(f"{name}: 행 수 {len(want)} / {len(got)}")
+    print("왕복 일치" if not failures else f"불일치 {failures}건")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""애플리케이션 시작 시간 벤치마크
+
+새 파이썬 프로세스에서 `import app.main`과 lifespan 시작까지 걸리는 시간을 측정한다.
+import 단계에서 무거운 모듈(pandas, numpy, googleapiclient.discovery, apscheduler)이
+로드되지 않는지도 함께 확인한다.
+
+사용법:
+    python benchmarks/startup_benchmark.py [--runs 5] [--lifespan]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "googleapiclient.discovery", "apscheduler"]
+
+_PROBE = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+heavy_loaded = [m for m in {heavy!r} if m in sys.modules]
+lifespan_seconds = None
+if {run_lifespan}:
+    async def _startup():
+        async with app.main.lifespan(app.main.app):
+            pass
+    t2 = time.perf_counter()
+    asyncio.run(_startup())
+    lifespan_seconds = time.perf_counter() - t2
+print("__RESULT__" + json.dumps({{
+    "import_seconds": t1 - t0,
+    "lifespan_seconds": lifespan_seconds,
+    "heavy_modules_loaded": heavy_loaded,
+}}), flush=True)
+"""
+
+
+def run_once(run_lifespan: bool, env: dict) -> dict:
+    code = _PROBE.format(run_lifespan=run_lifespan, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result_line = next(line for line in output.splitlines() if line.startswith("__RESULT__"))
+    return json.loads(result_line[len("__RESULT__"):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lifespan", action="store_true", help="lifespan 시작/종료 시간도 측정 (DB 연결 필요)")
+    parser.add_argument("--role", default="api", help="APP_ROLE (기본값: api)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, APP_ROLE=args.role)
+    results = [run_once(args.lifespan, env) for _ in range(args.runs)]
+
+    import_times = [r["import_seconds"] for r in results]
+    print(f"import app.main: median {statistics.median(import_times) * 1000:.0f}ms "
+          f"(min {min(import_times) * 1000:.0f}ms, max {max(import_times) * 1000:.0f}ms, {args.runs}회)")
+    if args.lifespan:
+        lifespan_times = [r["lifespan_seconds"] for r in results]
+        print(f"lifespan 시작/종료: median {statistics.median(lifespan_times) * 1000:.0f}ms")
+    heavy = sorted({m for r in results for m in r["heavy_modules_loaded"]})
+    print(f"import 시 로드된 무거운 모듈: {heavy or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
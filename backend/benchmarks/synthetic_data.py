@@ -0,0 +1,267 @@
+"""벤치마크용 합성 YouTube 데이터 생성기
+
+같은 seed면 항상 같은 영상 목록을 만든다 (게시 시각은 기준 시각 now에 대한 상대값).
+
+- 제목: 한국어/영어 단어를 섞은 템플릿 (질문형, 괄호, 숫자 등 제목 패턴 분석 대상 포함)
+- 해시태그: 영상당 0~14개, 태그 인기도는 Zipf 분포
+- 채널: Zipf 분포 (소수 채널이 많은 영상 게시)
+- 조회수: 로그 정규 분포, 좋아요/댓글은 조회수 비율로 생성
+- 게시 시각: 기준 시각 이전 days일 구간에 균등 분포
+
+생성한 영상은 YouTubeService.fetch_video_data 반환값과 같은 형태(dict)이며,
+load_videos로 실제 모델(videos/hashtags/video_hashtags)에 일괄 적재하거나
+SyntheticYouTubeService로 DataCollector.collect_videos에 공급할 수 있다.
+
+사용법 (DATABASE_URL 대상 DB에 적재):
+    python benchmarks/synthetic_data.py --rows 10000 [--category 뷰티] [--seed 42]
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+KO_WORDS = [
+    "메이크업", "꿀팁", "추천", "리뷰", "브이로그", "데일리", "여행", "맛집", "먹방", "일상",
+    "하울", "루틴", "신상", "솔직", "후기", "언박싱", "카페", "운동", "다이어트", "스킨케어",
+    "겨울", "여름", "데이트", "출근", "주말", "자취", "요리", "캠핑", "제주", "서울",
+    "가성비", "인생템", "최애", "역대급", "초보", "필수", "비교", "정리", "모음", "꿀조합",
+]
+EN_WORDS = [
+    "makeup", "vlog", "tutorial", "review", "routine", "haul", "travel", "food", "daily", "tips",
+    "unboxing", "GRWM", "skincare", "cafe", "workout", "best", "new", "first", "korea", "seoul",
+]
+TITLE_TEMPLATES = [
+    "{ko} {ko} {ko}",
+    "{ko} {en} {ko} {n}가지",
+    "왜 {ko}일까? {ko} {ko}",
+    "[{ko}] {en} {en} {ko}",
+    "{en} {en} {ko} 추천",
+    "{ko} {ko} | {en} {en}",
+    "My {en} {en} ({ko})",
+    "{ko}하는 법 {n}분 {ko}",
+    "{n}만원으로 {ko} {ko}!",
+    "{en} {en} {en}",
+]
+
+DEFAULT_TAGS = 2000
+DEFAULT_CHANNELS = 500
+DEFAULT_DAYS = 30
+
+
+def _tag_vocabulary(n_tags: int) -> List[str]:
+    """단어 목록 + 번호 붙인 변형으로 n_tags개 태그 (앞쪽일수록 인기 태그)"""
+    base = KO_WORDS + EN_WORDS
+    tags = list(base[:n_tags])
+    i = 0
+    while len(tags) < n_tags:
+        tags.append(f"{base[i % len(base)]}{i // len(base) + 1}")
+        i += 1
+    return tags
+
+
+def _zipf_codes(rng: np.random.Generator, size: int, n: int, a: float = 1.3) -> np.ndarray:
+    """0..n-1 범위 Zipf 분포 코드 (n을 넘는 값은 다시 뽑지 않고 나머지로 접음)"""
+    return (rng.zipf(a, size) - 1) % n
+
+
+def generate_videos(
+    count: int,
+    seed: int = 42,
+    start: int = 0,
+    now: Optional[datetime] = None,
+    days: int = DEFAULT_DAYS,
+    n_tags: int = DEFAULT_TAGS,
+    n_channels: int = DEFAULT_CHANNELS,
+    prefix: str = "syn",
+) -> List[Dict]:
+    """합성 영상 데이터 count개 (video_id는 prefix + 일련번호 start부터)
+
+    Args:
+        start: 일련번호 시작값 (같은 seed로 이어서 생성할 때 겹치지 않도록)
+        now: 게시 시각 기준 (기본값: 현재 UTC 시각을 분 단위로 자른 값)
+    """
+    rng = np.random.default_rng([seed, start])
+    now = now or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    tags = _tag_vocabulary(n_tags)
+
+    views = rng.lognormal(mean=8.5, sigma=2.0, size=count).astype(np.int64)
+    likes = (views * rng.uniform(0.005, 0.06, count)).astype(np.int64)
+    comments = (likes * rng.uniform(0.01, 0.1, count)).astype(np.int64)
+    ages = rng.uniform(0, days * 86400, count)
+    channels = _zipf_codes(rng, count, n_channels, a=1.5)
+    tag_counts = rng.integers(0, 15, count)
+    tag_codes = _zipf_codes(rng, int(tag_counts.sum()), n_tags)
+    templates = rng.integers(0, len(TITLE_TEMPLATES), count)
+    ko_picks = rng.integers(0, len(KO_WORDS), (count, 4))
+    en_picks = rng.integers(0, len(EN_WORDS), (count, 3))
+    numbers = rng.integers(1, 11, count)
+
+    videos = []
+    offset = 0
+    for i in range(count):
+        ko = iter(KO_WORDS[j] for j in ko_picks[i])
+        en = iter(EN_WORDS[j] for j in en_picks[i])
+        title = TITLE_TEMPLATES[templates[i]]
+        while "{ko}" in title or "{en}" in title:
+            title = title.replace("{ko}", next(ko), 1).replace("{en}", next(en), 1)
+        title = title.replace("{n}", str(numbers[i]))
+
+        video_tags = list(dict.fromkeys(tags[c] for c in tag_codes[offset:offset + tag_counts[i]]))
+        offset += tag_counts[i]
+        video_id = f"{prefix}{start + i:08d}"
+        channel = int(channels[i])
+        videos.append({
+            "video_id": video_id,
+            "title": title,
+            "description": f"{title}\n\n" + " ".join(f"#{t}" for t in video_tags),
+            "tags": video_tags,
+            "category_id": "22",
+            "published_at": now - timedelta(seconds=float(ages[i])),
+            "channel_id": f"UC{prefix}{channel:06d}",
+            "channel_title": f"채널 {channel}",
+            "view_count": int(views[i]),
+            "like_count": int(likes[i]),
+            "comment_count": int(comments[i]),
+            "thumbnail_default": f"https://i.ytimg.com/vi/{video_id}/default.jpg",
+            "thumbnail_medium": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
+            "thumbnail_high": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        })
+    return videos
+
+
+def load_videos(db, category_name: str, videos: List[Dict], batch_size: int = 5000) -> int:
+    """합성 영상을 실제 모델로 일괄 적재 (카테고리가 없으면 생성, 커밋 포함)
+
+    Returns:
+        적재한 영상 수
+    """
+    from sqlalchemy import insert
+    from app.models import Category, Hashtag, Video, VideoDetail, VideoHashtag
+    from app.utils.text import hashtag_key
+
+    category = db.query(Category).filter(Category.name == category_name).first()
+    if category is None:
+        category = Category(name=category_name, search_query=category_name)
+        db.add(category)
+        db.flush()
+
+    # 해시태그 (없는 것만 추가)
+    all_tags = sorted({tag for video in videos for tag in video["tags"]})
+    tag_ids: Dict[str, int] = {}
+    for begin in range(0, len(all_tags), batch_size):
+        batch = all_tags[begin:begin + batch_size]
+        tag_ids.update(db.query(Hashtag.tag, Hashtag.id).filter(Hashtag.tag.in_(batch)).all())
+    missing = [tag for tag in all_tags if tag not in tag_ids]
+    for begin in range(0, len(missing), batch_size):
+        batch = missing[begin:begin + batch_size]
+        db.execute(insert(Hashtag), [{"tag": tag, "canonical_key": hashtag_key(tag)} for tag in batch])
+        tag_ids.update(db.query(Hashtag.tag, Hashtag.id).filter(Hashtag.tag.in_(batch)).all())
+
+    for begin in range(0, len(videos), batch_size):
+        batch = videos[begin:begin + batch_size]
+        db.execute(insert(Video), [
+            {
+                "video_id": v["video_id"],
+                "title": v["title"],
+                "category_id": category.id,
+                "published_at": v["published_at"].astimezone(timezone.utc).replace(tzinfo=None),
+                "channel_id": v["channel_id"],
+                "channel_title": v["channel_title"],
+                "view_count": v["view_count"],
+                "like_count": v["like_count"],
+                "comment_count": v["comment_count"],
+            }
+            for v in batch
+        ])
+        video_ids = dict(
+            db.query(Video.video_id, Video.id)
+            .filter(Video.video_id.in_([v["video_id"] for v in batch]))
+            .all()
+        )
+        db.execute(insert(VideoDetail), [
+            {"video_id": video_ids[v["video_id"]], "description": v["description"]}
+            for v in batch
+            if v["description"]
+        ])
+        links = [
+            {"video_id": video_ids[v["video_id"]], "hashtag_id": tag_ids[tag]}
+            for v in batch
+            for tag in v["tags"]
+        ]
+        if links:
+            db.execute(insert(VideoHashtag), links)
+    db.commit()
+    return len(videos)
+
+
+class SyntheticYouTubeService:
+    """DataCollector에 합성 영상을 공급하는 YouTubeService 대체 객체 (네트워크/할당량 없음)
+
+    fetch_video_data를 호출할 때마다 이전에 없던 video_id로 batch_size개를 만들어 반환하며,
+    할당량은 실제 API와 같은 비용(검색 페이지당 100 + 상세 조회 50개당 1)으로 센다.
+    """
+
+    def __init__(self, batch_size: int = 500, seed: int = 7, start: int = 10_000_000, prefix: str = "col"):
+        self.batch_size = batch_size
+        self.seed = seed
+        self.next_index = start
+        self.prefix = prefix
+        self.quota_units_used = 0
+        self.api_calls = 0
+
+    def fetch_video_data(
+        self,
+        category: str,
+        max_results: int = 50,
+        time_range_days: int = 7,
+        published_after: Optional[datetime] = None,
+        query: Optional[str] = None,
+        on_page: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Dict]:
+        videos = generate_videos(
+            self.batch_size, seed=self.seed, start=self.next_index,
+            days=time_range_days, prefix=self.prefix,
+        )
+        self.next_index += self.batch_size
+        pages = max(1, -(-len(videos) // 50))
+        for page in range(1, pages + 1):
+            self.quota_units_used += 100 + 1
+            self.api_calls += 2
+            if on_page:
+                on_page(page, min(page * 50, len(videos)))
+        return videos
+
+    def get_video_statistics(self, video_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        self.quota_units_used += -(-len(video_ids) // 50)
+        self.api_calls += -(-len(video_ids) // 50)
+        rng = np.random.default_rng(len(video_ids))
+        return {
+            video_id: {"view_count": int(v), "like_count": int(v // 50), "comment_count": int(v // 1000)}
+            for video_id, v in zip(video_ids, rng.lognormal(8.5, 2.0, len(video_ids)).astype(np.int64))
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--category", default="합성")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    args = parser.parse_args()
+
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_schema
+
+    upgrade_schema(engine)
+    with SessionLocal() as db:
+        count = load_videos(db, args.category, generate_videos(args.rows, seed=args.seed, days=args.days))
+    print(f"{args.category}: 합성 영상 {count}개 적재 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""보존 기간이 지난 영상 보관 스크립트 (스케줄러의 일일 보관 작업을 수동 실행)
+
+사용법:
+    python scripts/archive_videos.py [--days 365] [--mode table|file|delete] [--dir ./archive] [--dry-run]
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, SessionLocal
+from app.migrations import upgrade_schema
+from app.services.retention import ARCHIVE_DIR, ARCHIVE_MODE, ARCHIVE_MODES, RETENTION_DAYS, archive_old_videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ConsulTube 영상 보관")
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS, help="보존 기간 (일)")
+    parser.add_argument("--mode", choices=ARCHIVE_MODES, default=ARCHIVE_MODE)
+    parser.add_argument("--dir", default=ARCHIVE_DIR, help="file 모드 보관 디렉터리")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 월별 대상 영상 수만 출력")
+    args = parser.parse_args()
+
+    upgrade_schema(engine)
+    with SessionLocal() as db:
+        result = archive_old_videos(db, args.days, args.mode, args.dir, dry_run=args.dry_run)
+
+    print(f"보관 기준: {result['cutoff'] or '끔'} 이전 게시 영상 ({result['mode']})")
+    for month, count in result["months"].items():
+        print(f"  {month}: {count}개 영상")
+    for path in result["files"]:
+        print(f"  파일: {path}")
+    print("대상 확인 완료 (dry run)" if args.dry_run else f"보관 완료: {result['archived']}개 영상")
+
+
+if __name__ == "__main__":
+    main()
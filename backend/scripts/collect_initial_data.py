@@ -5,9 +5,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.services.data_collector import DataCollector
-
-# 카테고리 목록
-CATEGORIES = ["뷰티", "패션", "음식", "여행", "게임", "음악", "스포츠", "교육"]
+from app.services.category_registry import get_active_category_names
 
 def collect_initial_data():
     """각 카테고리별로 7일/30일 범위 데이터 수집"""
@@ -15,7 +13,7 @@ def collect_initial_data():
     total_collected = 0
     
     try:
-        for category_name in CATEGORIES:
+        for category_name in get_active_category_names(db):
             collector = DataCollector(db)
             
             print(f"\n{'='*60}")
@@ -5,18 +5,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.services.data_collector import DataCollector
+from app.services.category_registry import get_active_category_names
 from app.models import Category
 
-# 카테고리 목록
-CATEGORIES = ["뷰티", "패션", "음식", "여행", "게임", "음악", "스포츠", "교육"]
-
 def collect_more_data():
     """각 카테고리별로 더 많은 데이터 수집 (과거 데이터 포함)"""
     db = SessionLocal()
     total_collected = 0
     
     try:
-        for category_name in CATEGORIES:
+        for category_name in get_active_category_names(db):
             collector = DataCollector(db)
             
             print(f"\n{'='*60}")
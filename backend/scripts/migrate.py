@@ -0,0 +1,18 @@
+"""데이터베이스 스키마 생성/업그레이드 스크립트 (서버 시작과 분리하여 배포 시 1회 실행)"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, SessionLocal
+from app.migrations import classify_existing, upgrade_schema
+from app.services.category_registry import ensure_default_categories
+
+if __name__ == "__main__":
+    print("ConsulTube 스키마 업그레이드")
+    upgrade_schema(engine)
+    if "--reclassify" in sys.argv[1:]:
+        # 분류 규칙(app/utils/classify.py)을 바꾼 뒤 기존 해시태그/제목 플래그를 다시 계산
+        print(f"분류 플래그 재계산: {classify_existing(engine, reclassify=True)}행")
+    with SessionLocal() as db:
+        ensure_default_categories(db)
+    print("스키마 업그레이드 완료")
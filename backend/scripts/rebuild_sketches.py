@@ -0,0 +1,19 @@
+"""카테고리별 근사 통계 스케치 재구축 스크립트 (스케치 도입 전에 수집된 영상 반영)"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, SessionLocal
+from app.migrations import upgrade_schema
+from app.models import Category
+from app.services.sketch_store import rebuild_sketches
+
+if __name__ == "__main__":
+    print("ConsulTube 스케치 재구축")
+    upgrade_schema(engine)
+    with SessionLocal() as db:
+        categories = db.query(Category).order_by(Category.id).all()
+        for category in categories:
+            video_count = rebuild_sketches(db, category.id)
+            print(f"  {category.name}: {video_count}개 영상 반영")
+    print("스케치 재구축 완료")
@@ -0,0 +1,56 @@
+"""데이터 스냅샷 내보내기/적재 스크립트 (새 환경을 API 재수집 없이 빠르게 채우기 위함)
+
+사용법:
+    python scripts/snapshot.py export ./snapshot [--format csv|parquet]
+    python scripts/snapshot.py import ./snapshot [--truncate] [--load-data]
+"""
+import sys
+import os
+import argparse
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.migrations import classify_existing, merge_hashtag_duplicates, upgrade_schema
+from app.services.snapshot import export_snapshot, import_snapshot, parquet_available
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ConsulTube 데이터 스냅샷")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="categories/videos/hashtags/video_hashtags 내보내기")
+    export_parser.add_argument("directory")
+    export_parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="parquet" if parquet_available() else "csv",
+        help="파일 형식 (기본값: pyarrow가 있으면 parquet, 없으면 csv.gz)",
+    )
+
+    import_parser = subparsers.add_parser("import", help="스냅샷 적재")
+    import_parser.add_argument("directory")
+    import_parser.add_argument("--truncate", action="store_true", help="기존 데이터를 지우고 적재")
+    import_parser.add_argument(
+        "--load-data", action="store_true", help="MySQL LOAD DATA LOCAL INFILE 사용 (csv 형식만)"
+    )
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+    if args.command == "export":
+        manifest = export_snapshot(engine, args.directory, file_format=args.format)
+        total = sum(t["rows"] for t in manifest["tables"])
+        print(f"내보내기 완료: {total}행 ({time.perf_counter() - started:.1f}초)")
+    else:
+        upgrade_schema(engine)
+        loaded = import_snapshot(
+            engine, args.directory, truncate=args.truncate, use_load_data=args.load_data
+        )
+        # 정규화 키/분류 플래그가 없던 이전 스냅샷은 적재 후 채움
+        merge_hashtag_duplicates(engine)
+        classify_existing(engine)
+        print(f"적재 완료: {sum(loaded.values())}행 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""pytest 공통 설정 (임시 SQLite DB)
+
+앱 모듈은 환경 변수를 import 시점에 읽으므로 app을 import하기 전에 임시 DB 경로를 지정한다.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+_TEMP_DIR = tempfile.mkdtemp(prefix="consultube-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEMP_DIR, 'test.db')}"
+os.environ.setdefault("YOUTUBE_API_KEY", "fake-key")
+os.environ["SQL_ECHO"] = "false"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """세션 동안 쓰는 임시 DB (스키마 생성 후 끝나면 삭제)"""
+    from app.database import engine
+    from app.migrations import upgrade_schema
+
+    upgrade_schema(engine)
+    yield engine
+    engine.dispose()
+    shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    from app.database import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def query_budget():
+    """with query_budget(최대 문 수, "이름"): 블록의 SQL 문 수가 넘으면 실패 (문장별 실행 횟수 출력)"""
+    from app.utils.query_stats import query_budget as budget
+
+    return budget
@@ -0,0 +1,54 @@
+"""주요 경로의 SQL 문 수 예산 (benchmarks/query_budget.py와 같은 시나리오/예산)
+
+IN 배치가 하나일 때(영상 50개)와 여러 개일 때(영상 600개, IN_BATCH_SIZE 500 초과)를 모두 검사한다.
+"""
+import pytest
+
+import query_budget as scenarios
+from app.services.hot_store import hot_store
+
+SIZES = [(50, 20), (600, 30)]
+
+
+def _seed(db, name: str, videos: int, tags: int):
+    """카테고리 생성 (예산 밖)"""
+    category = f"예산-{name}-{videos}x{tags}"
+    scenarios.create_category(db, category)
+    return category, scenarios.make_videos(videos, tags, prefix=f"{name}{videos}x{tags}-")
+
+
+@pytest.mark.parametrize("videos,tags", SIZES)
+def test_collect_new_videos(db, query_budget, videos, tags):
+    category, items = _seed(db, "new", videos, tags)
+    budget = scenarios.budget_for("collect_videos (신규)", videos, tags)
+    with query_budget(budget, "collect_videos (신규)"):
+        assert scenarios.collect(db, category, items) == videos
+
+
+@pytest.mark.parametrize("videos,tags", SIZES)
+def test_collect_existing_videos(db, query_budget, videos, tags):
+    category, items = _seed(db, "update", videos, tags)
+    scenarios.collect(db, category, items)
+    budget = scenarios.budget_for("collect_videos (기존 영상 갱신)", videos, tags)
+    with query_budget(budget, "collect_videos (기존 영상 갱신)"):
+        scenarios.collect(db, category, scenarios.updated_videos(items))
+
+
+@pytest.mark.parametrize("videos,tags", SIZES)
+def test_analysis_store_load(db, query_budget, videos, tags):
+    category, items = _seed(db, "load", videos, tags)
+    scenarios.collect(db, category, items)
+    hot_store.invalidate()
+    budget = scenarios.budget_for("분석 API (저장소 적재)", videos, tags)
+    with query_budget(budget, "분석 API (저장소 적재)"):
+        scenarios.analyze(db, category)
+
+
+@pytest.mark.parametrize("videos,tags", SIZES)
+def test_analysis_store_hit(db, query_budget, videos, tags):
+    category, items = _seed(db, "hit", videos, tags)
+    scenarios.collect(db, category, items)
+    scenarios.analyze(db, category)
+    budget = scenarios.budget_for("분석 API (저장소 적중)", videos, tags)
+    with query_budget(budget, "분석 API (저장소 적중)"):
+        scenarios.analyze(db, category)
@@ -161,14 +161,30 @@ export async function getTitlePatterns(
   return response.json();
 }
 
+export interface CollectionJob {
+  job_id: string;
+  category: string;
+  time_range_days: number;
+  max_results: number;
+  status: 'pending' | 'running' | 'succeeded' | 'failed';
+  pages_fetched: number;
+  rows_written: number;
+  videos_collected: number;
+  error: string | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+  deduplicated: boolean;
+}
+
 /**
- * 데이터 수집 요청
+ * 데이터 수집 작업 등록 (작업 ID 반환)
  */
 export async function collectData(
   category: string,
   timeRangeDays: number = 7,
   maxResults: number = 50
-): Promise<{ success: boolean; message: string; videos_collected: number; category: string }> {
+): Promise<CollectionJob> {
   const response = await fetch(`${API_BASE_URL}/collect`, {
     method: 'POST',
     headers: {
@@ -188,6 +204,19 @@ export async function collectData(
   return response.json();
 }
 
+/**
+ * 데이터 수집 작업 진행 상황 조회
+ */
+export async function getCollectionJob(jobId: string): Promise<CollectionJob> {
+  const response = await fetch(`${API_BASE_URL}/collect/${encodeURIComponent(jobId)}`);
+
+  if (!response.ok) {
+    throw new Error(`수집 작업 조회 실패: ${response.statusText}`);
+  }
+
+  return response.json();
+}
+
 /**
  * 마지막 데이터 수집 시간 조회
  */